@@ -0,0 +1,78 @@
+# Benchmark for loading distance tables into a Graph
+# Compares Graph.load_graph against Graph.load_graph_vectorized on generated lower-triangular distance tables and
+# checks that both build the same graph
+# Run from the project directory: python -m benchmarks.bench_graph_load
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from package_delivery.datastructures.graph import Graph
+
+LOCATION_COUNTS = [27, 500, 2000, 5000]
+# load_graph makes ~V^2 / 2 Python-level edge insertions, past this count a run takes too long to be useful
+MAX_LOAD_GRAPH_COUNT = 2000
+
+
+def write_distance_table(path, location_count, seed=0):
+    """
+    Write a lower-triangular distance table in the format of WGUPS_distances.csv, upper cells left blank.
+
+    Parameters:
+        path (Path): The file to write.
+        location_count (int): The number of locations.
+        seed (int): Seed for the random coordinates the distances are computed from.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 10, size=(location_count, 2))
+    distances = np.round(np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1)), 1)
+    header = ['location_name', 'location_street', 'location_zip'] + [f'dist_to_{i}' for i in range(location_count)]
+    with path.open('w') as csv_file:
+        csv_file.write(','.join(header) + '\n')
+        for i in range(location_count):
+            cells = [f'{distance:g}' for distance in distances[i, :i + 1]] + [''] * (location_count - i - 1)
+            csv_file.write(f'Location {i},{i} Main St,84{i % 1000:03d},' + ','.join(cells) + '\n')
+
+
+def time_load(load, file_name):
+    """
+    Time one load of a distance table into a new graph.
+
+    Parameters:
+        load (callable): Graph.load_graph or Graph.load_graph_vectorized.
+        file_name (Path): The distance table.
+
+    Returns:
+        tuple: (graph, seconds)
+    """
+    graph = Graph()
+    start = time.perf_counter()
+    load(graph, file_name)
+    return graph, time.perf_counter() - start
+
+
+def main():
+    print(f"{'locations':>10} {'load_graph s':>14} {'vectorized s':>14} {'same graph':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for location_count in LOCATION_COUNTS:
+            file_name = Path(directory) / f'distances_{location_count}.csv'
+            write_distance_table(file_name, location_count)
+            graph, vectorized_seconds = time_load(Graph.load_graph_vectorized, file_name)
+            if location_count <= MAX_LOAD_GRAPH_COUNT:
+                # load_graph cannot parse blank cells, give it rows that stop at the diagonal instead
+                ragged_name = Path(directory) / f'distances_{location_count}_ragged.csv'
+                ragged_name.write_text('\n'.join(line.rstrip(',') for line in file_name.read_text().splitlines()))
+                reference, seconds = time_load(Graph.load_graph, ragged_name)
+                same = (reference.get_vertex_names == graph.get_vertex_names and
+                        np.array_equal(reference.get_distance_matrix, graph.get_distance_matrix, equal_nan=True))
+                print(f"{location_count:>10} {seconds:>14.3f} {vectorized_seconds:>14.3f} {str(same):>11}")
+            else:
+                print(f"{location_count:>10} {'skipped':>14} {vectorized_seconds:>14.3f} {'-':>11}")
+
+
+if __name__ == "__main__":
+    main()
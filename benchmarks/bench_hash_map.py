@@ -0,0 +1,62 @@
+# Microbenchmark for the package hash maps
+# Compares insert and lookup throughput of the fixed 10-bucket HashMap against ResizableHashMap
+# Run from the project directory: python -m benchmarks.bench_hash_map
+import time
+
+from package_delivery.datastructures.hash_map import HashMap, HashMapEntry, ResizableHashMap
+
+PACKAGE_COUNTS = [40, 10_000, 1_000_000]
+# The chained HashMap walks ~n/10 entries per operation, past this count a run takes far too long to be useful
+MAX_CHAINED_COUNT = 10_000
+
+
+def _make_entry():
+    """
+    Create a single package entry shared by every key, only the map operations are being measured.
+
+    Returns:
+        HashMapEntry: A package entry.
+    """
+    return HashMapEntry(1, '4001 South 700 East', 'Salt Lake City', 'UT', '84107', 'EOD', '1', 'None', 'AT_HUB')
+
+
+def bench_map(hash_map, package_count, entry):
+    """
+    Time inserting and then looking up package_count sequential package IDs.
+
+    Parameters:
+        hash_map (HashMap): An empty map to fill.
+        package_count (int): The number of packages to insert and look up.
+        entry (HashMapEntry): The value stored for every key.
+
+    Returns:
+        tuple: (inserts per second, lookups per second)
+    """
+    start = time.perf_counter()
+    for package_id in range(1, package_count + 1):
+        hash_map._insert_package(package_id, entry)
+    insert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for package_id in range(1, package_count + 1):
+        hash_map.get_value_from_key(package_id)
+    lookup_seconds = time.perf_counter() - start
+
+    return package_count / insert_seconds, package_count / lookup_seconds
+
+
+def main():
+    entry = _make_entry()
+    print(f"{'packages':>10} {'map':>18} {'inserts/s':>14} {'lookups/s':>14}")
+    for package_count in PACKAGE_COUNTS:
+        if package_count <= MAX_CHAINED_COUNT:
+            inserts, lookups = bench_map(HashMap(), package_count, entry)
+            print(f"{package_count:>10} {'HashMap':>18} {inserts:>14,.0f} {lookups:>14,.0f}")
+        else:
+            print(f"{package_count:>10} {'HashMap':>18} {'skipped':>14} {'skipped':>14}")
+        inserts, lookups = bench_map(ResizableHashMap(), package_count, entry)
+        print(f"{package_count:>10} {'ResizableHashMap':>18} {inserts:>14,.0f} {lookups:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
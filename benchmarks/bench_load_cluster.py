@@ -0,0 +1,101 @@
+# Benchmark for the cluster-first, route-second loader
+# Loads two kinds of manifests onto enough trucks to carry them, reporting the runtime, the mean number of stops of a
+# loaded truck and the packages left for the left-over pass:
+#   bundled: the manifests of bench_load_savings, repeating the 27 bundled addresses, so every cluster has few stops
+#   spread: one address per package on a generated map, so every cluster has a truck load of stops to route
+# Run from the project directory: python -m benchmarks.bench_load_cluster
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_load_savings import PACKAGE_COUNTS, _make_graph
+from package_delivery.algorithms.load_cluster import load_packages_cluster
+from package_delivery.algorithms.load_savings import HUB
+from package_delivery.datastructures.graph import Graph
+from package_delivery.datastructures.hash_map import ResizableHashMap
+from package_delivery.datastructures.package_constraints import PackageConstraints
+from package_delivery.datastructures.package_index import PackageIndex
+from package_delivery.datastructures.package_table import PackageTable
+from package_delivery.delivery.simulation import TRUCK_CAPACITY
+from package_delivery.delivery.trucks import Trucks
+
+# Spread manifests hold a distance matrix over every address, kept to sizes that fit in memory
+SPREAD_PACKAGE_COUNTS = [40, 1_000, 2_000]
+
+
+def _make_spread_graph(package_count, directory, seed=0):
+    """
+    Build a graph over a generated map with one address per package, the hub the first location.
+
+    Parameters:
+        package_count (int): The number of packages.
+        directory (Path): The directory the distance table is written to.
+        seed (int): Seed for the random coordinates of the addresses.
+
+    Returns:
+        tuple: (graph, coordinates) the graph, its package store holding the packages, and address -> (x, y).
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 10, size=(package_count + 1, 2))
+    addresses = [HUB] + [f'{package_id} Main St' for package_id in range(1, package_count + 1)]
+    distances = np.round(np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1)), 1)
+    file_name = Path(directory) / f'spread_{package_count}.csv'
+    with file_name.open('w') as csv_file:
+        csv_file.write(','.join(['location_name', 'location_street', 'location_zip'] +
+                                [f'dist_to_{i}' for i in range(len(addresses))]) + '\n')
+        for i, address in enumerate(addresses):
+            cells = [f'{distance:g}' for distance in distances[i, :i + 1]] + [''] * (len(addresses) - i - 1)
+            csv_file.write(f'Location {i},{address},84107,' + ','.join(cells) + '\n')
+    store = ResizableHashMap(index=PackageIndex(PackageConstraints()), table=PackageTable())
+    for package_id in range(1, package_count + 1):
+        store.add_package(package_id, addresses[package_id], 'Salt Lake City', 'UT', '84107', 'EOD', '1', 'None')
+    graph = Graph()
+    graph.load_graph_vectorized(file_name)
+    graph.insert_packages_vertex_associate(store)
+    return graph, dict(zip(addresses, map(tuple, points.tolist())))
+
+
+def _time_load(graph, package_count, coordinates=None):
+    """
+    Load a manifest onto enough trucks to carry it and print one row of the results.
+
+    Parameters:
+        graph (Graph): The graph, its package store holding the packages.
+        package_count (int): The number of packages.
+        coordinates (dict): Address -> (x, y), None for the bundled map.
+
+    Returns:
+        None
+    """
+    # Room for every package plus one truck per 10 for the loads the constraints leave partly empty
+    truck_count = -(-package_count // TRUCK_CAPACITY) + package_count // (10 * TRUCK_CAPACITY) + 2
+    trucks = [Trucks(truck_id, f"TRUCK_{truck_id}") for truck_id in range(1, truck_count + 1)]
+    if coordinates is None:
+        coordinates = trucks[0].visualize.get_all_coordinates
+    track_package_id = set()
+    start = time.perf_counter()
+    load_packages_cluster(trucks, graph, track_package_id, coordinates)
+    seconds = time.perf_counter() - start
+    stops = [len(set(truck.route) - {HUB}) for truck in trucks if truck.get_package_count()]
+    print(f"{package_count:>10} {truck_count:>8} {sum(stops) / len(stops):>8.1f} {seconds:>10.3f} "
+          f"{package_count - len(track_package_id):>10}")
+
+
+def main():
+    header = f"{'packages':>10} {'trucks':>8} {'stops':>8} {'seconds':>10} {'left over':>10}"
+    print("bundled addresses")
+    print(header)
+    for package_count in PACKAGE_COUNTS:
+        _time_load(_make_graph(package_count), package_count)
+    print("spread addresses")
+    print(header)
+    with tempfile.TemporaryDirectory() as directory:
+        for package_count in SPREAD_PACKAGE_COUNTS:
+            graph, coordinates = _make_spread_graph(package_count, directory)
+            _time_load(graph, package_count, coordinates)
+
+
+if __name__ == "__main__":
+    main()
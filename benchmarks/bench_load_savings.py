@@ -0,0 +1,65 @@
+# Benchmark for the Clarke-Wright savings loader
+# Loads manifests built by repeating the bundled package file onto enough trucks to carry them, reporting the runtime
+# and the packages left for the left-over pass, the copies of the truck 2 only packages beyond one truck load among them
+# Run from the project directory: python -m benchmarks.bench_load_savings
+import csv
+import time
+from pathlib import Path
+
+from package_delivery.algorithms.load_savings import load_packages_savings
+from package_delivery.datastructures.graph import Graph
+from package_delivery.datastructures.hash_map import ResizableHashMap
+from package_delivery.datastructures.package_constraints import PackageConstraints
+from package_delivery.datastructures.package_index import PackageIndex
+from package_delivery.datastructures.package_table import PackageTable
+from package_delivery.delivery.simulation import TRUCK_CAPACITY
+from package_delivery.delivery.trucks import Trucks
+
+PACKAGE_COUNTS = [40, 1_000, 10_000, 30_000]
+PACKAGE_FILE = Path(__file__).parent.parent / 'package_delivery' / 'datastructures' / 'WGUPS Package File Formatted.csv'
+
+
+def _make_graph(package_count):
+    """
+    Build a graph over the bundled locations with a store of package_count packages.
+
+    The rows of the package file are repeated, the deliver-together notes are only kept on the first copy so the
+    groups stay the size of the bundled ones.
+
+    Parameters:
+        package_count (int): The number of packages.
+
+    Returns:
+        Graph: The graph, its package store holding the packages.
+    """
+    with PACKAGE_FILE.open('r') as csv_file:
+        rows = list(csv.reader(csv_file))
+    store = ResizableHashMap(index=PackageIndex(PackageConstraints()), table=PackageTable())
+    for package_id in range(1, package_count + 1):
+        row = rows[(package_id - 1) % len(rows)]
+        special_notes = row[7]
+        if package_id > len(rows) and special_notes.startswith('Must be delivered with'):
+            special_notes = 'None'
+        store.add_package(package_id, row[1], row[2], row[3], row[4], row[5], row[6], special_notes)
+    graph = Graph()
+    graph.load_graph_vectorized('WGUPS_distances.csv')
+    graph.insert_packages_vertex_associate(store)
+    return graph
+
+
+def main():
+    print(f"{'packages':>10} {'trucks':>8} {'seconds':>10} {'left over':>10}")
+    for package_count in PACKAGE_COUNTS:
+        graph = _make_graph(package_count)
+        # Room for every package plus one truck per 10 for the loads the constraints leave partly empty
+        truck_count = -(-package_count // TRUCK_CAPACITY) + package_count // (10 * TRUCK_CAPACITY) + 2
+        trucks = [Trucks(truck_id, f"TRUCK_{truck_id}") for truck_id in range(1, truck_count + 1)]
+        track_package_id = set()
+        start = time.perf_counter()
+        load_packages_savings(trucks, graph, track_package_id)
+        seconds = time.perf_counter() - start
+        print(f"{package_count:>10} {truck_count:>8} {seconds:>10.3f} {package_count - len(track_package_id):>10}")
+
+
+if __name__ == "__main__":
+    main()
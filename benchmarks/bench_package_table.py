@@ -0,0 +1,76 @@
+# Memory benchmark for package storage
+# Compares the memory held by HashMapEntry objects against PackageTable rows and their PackageRow views
+# Run from the project directory: python -m benchmarks.bench_package_table
+import csv
+import tracemalloc
+from pathlib import Path
+
+from package_delivery.datastructures.hash_map import HashMapEntry
+from package_delivery.datastructures.package_table import PackageTable
+
+PACKAGE_COUNTS = [40, 10_000, 100_000]
+PACKAGE_FILE = Path(__file__).parent.parent / 'package_delivery' / 'datastructures' / 'WGUPS Package File Formatted.csv'
+
+
+def _read_rows():
+    """
+    Read the bundled package file, the rows are repeated to build larger manifests.
+
+    Returns:
+        list: The rows of the package file.
+    """
+    with PACKAGE_FILE.open('r') as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def _manifest(rows, package_count):
+    """
+    Yield package_count packages as freshly built strings, the same as csv.reader hands them to load_hash_map.
+
+    Parameters:
+        rows (list): The rows of the package file.
+        package_count (int): The number of packages to yield.
+
+    Yields:
+        tuple: The fields of one package.
+    """
+    for package_id in range(1, package_count + 1):
+        row = [''.join(field) for field in rows[(package_id - 1) % len(rows)]]
+        yield package_id, row[1], row[2], row[3], row[4], row[5], row[6], row[7], 'AT_HUB'
+
+
+def measure(build):
+    """
+    Measure the memory still allocated by the object build returns.
+
+    Parameters:
+        build (callable): Builds and returns the packages.
+
+    Returns:
+        int: The number of bytes allocated.
+    """
+    tracemalloc.start()
+    packages = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del packages
+    return allocated
+
+
+def main():
+    rows = _read_rows()
+    print(f"{'packages':>10} {'HashMapEntry B/pkg':>20} {'PackageTable B/pkg':>20} {'ratio':>8}")
+    for package_count in PACKAGE_COUNTS:
+        entries_bytes = measure(lambda: [HashMapEntry(*package) for package in _manifest(rows, package_count)])
+
+        def build_table():
+            table = PackageTable()
+            return table, [table.get_row(table.append(*package)) for package in _manifest(rows, package_count)]
+
+        table_bytes = measure(build_table)
+        print(f"{package_count:>10} {entries_bytes / package_count:>20,.0f} {table_bytes / package_count:>20,.0f} "
+              f"{entries_bytes / table_bytes:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
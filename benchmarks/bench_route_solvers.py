@@ -0,0 +1,70 @@
+# Benchmark for the per-truck route solvers
+# Compares the 2-opt heuristic against the exact Held-Karp solver on random routes over the bundled locations,
+# reporting the optimality gap of 2-opt and the runtime per route of both
+# Run from the project directory: python -m benchmarks.bench_route_solvers
+import time
+
+import numpy as np
+
+from package_delivery.algorithms.held_karp import MAX_EXACT_STOPS, held_karp_path
+from package_delivery.algorithms.two_opt_route import two_opt_delta
+from package_delivery.datastructures.graph import graph_access
+
+STOP_COUNTS = [6, 10, 13, MAX_EXACT_STOPS]
+ROUTES_PER_COUNT = 50
+
+
+def path_distance(weights, order):
+    """
+    Get the distance of a path.
+
+    Parameters:
+        weights (numpy.ndarray): n x n distances between the stops.
+        order (list): The order of the stops.
+
+    Returns:
+        float: The total distance.
+    """
+    return float(weights[order[:-1], order[1:]].sum())
+
+
+def time_solver(solver, weights):
+    """
+    Time one run of a route solver.
+
+    Parameters:
+        solver (callable): two_opt_delta or held_karp_path.
+        weights (numpy.ndarray): n x n distances between the stops.
+
+    Returns:
+        tuple: (distance, seconds)
+    """
+    start = time.perf_counter()
+    order = solver(weights)
+    seconds = time.perf_counter() - start
+    return path_distance(weights, order), seconds
+
+
+def main():
+    matrix = graph_access.get_distance_matrix
+    rng = np.random.default_rng(0)
+    print(f"{'stops':>6} {'2-opt ms':>10} {'exact ms':>10} {'mean gap %':>11} {'max gap %':>10} {'optimal':>8}")
+    for stop_count in STOP_COUNTS:
+        gaps = []
+        two_opt_seconds = exact_seconds = 0.0
+        for _ in range(ROUTES_PER_COUNT):
+            route_ids = rng.choice(matrix.shape[0], size=stop_count, replace=False)
+            weights = matrix[np.ix_(route_ids, route_ids)]
+            two_opt_distance, seconds = time_solver(two_opt_delta, weights)
+            two_opt_seconds += seconds
+            exact_distance, seconds = time_solver(held_karp_path, weights)
+            exact_seconds += seconds
+            gaps.append((two_opt_distance - exact_distance) / exact_distance * 100)
+        gaps = np.array(gaps)
+        print(f"{stop_count:>6} {two_opt_seconds / ROUTES_PER_COUNT * 1000:>10.2f} "
+              f"{exact_seconds / ROUTES_PER_COUNT * 1000:>10.2f} {gaps.mean():>11.2f} {gaps.max():>10.2f} "
+              f"{np.count_nonzero(gaps < 1e-9):>5}/{ROUTES_PER_COUNT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,14 @@
 
 from package_delivery import datastructures as ds
 from package_delivery.delivery import trucks
-from package_delivery.delivery.trucks import high_priority, medium_priority, low_priority
 from package_delivery.timeutil.time_util import validate_time_format
 
-trucks_list = [high_priority, medium_priority, low_priority]
+# Every truck of the fleet, see logistics/fleet.json
+trucks_list = trucks.fleet_trucks
+# Truck ID -> truck, for the truck menus
+trucks_by_id = {truck.truck_id: truck for truck in trucks_list}
+# IDs offered by the truck menus, e.g. '1, 2, 3'
+truck_choices = ', '.join(str(truck_id) for truck_id in trucks_by_id)
 
 
 def delivery_submenu():
@@ -15,6 +19,7 @@ def delivery_submenu():
             "[1] Begin Delivery and View Package Status\n"
             "[2] Check Status of a Specific Package During Delivery\n"
             "[3] Review Final Package Delivery Status\n"
+            "[4] Estimate On-Time Probability Under Varying Speeds and Delays\n"
         )
         if sub_menu == "0":
             print("Returning to main menu")
@@ -24,14 +29,15 @@ def delivery_submenu():
             if not validate_time_format(current_time) or not validate_time_format(
                     current_time):
                 continue
+            # Simulate the day once, every time asked is a lookup in its status index
+            day_status = trucks.get_day_status(trucks_list, ds.graph_access)
             while True:
                 print('Current Time:', current_time)
-                trucks.deliver_packages(trucks_list, ds.graph_access, current_time, current_time)
-                trucks.print_truck_delivery_status(trucks_list, current_time)
-                trucks.print_all_package_status_delivery(trucks_list)
-                # Reset truck distances after printing when continue_delivery is True
-                for truck in trucks_list:
-                    truck.distances = []
+                trucks.filter_packages_by_status(trucks_list, day_status, current_time)
+                trucks.print_truck_delivery_status(trucks_list, current_time, day_status)
+                trucks.print_all_package_status_delivery(trucks_list, day_status)
+                trucks.print_status_summary(trucks_list, day_status, current_time)
+                trucks.print_truck_progress(trucks_list, day_status, current_time)
                 continue_delivery = input("Continue delivery? (Y/N): ")
                 if continue_delivery.upper() == "Y":
                     current_time = input("Enter time (e.g., '8:35 AM', '9:35 AM', '12:03 PM'): ")
@@ -46,6 +52,7 @@ def delivery_submenu():
             for truck in trucks_list:
                 for package in truck.get_packages():
                     print(f"Package ID: {package.package_id} (Truck {truck.truck_id})")
+            day_status = trucks.get_day_status(trucks_list, ds.graph_access)
             while True:
 
                 package_id = int(input("Enter package ID or '0' to exit: "))
@@ -58,23 +65,21 @@ def delivery_submenu():
                     print("Invalid time format. Try again.")
                     current_time = input("Enter current time (e.g., '8:35 AM', '9:35 AM', '12:03 PM'): ")
 
-                trucks.deliver_packages(trucks_list, ds.graph_access, current_time, current_time)
-
                 # Find the right truck and display the package status
-                for truck in trucks_list:
-                    for package in truck.get_packages():
-                        if package.package_id == package_id:
-                            truck.time_tracker.lookup_single_package_status(package_id, current_time)
-                            break
+                trucks.print_package_status(trucks_list, day_status, package_id, current_time)
 
                 continue_seeing = input("See another package status? (Y/N): ")
                 if continue_seeing.upper() == "N":
                     break
         if sub_menu == "3":
             print("Final status of all packages:")
-            trucks.deliver_packages(trucks_list, ds.graph_access, "8:00 AM", "5:00 PM")
-            trucks.print_truck_delivery_status(trucks_list, "5:00 PM")
-            trucks.print_all_package_status_delivery(trucks_list)
+            day_status = trucks.get_day_status(trucks_list, ds.graph_access)
+            trucks.filter_packages_by_status(trucks_list, day_status, "5:00 PM")
+            trucks.print_truck_delivery_status(trucks_list, "5:00 PM", day_status)
+            trucks.print_all_package_status_delivery(trucks_list, day_status)
+        if sub_menu == "4":
+            robustness = trucks.simulate_robustness(trucks_list, ds.graph_access)
+            trucks.print_robustness(trucks_list, robustness)
 
 
 def visualize_submenu():
@@ -83,49 +88,63 @@ def visualize_submenu():
             "[0] Exit\n"
             "[1] Visualize Individual Package Locations\n"
             "[2] Visualize Specific Truck Route\n"
-            "[3] Visualize All Truck Routes\n\n"
+            "[3] Visualize All Truck Routes\n"
+            "[4] Visualize Package Status of Each Truck\n"
+            "[5] Visualize Truck Positions at a Time\n\n"
         )
         if sub_menu == "0":
             print("Returning to main menu")
             break
         elif sub_menu == "1":
             while True:
-                print("Select Truck ID(1-3):")
+                print(f"Select Truck ID({truck_choices}):")
                 truck_choice = int(input())
-                if 1 <= truck_choice <= 3:
-                    selected_truck = None
-                    for truck in trucks_list:
-                        if truck.truck_id == truck_choice:
-                            selected_truck = truck
-                    if selected_truck:
-                        print(f"Selected Truck {selected_truck.truck_id}")
-                        selected_truck.visualize.visualize_package_locations(selected_truck.truck_id,
-                                                                             selected_truck.truck_name)
-                        continue_visualizing = input("Continue visualizing? (Y/N): ")
-                        if continue_visualizing.upper() == "Y":
-                            continue
-                        else:
-                            break
+                selected_truck = trucks_by_id.get(truck_choice)
+                if selected_truck:
+                    print(f"Selected Truck {selected_truck.truck_id}")
+                    selected_truck.visualize.visualize_package_locations(selected_truck.truck_id,
+                                                                         selected_truck.truck_name)
+                    continue_visualizing = input("Continue visualizing? (Y/N): ")
+                    if continue_visualizing.upper() == "Y":
+                        continue
+                    else:
+                        break
         elif sub_menu == "2":
             while True:
-                print("Select Truck ID(1-3):")
+                print(f"Select Truck ID({truck_choices}):")
                 truck_choice = int(input())
-                if 1 <= truck_choice <= 3:
-                    selected_truck = None
-                    for truck in trucks_list:
-                        if truck.truck_id == truck_choice:
-                            selected_truck = truck
-                    if selected_truck:
-                        print(f"Selected Truck {selected_truck.truck_id}")
-                        selected_truck.visualize.visualize_truck_route(selected_truck.truck_id,
-                                                                       selected_truck.truck_name)
-                        continue_visualizing = input("Continue visualizing? (Y/N): ")
-                        if continue_visualizing.upper() == "Y":
-                            continue
-                        else:
-                            break
+                selected_truck = trucks_by_id.get(truck_choice)
+                if selected_truck:
+                    print(f"Selected Truck {selected_truck.truck_id}")
+                    selected_truck.visualize.visualize_truck_route(selected_truck.truck_id,
+                                                                   selected_truck.truck_name)
+                    continue_visualizing = input("Continue visualizing? (Y/N): ")
+                    if continue_visualizing.upper() == "Y":
+                        continue
+                    else:
+                        break
         elif sub_menu == "3":
-            high_priority.visualize.visualize_all_truck_routes(trucks_list, high_priority.truck_id)
+            trucks_list[0].visualize.visualize_all_truck_routes(trucks_list, trucks_list[0].truck_id)
+        elif sub_menu == "4":
+            current_time = input("Enter time (e.g., '8:35 AM', '9:35 AM', '12:03 PM'): ")
+            if not validate_time_format(current_time):
+                continue
+            day_status = trucks.get_day_status(trucks_list, ds.graph_access)
+            # One snapshot of every package, each truck's chart reads its counts
+            snapshot = trucks.print_status_summary(trucks_list, day_status, current_time)
+            for truck in trucks_list:
+                truck.visualize.visualize_pie_chart(snapshot.truck_counts.get(truck.truck_id, {}), truck.truck_name)
+        elif sub_menu == "5":
+            current_time = input("Enter time (e.g., '8:35 AM', '9:35 AM', '12:03 PM'): ")
+            if not validate_time_format(current_time):
+                continue
+            day_status = trucks.get_day_status(trucks_list, ds.graph_access)
+            # Positions interpolated along the leg each truck is driving
+            trucks.print_truck_progress(trucks_list, day_status, current_time)
+            coordinates = trucks.get_truck_coordinates(trucks_list, day_status, current_time)
+            trucks_list[0].visualize.visualize_truck_positions(
+                coordinates, {truck.truck_id: truck.truck_name for truck in trucks_list},
+                f"Truck Positions at {current_time}")
 
 
 def ui():
@@ -141,9 +160,8 @@ def ui():
         (SystemExit())
 
     elif main_menu == "1":
-        high_priority.time_tracker.print_all_package_status()
-        medium_priority.time_tracker.print_all_package_status()
-        low_priority.time_tracker.print_all_package_status()
+        for truck in trucks_list:
+            truck.time_tracker.print_all_package_status()
         value = ds.package_hashmap.check_all_packages()
         print("CHECK IF ALL 40 PACKAGES EXIST:", value)
         ui()
@@ -177,6 +195,8 @@ def ui():
         ui()
 
 
-print("ID:003964281")
-print("Welcome to Package Delivery System, please select an option: ")
-ui()
+# Guarded so worker processes of the robustness mode can import this module without starting the menu
+if __name__ == "__main__":
+    print("ID:003964281")
+    print("Welcome to Package Delivery System, please select an option: ")
+    ui()
@@ -1,3 +1,7 @@
 from package_delivery.algorithms.dijkstra_algo import dijkstra
+from package_delivery.algorithms.held_karp import MAX_EXACT_STOPS, get_route_order, held_karp_route
+from package_delivery.algorithms.insertion_route import insertion_route
+from package_delivery.algorithms.load_cluster import load_packages_cluster
 from package_delivery.algorithms.load_nearest_neighbor import load_packages_nearest_neighbor
-from package_delivery.algorithms.two_opt_route import two_opt_route
+from package_delivery.algorithms.load_savings import load_packages_savings
+from package_delivery.algorithms.two_opt_route import apply_route, get_route_stops, two_opt_route
@@ -1,12 +1,11 @@
 import heapq
-import math
+
+import numpy as np
 
 
 # src-> Hub to start all deliveries from
-# min_heap as priority queue to find a minimum-distance neighbor, greedy approach: find min_distance
-# visited_queue = [] node after find a minimum-distance neighbor
-# find a path to from start_vertex to end_vertex pred_vertex, whenever comparison to assign distance, append pred_vertex
-#
+# Searches the subgraph of the route over the graph's distance matrix by integer vertex id: visited is a boolean array,
+# neighbors are relaxed a whole matrix row at a time and the search stops once every vertex of the route is settled
 def dijkstra(graph1, src, route):
     """
     Calculates the shortest distances and predecessor vertices for a given source vertex in a weighted graph using
@@ -21,45 +20,47 @@ def dijkstra(graph1, src, route):
     source vertex. - pred_vertex (dict): A dictionary mapping each vertex in the graph to its predecessor vertex in
     the shortest path from the source vertex.
     """
-    distances: dict = {node: math.inf for node in route}  # Initialize all distances to infinity in route
-    pred_vertex: dict = {node: None for node in graph1.get_vertices}  # Initialize predecessor vertices to None
-    distances[src] = 0  # Set source vertex distance to 0
-    # The min-heap is used to prioritize processing vertices with the shortest known distance first,
-    # ensuring that we find the shortest paths efficiently during the Dijkstra's algorithm execution.
-    min_heap = [(0, src)]  # Create a min-heap queue of (distance, vertex) tuples
+    # Local index i of the search is graph id vertex_ids[i]
+    route_ids = graph1.get_route_ids(list(route))
+    vertex_ids = np.unique(np.concatenate((route_ids, [graph1.get_vertex_id(src)])))
+    weights = graph1.get_distance_matrix[np.ix_(vertex_ids, vertex_ids)]
+    local_src = int(np.searchsorted(vertex_ids, graph1.get_vertex_id(src)))
+    local_route = np.searchsorted(vertex_ids, route_ids)
 
-    visited_queue = []  # Track visited vertices
+    vertex_count = weights.shape[0]
+    local_distances = np.full(vertex_count, np.inf)
+    local_pred = np.full(vertex_count, -1, dtype=np.intp)
+    visited = np.zeros(vertex_count, dtype=bool)
+    in_route = np.zeros(vertex_count, dtype=bool)
+    in_route[local_route] = True
+    remaining = int(np.count_nonzero(in_route))  # Route vertices not settled yet
+    local_distances[local_src] = 0
+    min_heap = [(0.0, local_src)]
 
-    # Continue the loop until the min_heap is not empty.
-    # The min_heap will be empty when all vertices have been visited and processed.
-    while min_heap:
-        # Pop the vertex with the smallest distance from the min_heap.
-        # Will be src vertex initially
-        # The heapq.heappop() function automatically selects the vertex with the smallest distance
-        # due to the use of a min-heap.
+    while min_heap and remaining:
         current_distance, current_vertex = heapq.heappop(min_heap)
-        # Skip if already in visited_queue and current_distance is currently stored distance
-        if current_vertex in visited_queue and current_distance > distances[current_vertex]:
+        # Skip stale heap entries for vertices already settled with a shorter distance
+        if visited[current_vertex]:
             continue
-        visited_queue.append(current_vertex)  # Mark the vertex as visited
-
-        # Check if neighbor is in route before entering the loop
-        neighbors = [neighbor for neighbor in graph1.get_edge_weight[current_vertex].keys() if neighbor in route]
-        # Iterate over the neighbors of the current_vertex and their corresponding weights
-        for neighbor in neighbors:
-            weight = graph1.get_edge_weight[current_vertex][neighbor]
-            # Calculate the total distance to the neighbor by adding the weight of the edge
-            # between the current_vertex and the neighbor to the distance of the current_vertex.
-            total_distance = current_distance + weight
-            # If the calculated distance is smaller than the current known distance to the neighbor,
-            # update the distance dictionary with the new, smaller distance.
-            if total_distance < distances[neighbor]:
-                distances[neighbor] = total_distance
-                # Update the predecessor vertex for the 'neighbor' vertex to be the 'current_vertex'.
-                pred_vertex[neighbor] = current_vertex
-                # Push the updated distance and 'neighbor' vertex as a tuple into the min-heap.
-                # This ensures that the 'neighbor' vertex will be processed later with its updated distance.
+        visited[current_vertex] = True
+        if in_route[current_vertex]:
+            remaining -= 1
+        # Relax every edge of the vertex at once, NaN (no edge) never compares smaller
+        total_distances = current_distance + weights[current_vertex]
+        improved = np.flatnonzero(total_distances < local_distances)
+        if len(improved):
+            local_distances[improved] = total_distances[improved]
+            local_pred[improved] = current_vertex
+            for neighbor, total_distance in zip(improved.tolist(), total_distances[improved].tolist()):
                 heapq.heappush(min_heap, (total_distance, neighbor))
+
+    vertex_names = graph1.get_vertex_names
+    distances: dict = dict(zip(route, local_distances[local_route].tolist()))
+    distances[src] = 0  # Set source vertex distance to 0
+    pred_vertex: dict = {node: None for node in graph1.get_vertices}  # Initialize predecessor vertices to None
+    for node, predecessor in zip(route, local_pred[local_route].tolist()):
+        if predecessor >= 0:
+            pred_vertex[node] = vertex_names[vertex_ids[predecessor]]
     # Returns distances and pred_vertex dictionaries
     return distances, pred_vertex
 
@@ -0,0 +1,98 @@
+import numpy as np
+
+from package_delivery.algorithms.two_opt_route import apply_route, get_route_stops, two_opt_delta, two_opt_route
+
+# Largest number of unique stops solved exactly, the DP table has 2^(n - 2) x (n - 2) entries
+MAX_EXACT_STOPS = 16
+
+
+# Held-Karp dynamic programming over subsets, vectorized with NumPy
+# best[mask, j] is the shortest path that starts at the first stop, visits exactly the middle stops in mask and ends
+# at middle stop j. Subsets are filled in order of size, and for each end stop every subset of that size is extended
+# at once from the subsets without it
+def held_karp_path(weights):
+    """
+    Find the shortest order of a path visiting every stop, keeping its first and last stops in place.
+
+    Parameters:
+        weights (numpy.ndarray): n x n distances between the stops, NaN where there is no edge.
+
+    Returns:
+        list: The shortest order, as positions in the starting order.
+    """
+    stop_count = weights.shape[0]
+    if stop_count < 4:
+        # At most one middle stop, there is only one order
+        return list(range(stop_count))
+    distances = np.where(np.isnan(weights), np.inf, weights)
+    middle_count = stop_count - 2  # Stops 1..n-2, bit j of a mask is stop j + 1
+    middle = distances[1:-1, 1:-1]
+    masks = np.arange(1 << middle_count)
+    subset_sizes = np.zeros(len(masks), dtype=np.intp)
+    for j in range(middle_count):
+        subset_sizes += (masks >> j) & 1
+
+    best = np.full((len(masks), middle_count), np.inf)
+    parent = np.full((len(masks), middle_count), -1, dtype=np.int8)
+    single = 1 << np.arange(middle_count)
+    best[single, np.arange(middle_count)] = distances[0, 1:-1]
+
+    for size in range(2, middle_count + 1):
+        layer = masks[subset_sizes == size]
+        for j in range(middle_count):
+            with_j = layer[(layer >> j) & 1 == 1]
+            # Paths over the subset without j, followed by the edge from their end stop to j
+            candidates = best[with_j ^ (1 << j)] + middle[:, j]
+            previous = candidates.argmin(axis=1)
+            best[with_j, j] = candidates[np.arange(len(with_j)), previous]
+            parent[with_j, j] = previous
+
+    full = len(masks) - 1
+    end = int((best[full] + distances[1:-1, -1]).argmin())
+    # Walk the parents back from the last middle stop
+    order = [stop_count - 1]
+    mask = full
+    while end >= 0:
+        order.append(end + 1)
+        mask, end = mask ^ (1 << end), int(parent[mask, end])
+    order.append(0)
+    return order[::-1]
+
+
+# Solve the truck's route exactly when it is small enough, otherwise fall back to the 2-opt heuristic
+def held_karp_route(trucks, graph, max_stops=MAX_EXACT_STOPS):
+    """
+    Optimize the route of a truck with the exact Held-Karp algorithm, or with 2-opt if it has too many stops.
+
+    Args:
+        trucks (Truck): The truck to optimize.
+        graph (Graph): The graph representing the locations and distances.
+        max_stops (int): The largest number of unique stops to solve exactly.
+
+    Returns:
+        None
+    """
+    unique_route, weights = get_route_stops(trucks, graph)
+    if len(unique_route) > max_stops:
+        two_opt_route(trucks, graph)
+        return
+    apply_route(trucks, [unique_route[position] for position in held_karp_path(weights)])
+
+
+# Order of a route's stops from their distances alone, module level so a process pool can pickle it and solve the
+# routes of many trucks at once
+def get_route_order(weights, exact=False, max_stops=MAX_EXACT_STOPS):
+    """
+    Find the order of a route's stops, exactly for small routes when asked, otherwise with 2-opt.
+
+    Parameters:
+        weights (numpy.ndarray): n x n distances between the stops in route order, see get_route_stops.
+        exact (bool): True to solve routes of up to max_stops stops with Held-Karp.
+        max_stops (int): The largest number of unique stops to solve exactly.
+
+    Returns:
+        list: The order, as positions in the route order.
+    """
+    if exact and weights.shape[0] <= max_stops:
+        return held_karp_path(weights)
+    return two_opt_delta(weights)
@@ -0,0 +1,214 @@
+from package_delivery.algorithms.two_opt_route import apply_route
+from package_delivery.timeutil.time_util import convert_12h_to_seconds, travel_seconds
+
+# Deadline-aware cheapest insertion
+# A route keeps the arrival time at every stop, computed forward from the start, and the slack of every stop, the
+# least time any stop from it to the end can be delayed without missing its deadline, computed backward. Putting a
+# vertex between two stops delays every later stop by the same added travel time, so whether an insertion keeps the
+# route on time is one comparison with the slack of the stop after it, and each position is checked in O(1).
+
+# Start hub = '4001 South 700 East'
+HUB = '4001 South 700 East'
+
+
+class InsertionRoute:
+    """
+    Class to represent a route being built by cheapest insertion, with the arrival times and slack of its stops.
+
+    Positions of stops count from 0, route index k is the start for k = 0 and stop k - 1 after it.
+
+    Attributes:
+        __start (str): The vertex the route starts from.
+        __end (str): The vertex the route ends at after the last stop, None for a route ending at its last stop.
+        __distance (callable): (vertex, vertex) -> miles.
+        __speed (float): The truck speed in miles per minute.
+        __stops (list): The vertex of every stop in order.
+        __deadlines (list): The deadline of every stop in seconds since midnight, float('inf') for none.
+        __arrival (list): The arrival time at every route index, the start time first.
+        __slack (list): The slack of every route index, float('inf') past the last stop.
+    """
+
+    def __init__(self, start, start_time, distance, speed, end=None, stops=()):
+        """
+        Build a route from its stops.
+
+        Parameters:
+            start (str): The vertex the route starts from.
+            start_time (int): The time the route starts in seconds since midnight.
+            distance (callable): (vertex, vertex) -> miles.
+            speed (float): The truck speed in miles per minute.
+            end (str): The vertex the route ends at after the last stop, None for a route ending at its last stop.
+            stops (iterable): (vertex, deadline in seconds since midnight) of every stop in order.
+        """
+        self.__start = start
+        self.__end = end
+        self.__distance = distance
+        self.__speed = speed
+        self.__stops = []
+        self.__deadlines = []
+        for vertex, deadline in stops:
+            self.__stops.append(vertex)
+            self.__deadlines.append(deadline)
+        self.__arrival = [start_time]
+        self.__slack = []
+        self._update(0)
+
+    def __len__(self):
+        """
+        Returns the number of stops.
+        """
+        return len(self.__stops)
+
+    @property
+    def get_stops(self):
+        """
+        Get the vertex of every stop in order.
+
+        Returns:
+            list: The stops.
+        """
+        return list(self.__stops)
+
+    @property
+    def get_arrival_times(self):
+        """
+        Get the arrival time at every stop.
+
+        Returns:
+            list: Seconds since midnight, in stop order.
+        """
+        return self.__arrival[1:]
+
+    def _update(self, position):
+        """
+        Recompute the arrival times from a stop on and the slack of every stop.
+
+        Parameters:
+            position (int): The first stop whose arrival time changed.
+
+        Returns:
+            None
+        """
+        route = [self.__start] + self.__stops
+        del self.__arrival[position + 1:]
+        for index in range(position + 1, len(route)):
+            self.__arrival.append(self.__arrival[-1] + travel_seconds(self.__distance(route[index - 1], route[index]),
+                                                                      self.__speed))
+        slack = [float('inf')] * (len(route) + 1)
+        for index in range(len(route) - 1, 0, -1):
+            slack[index] = min(slack[index + 1], self.__deadlines[index - 1] - self.__arrival[index])
+        self.__slack = slack
+
+    # Cheapest position for a vertex that keeps every stop on time, the first one on ties
+    def find_insertion(self, vertex, deadline):
+        """
+        Find the position that adds the fewest miles for a vertex without making a stop late.
+
+        Parameters:
+            vertex (str): The vertex to visit.
+            deadline (float): The latest arrival at the vertex in seconds since midnight.
+
+        Returns:
+            tuple: (added miles, position, merge), merge is True when the vertex is the stop at the position and is
+            visited with it for free, or None if no position keeps every stop on time.
+        """
+        distance = self.__distance
+        speed = self.__speed
+        route = [self.__start] + self.__stops
+        arrival = self.__arrival
+        slack = self.__slack
+        best = None
+        for index in range(1, len(route) + 1):
+            before = route[index - 1]
+            after = route[index] if index < len(route) else self.__end
+            if index < len(route) and after == vertex:
+                # Same address as a stop, delivered with it for free
+                candidate = (0, index - 1, True) if arrival[index] <= deadline else None
+            else:
+                added_time = travel_seconds(distance(before, vertex), speed)
+                if arrival[index - 1] + added_time > deadline:
+                    continue
+                miles = distance(before, vertex)
+                if after is not None:
+                    miles += distance(vertex, after) - distance(before, after)
+                    added_time += (travel_seconds(distance(vertex, after), speed) -
+                                   travel_seconds(distance(before, after), speed))
+                candidate = (miles, index - 1, False) if added_time <= slack[index] else None
+            if candidate is not None and (best is None or candidate[0] < best[0]):
+                best = candidate
+        return best
+
+    def insert(self, position, vertex, deadline, merge=False):
+        """
+        Put a vertex on the route.
+
+        Parameters:
+            position (int): The position of the new stop, or of the stop it is visited with.
+            vertex (str): The vertex.
+            deadline (float): The latest arrival at the vertex in seconds since midnight.
+            merge (bool): True to visit the vertex with the stop at the position, see find_insertion.
+
+        Returns:
+            None
+        """
+        if merge:
+            self.__deadlines[position] = min(self.__deadlines[position], deadline)
+        else:
+            self.__stops.insert(position, vertex)
+            self.__deadlines.insert(position, deadline)
+        self._update(position)
+
+
+# Order a truck's stops by inserting its packages, earliest deadline first, at the cheapest position that keeps every
+# delivery on time. A package no position keeps on time is delivered last
+def get_insertion_stops(trucks, graph, start_time=None):
+    """
+    Get the stops of a truck in the order of deadline-aware cheapest insertion.
+
+    Args:
+        trucks (Truck): The truck to route.
+        graph (Graph): The graph representing the locations and distances.
+        start_time (int): The time the truck leaves the hub in seconds since midnight, None for the truck's current
+            time. The truck does not leave before its delayed packages reach the hub.
+
+    Returns:
+        list: The stops in delivery order, the hub left out.
+    """
+    packages = trucks.get_packages()
+    if not packages:
+        return []
+    if start_time is None:
+        start_time = trucks.time_tracker.get_current_truck_time()
+    constraints = graph.get_package_store.index.constraints
+    available_times = [constraints.get_available_time(package.package_id) for package in packages]
+    start_time = max([start_time] + [time for time in available_times if time is not None])
+    shortest_paths = graph.get_shortest_paths([HUB] + [package.address for package in packages])
+    route = InsertionRoute(HUB, start_time, shortest_paths.get_distance, trucks.time_tracker.get_truck_speed)
+    # Stable, packages with the same deadline keep their loading order
+    for package in sorted(packages, key=lambda package: package.deadline_minutes):
+        deadline = convert_12h_to_seconds(package.delivery_deadline)
+        insertion = route.find_insertion(package.address, deadline)
+        if insertion is None:
+            route.insert(len(route), package.address, deadline)
+        else:
+            _, position, merge = insertion
+            route.insert(position, package.address, deadline, merge)
+    return route.get_stops
+
+
+# Build a truck's route with deadline-aware cheapest insertion, see get_insertion_stops
+# Starts at the hub, 4001 South 700 East, and ends at the last stop
+def insertion_route(trucks, graph, start_time=None):
+    """
+    Build the route of a truck with deadline-aware cheapest insertion.
+
+    Args:
+        trucks (Truck): The truck to route.
+        graph (Graph): The graph representing the locations and distances.
+        start_time (int): The time the truck leaves the hub in seconds since midnight, None for the truck's current
+            time. The truck does not leave before its delayed packages reach the hub.
+
+    Returns:
+        None
+    """
+    apply_route(trucks, get_insertion_stops(trucks, graph, start_time))
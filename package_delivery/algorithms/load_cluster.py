@@ -0,0 +1,135 @@
+import math
+
+import numpy as np
+
+from package_delivery.algorithms.held_karp import get_route_order
+from package_delivery.algorithms.insertion_route import get_insertion_stops
+from package_delivery.algorithms.load_savings import HUB, assign_routes, get_unit_deadline, make_units
+from package_delivery.loadutil import load_util as util
+
+# Cluster-first, route-second loader
+# Packages are grouped into the same units as the savings loader. The units that may share a truck, the same truck,
+# hub arrival and deadline, are swept around the hub by the angle of their address on the map, starting after the
+# widest angular gap, and cut into clusters of a truck load. Every cluster is then routed on its own, from the hub
+# through its stops and back, from the distance matrix between them: exactly for small clusters, otherwise with 2-opt.
+# The routed clusters are put on the trucks the same way as the savings routes, earliest deadline first, so the route of
+# a cluster decides which of its units go first when a truck only has room for part of it. A truck's clusters one
+# after another are not a route that keeps deadlines, so a truck with a start time gets its stops in deadline-aware
+# insertion order from that time, the order the route solvers start from.
+
+
+def get_sweep_angles(coordinates, vertices, hub=HUB):
+    """
+    Get the angle of every vertex around the hub on the map.
+
+    Parameters:
+        coordinates (dict): Address -> (x, y) on the map, see Visualize.get_all_coordinates.
+        vertices (list): The vertices.
+        hub (str): The vertex the angles are taken around.
+
+    Returns:
+        numpy.ndarray: The angle of every vertex in radians, in [-pi, pi]. A vertex without coordinates is at the hub
+        and gets the angle 0.
+    """
+    hub_x, hub_y = coordinates[hub]
+    points = np.array([coordinates.get(vertex, (hub_x, hub_y)) for vertex in vertices], dtype=float).reshape(-1, 2)
+    return np.arctan2(points[:, 1] - hub_y, points[:, 0] - hub_x)
+
+
+# Sweep the units around the hub and cut them into truck loads
+def sweep_clusters(angles, loads, capacity):
+    """
+    Cut units into clusters of consecutive angles around the hub.
+
+    Parameters:
+        angles (numpy.ndarray): The angle of every unit in radians, see get_sweep_angles.
+        loads (list): The number of packages of every unit.
+        capacity (int): The most packages a cluster can take.
+
+    Returns:
+        list: The clusters, each a list of unit positions in sweep order.
+    """
+    if len(angles) == 0:
+        return []
+    order = np.argsort(angles, kind='stable')
+    # Gap from each angle to the next one around the circle, the sweep starts after the widest so a cluster does not
+    # straddle it
+    sorted_angles = angles[order]
+    gaps = np.diff(np.append(sorted_angles, sorted_angles[0] + 2 * math.pi))
+    order = np.roll(order, -(int(gaps.argmax()) + 1)).tolist()
+    clusters = [[]]
+    load = 0
+    for position in order:
+        if clusters[-1] and load + loads[position] > capacity:
+            clusters.append([])
+            load = 0
+        clusters[-1].append(position)
+        load += loads[position]
+    return clusters
+
+
+# Distances of a cluster's route, the hub at both ends and the unique stops of its units in between
+def _get_cluster_weights(graph, vertices):
+    """
+    Get the distances between the hub and the stops of a cluster.
+
+    Parameters:
+        graph (Graph): The graph of the delivery locations.
+        vertices (list): The unique vertices of the cluster.
+
+    Returns:
+        numpy.ndarray: (n + 2) x (n + 2) distances between the hub, the vertices and the hub again.
+    """
+    route_ids = graph.get_route_ids([HUB] + vertices + [HUB])
+    return graph.get_distance_matrix[np.ix_(route_ids, route_ids)]
+
+
+# Load packages onto the trucks by clustering their stops around the hub, then routing every cluster
+def load_packages_cluster(trucks, graph, track_package_id, coordinates, capacity=None):
+    """
+    Loads packages into the trucks with clusters swept around the hub, each routed on its own.
+
+    Parameters:
+        trucks (list): The trucks to load, a truck without a start time leaves after the others.
+        graph (Graph): An object representing the graph of locations and distances.
+        track_package_id (set): A set of package IDs that have been loaded.
+        coordinates (dict): Address -> (x, y) on the map, see Visualize.get_all_coordinates.
+        capacity (int): The most packages a cluster can take, None for the largest truck capacity.
+
+    Returns:
+        None
+    """
+    constraints = graph.get_package_store.index.constraints
+    if capacity is None:
+        capacity = max(truck.capacity for truck in trucks)
+    units = make_units(util.get_all_packages_to_load(graph, track_package_id), constraints, capacity)
+    angles = get_sweep_angles(coordinates, [unit[0] for unit in units])
+    loads = [len(unit[3]) for unit in units]
+
+    # Only units with the same truck and hub arrival constraints and the same deadline share a cluster, a cluster
+    # mixing deadlines would take the earliest one to a truck with room for all of it
+    unit_keys = {}
+    for position, unit in enumerate(units):
+        unit_keys.setdefault((unit[1], unit[2], get_unit_deadline(unit)), []).append(position)
+    clusters = []
+    for positions in unit_keys.values():
+        positions = np.array(positions)
+        for cluster in sweep_clusters(angles[positions], [loads[position] for position in positions], capacity):
+            clusters.append(positions[cluster].tolist())
+
+    # Route every cluster
+    cluster_vertices = [list(dict.fromkeys(units[position][0] for position in cluster)) for cluster in clusters]
+    orders = [get_route_order(_get_cluster_weights(graph, vertices), True) for vertices in cluster_vertices]
+
+    # Units of a cluster in the order its route visits their stops, the hub at both ends left out
+    routes = []
+    for cluster, vertices, order in zip(clusters, cluster_vertices, orders):
+        stop_order = {vertices[position - 1]: rank for rank, position in enumerate(order[1:-1])}
+        routes.append(sorted(cluster, key=lambda position: stop_order[units[position][0]]))
+    assign_routes(trucks, units, routes, track_package_id)
+
+    # Stops of the trucks leaving at a set time in an order that keeps their deadlines, the order 2-opt starts from
+    for truck in trucks:
+        start_time = truck.time_tracker.get_start_time()
+        if start_time is not None and truck.get_package_count():
+            truck.route = [HUB] + get_insertion_stops(truck, graph, start_time) + [HUB]
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from package_delivery.loadutil import load_util as util
 
 
@@ -17,13 +19,34 @@ def load_packages_nearest_neighbor(trucks, graph, track_package_id):
     None
     """
     MAX_PACKAGE_COUNT = 15
-
+    # Loading constraints compiled from the special notes when the packages were stored
+    constraints = graph.get_package_store.index.constraints
+
+    # Trucks are loaded in the order they leave, trucks waiting for a driver last
+    trucks = sorted(trucks, key=lambda truck: (truck.time_tracker.get_start_time() is None,
+                                               truck.time_tracker.get_start_time() or 0))
+    # A fleet with more trucks than the packages fill shares them out, so no truck is left empty. The trucks are
+    # otherwise filled in order
+    package_count = len(util.get_all_packages_to_load(graph, track_package_id))
+    filled_count = 0
     for truck in trucks:
+        package_count -= min(MAX_PACKAGE_COUNT, truck.capacity)
+        filled_count += 1
+        if package_count <= 0:
+            break
+    share_out = filled_count < len(trucks)
+
+    for position, truck in enumerate(trucks):
         # Start from the hub
         current_vertex = '4001 South 700 East'
         # Remaining packages for each truck after loading the previous truck
         remaining_packages = util.get_all_packages_to_load(graph, track_package_id)
         truck.route = [current_vertex]  # Initialize the route with the hub vertex
+        # Number of packages the truck can take, and the number it is filled up to with the nearest packages
+        max_count = min(MAX_PACKAGE_COUNT, truck.capacity)
+        truck_count = max_count
+        if share_out:
+            truck_count = min(max_count, math.ceil(len(remaining_packages) / (len(trucks) - position)))
 
         # Separate packages that meet constraints from other packages for the current truck
         constrained_packages = []
@@ -31,7 +54,7 @@ def load_packages_nearest_neighbor(trucks, graph, track_package_id):
         unconstrained_packages = []
 
         for package in remaining_packages:
-            if util.has_load_packages(truck, package):
+            if util.has_load_packages(truck, package, constraints):
                 constrained_packages.append(package)
             else:
                 # Add unconstrained packages to the unconstrained_packages list
@@ -41,9 +64,16 @@ def load_packages_nearest_neighbor(trucks, graph, track_package_id):
         # print(truck.truck_name, 'unconstrained_packages', unconstrained_packages, '\n')
         # print(truck.truck_name, 'constrained_packages', constrained_packages, '\n')
 
-        # # Load constrained packages first to satisfy constraints
-        if truck.truck_id == 1 or truck.truck_id == 2:
+        # Remove unconstrained packages with constraints of the current truck from the unconstrained_packages list
+        unconstrained_packages = [package for package in unconstrained_packages if
+                                  not util.has_package_constraints(package, constraints)]
+
+        # # Load constrained packages first to satisfy constraints, when the truck cannot take every candidate and
+        # nearest neighbor could leave them out. Otherwise nearest neighbor orders them with the others
+        if len(constrained_packages) + len(unconstrained_packages) > truck_count:
             for package in constrained_packages.copy():
+                if truck.get_package_count() >= max_count:
+                    break
                 current_vertex = package.address
                 truck.insert_packages(package)
                 track_package_id.add(package.package_id)
@@ -51,30 +81,29 @@ def load_packages_nearest_neighbor(trucks, graph, track_package_id):
                 # To make debugging easier
                 # print(f"Debug: Successfully loaded Package {package.package_id} onto {truck.truck_name}.")
 
-        # Remove unconstrained packages with constraints of the current truck from the unconstrained_packages list
-        unconstrained_packages = [package for package in unconstrained_packages if
-                                  not util.has_package_constraints(package)]
-
         all_packages_for_truck = constrained_packages + unconstrained_packages
+        # Integer vertex ids of the candidate packages, kept in step with all_packages_for_truck
+        candidate_ids = graph.get_route_ids([package.address for package in all_packages_for_truck])
+        distance_matrix = graph.get_distance_matrix
 
-        while truck.get_package_count() < MAX_PACKAGE_COUNT:
-            min_distance = math.inf
+        while truck.get_package_count() < truck_count:
             nearest_package = None
 
-            for package in all_packages_for_truck:
-                dest_vertex = package.address
-                distance = graph.get_edge_weight[current_vertex][dest_vertex]
-
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_package = package
+            if len(all_packages_for_truck) > 0:
+                # Distances from the current vertex to every candidate, read from one row of the distance matrix
+                distances = distance_matrix[graph.get_vertex_id(current_vertex), candidate_ids]
+                # argmin returns the first minimum, the same package the strict '<' comparison picked
+                nearest_index = int(np.argmin(distances))
+                if distances[nearest_index] < math.inf:
+                    nearest_package = all_packages_for_truck[nearest_index]
 
             # Load the nearest package if it meets the lowest distance
             if nearest_package is not None:
                 current_vertex = nearest_package.address
                 truck.insert_packages(nearest_package)
                 track_package_id.add(nearest_package.package_id)
-                all_packages_for_truck.remove(nearest_package)
+                del all_packages_for_truck[nearest_index]
+                candidate_ids = np.delete(candidate_ids, nearest_index)
             else:
                 # Break out of the while loop if there are no more packages to load
                 break
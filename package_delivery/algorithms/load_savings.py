@@ -0,0 +1,398 @@
+import heapq
+import math
+from bisect import bisect_left
+
+import numpy as np
+
+from package_delivery.datastructures.package_constraints import ALL_TRUCKS, AvailableAfter, WrongAddressUntil
+from package_delivery.loadutil import load_util as util
+from package_delivery.timeutil.time_util import SECONDS_PER_MINUTE, convert_12h_to_minutes
+
+# Clarke-Wright savings loader
+# Packages are grouped into units that must travel together: a deliver-together group, or the packages of one address
+# with the same truck and hub arrival constraints, split into truck loads. Every unit starts as its own route out of
+# the hub and back, and joining the end of one route to the end of another saves
+# d(hub, i) + d(hub, j) - d(i, j) miles. The savings are computed for all units at once from the distance matrix, in
+# row blocks keeping each unit's best SAVINGS_NEIGHBORS, and the merges are taken from a heap, best first, while the
+# joined route fits on a truck. The routes are then put on the trucks, earliest deadline first, each on the first
+# truck leaving late enough and before its deadline that has room for it.
+
+# Start hub = '4001 South 700 East'
+HUB = '4001 South 700 East'
+# Best savings kept per unit, the merges a unit can take part in are almost always among its nearest units
+SAVINGS_NEIGHBORS = 64
+# Rows of the savings matrix computed at once, bounds the memory of the matrix to SAVINGS_BLOCK x units
+SAVINGS_BLOCK = 1024
+# Deadline of the packages without one, in minutes since midnight
+END_OF_DAY = convert_12h_to_minutes('EOD')
+
+
+# Truck a package is bound to and the time it can leave the hub, from its compiled constraints
+def _get_unit_key(constraints, package):
+    """
+    Get the truck and hub time constraints of a package.
+
+    Parameters:
+        constraints (PackageConstraints): The compiled constraints of the package store.
+        package (HashMapEntry): The package.
+
+    Returns:
+        tuple: (truck ID or None, seconds since midnight the package is ready, 0 if it is ready at the start of the
+        day and math.inf if it waits for a correction with no known time)
+    """
+    compiled = constraints.get_compiled(package.package_id)
+    if compiled is None:
+        return None, 0
+    truck_id = compiled.allowed_trucks.bit_length() - 1 if compiled.allowed_trucks != ALL_TRUCKS else None
+    ready_time = 0
+    for constraint in compiled.constraints:
+        if isinstance(constraint, AvailableAfter):
+            ready_time = max(ready_time, constraint.time)
+        elif isinstance(constraint, WrongAddressUntil):
+            ready_time = max(ready_time, math.inf if constraint.time is None else constraint.time)
+    return truck_id, ready_time
+
+
+def make_units(packages, constraints, capacity):
+    """
+    Group the packages into the units the savings are computed over.
+
+    Parameters:
+        packages (list): The packages to load.
+        constraints (PackageConstraints): The compiled constraints of the package store.
+        capacity (int): The packages a truck can carry.
+
+    Returns:
+        list: (vertex, truck ID or None, ready time, packages) of every unit, the vertex being the address of its
+        first package.
+    """
+    loading = {package.package_id for package in packages}
+    units = {}
+    for package in packages:
+        truck_id, ready_time = _get_unit_key(constraints, package)
+        group = constraints.get_group(package.package_id) & loading
+        # A deliver-together group is one unit keyed by its smallest member, the other keys by address
+        key = ('group', min(group)) if len(group) > 1 else (package.address, truck_id, ready_time)
+        unit = units.get(key)
+        if unit is None:
+            units[key] = [package.address, truck_id, ready_time, [package]]
+        else:
+            unit[1] = unit[1] if unit[1] is not None else truck_id
+            unit[2] = max(unit[2], ready_time)
+            unit[3].append(package)
+    # Units over a truck load are split into truck loads, a group that cannot fit is left to the left-over pass
+    split_units = []
+    for vertex, truck_id, ready_time, unit_packages in units.values():
+        if len(unit_packages) > capacity and len(constraints.get_group(unit_packages[0].package_id)) > 1:
+            continue
+        for start in range(0, len(unit_packages), capacity):
+            split_units.append((vertex, truck_id, ready_time, unit_packages[start:start + capacity]))
+    return split_units
+
+
+def get_savings(graph, vertices, truck_ids, neighbors=SAVINGS_NEIGHBORS, block=SAVINGS_BLOCK):
+    """
+    Compute the best savings of joining pairs of units.
+
+    Parameters:
+        graph (Graph): The graph of the delivery locations.
+        vertices (list): The vertex of every unit.
+        truck_ids (list): The truck every unit is bound to, None for any.
+        neighbors (int): The best savings kept per unit.
+        block (int): The rows of the savings matrix computed at once.
+
+    Returns:
+        list: (-saving, i, j) of the positive savings with i < j, a heap with the best saving first.
+    """
+    count = len(vertices)
+    if count < 2:
+        return []
+    distance_matrix = graph.get_distance_matrix
+    ids = graph.get_route_ids(vertices)
+    hub_distances = distance_matrix[graph.get_vertex_id(HUB), ids]
+    # Units bound to different trucks can never share a route, -1 marks the units bound to none
+    bound = np.array([-1 if truck_id is None else truck_id for truck_id in truck_ids], dtype=np.int64)
+    columns = np.arange(count)
+    heap = []
+    for start in range(0, count, block):
+        rows = columns[start:start + block]
+        savings = hub_distances[rows, None] + hub_distances[None, :] - distance_matrix[np.ix_(ids[rows], ids)]
+        # Each pair once, no unit with itself, no pair bound to different trucks
+        savings[columns[None, :] <= rows[:, None]] = -np.inf
+        conflict = (bound[rows, None] != bound[None, :]) & (bound[rows, None] >= 0) & (bound[None, :] >= 0)
+        savings[conflict] = -np.inf
+        if neighbors < count:
+            best = np.argpartition(savings, -neighbors, axis=1)[:, -neighbors:]
+        else:
+            best = np.broadcast_to(columns, savings.shape)
+        best_savings = np.take_along_axis(savings, best, axis=1)
+        positive = best_savings > 0
+        row_positions, _ = np.nonzero(positive)
+        heap.extend(zip((-best_savings[positive]).tolist(), rows[row_positions].tolist(), best[positive].tolist()))
+    heapq.heapify(heap)
+    return heap
+
+
+# Join routes best saving first, a merge only links units at the ends of their routes
+def _merge_routes(units, heap, capacity):
+    """
+    Merge the single unit routes with the savings heap.
+
+    Parameters:
+        units (list): (vertex, truck ID or None, ready time, packages) of every unit.
+        heap (list): The savings heap from get_savings.
+        capacity (int): The packages a truck can carry.
+
+    Returns:
+        list: The merged routes, each a list of unit positions in delivery order.
+    """
+    routes = [[position] for position in range(len(units))]
+    route_of = list(range(len(units)))
+    loads = [len(unit[3]) for unit in units]
+    truck_ids = [unit[1] for unit in units]
+    ready_times = [unit[2] for unit in units]
+    while heap:
+        _, i, j = heapq.heappop(heap)
+        route_i, route_j = route_of[i], route_of[j]
+        if route_i == route_j or loads[route_i] + loads[route_j] > capacity:
+            continue
+        # Routes bound to different trucks or ready at different times stay apart
+        if None not in (truck_ids[route_i], truck_ids[route_j]) and truck_ids[route_i] != truck_ids[route_j]:
+            continue
+        if ready_times[route_i] != ready_times[route_j]:
+            continue
+        first, second = routes[route_i], routes[route_j]
+        if i not in (first[0], first[-1]) or j not in (second[0], second[-1]):
+            continue
+        # Orient the routes so i ends the first and j starts the second
+        if first[-1] != i:
+            first.reverse()
+        if second[0] != j:
+            second.reverse()
+        # Relabel the shorter route into the longer one
+        if len(first) >= len(second):
+            first.extend(second)
+            keep, drop = route_i, route_j
+        else:
+            second[:0] = first
+            keep, drop = route_j, route_i
+        for position in routes[drop]:
+            route_of[position] = keep
+        routes[drop] = None
+        loads[keep] += loads[drop]
+        truck_ids[keep] = truck_ids[keep] if truck_ids[keep] is not None else truck_ids[drop]
+    return [route for route in routes if route is not None]
+
+
+# Earliest deadline of a unit's packages, routes with earlier deadlines get the earlier trucks
+def _get_earliest_deadline(units, route):
+    """
+    Get the earliest deadline of a route.
+
+    Parameters:
+        units (list): (vertex, truck ID or None, ready time, packages) of every unit.
+        route (list): The unit positions of the route.
+
+    Returns:
+        int: The earliest deadline in minutes since midnight.
+    """
+    return min(get_unit_deadline(units[position]) for position in route)
+
+
+def get_unit_deadline(unit):
+    """
+    Get the earliest deadline of a unit.
+
+    Parameters:
+        unit (tuple): (vertex, truck ID or None, ready time, packages) of the unit.
+
+    Returns:
+        int: The earliest deadline in minutes since midnight.
+    """
+    return min(package.deadline_minutes for package in unit[3])
+
+
+# First truck to leave that may take the packages, leaves after they are ready and has room for them
+def _find_truck(trucks_by_departure, departures, free, truck_id, ready_time, load):
+    """
+    Find the truck to load packages on.
+
+    Parameters:
+        trucks_by_departure (list): The trucks in the order they leave.
+        departures (dict): Truck ID -> the time the truck leaves, math.inf if it leaves after the others.
+        free (dict): Truck ID -> the packages the truck still has room for.
+        truck_id (int): The truck the packages are bound to, None for any.
+        ready_time (float): The time the packages can leave the hub.
+        load (int): The number of packages.
+
+    Returns:
+        Trucks: The truck, or None if no truck fits.
+    """
+    for truck in trucks_by_departure:
+        if ((truck_id is None or truck.truck_id == truck_id) and departures[truck.truck_id] >= ready_time
+                and free[truck.truck_id] >= load):
+            return truck
+    return None
+
+
+# Move the end of day units planned on a truck to the other trucks until it has room for a load
+# The units planned last move first, units bound to the truck or with a deadline stay
+def _make_room(truck, load, trucks_by_departure, departures, free, planned):
+    """
+    Make room on a truck by moving units without a deadline to other trucks.
+
+    Parameters:
+        truck (Trucks): The truck to make room on.
+        load (int): The number of packages to make room for.
+        trucks_by_departure (list): The trucks in the order they leave.
+        departures (dict): Truck ID -> the time the truck leaves, math.inf if it leaves after the others.
+        free (dict): Truck ID -> the packages the truck still has room for, updated if room is made.
+        planned (dict): Truck ID -> the units planned on the truck in load order, updated if room is made.
+
+    Returns:
+        bool: True if the truck has room for the load, False if it does not, then nothing is moved.
+    """
+    others = [other for other in trucks_by_departure if other is not truck]
+    moves = []
+    for unit in reversed(planned[truck.truck_id]):
+        if free[truck.truck_id] >= load:
+            break
+        if unit[1] is not None or get_unit_deadline(unit) < END_OF_DAY:
+            continue
+        other = _find_truck(others, departures, free, None, unit[2], len(unit[3]))
+        if other is not None:
+            free[truck.truck_id] += len(unit[3])
+            free[other.truck_id] -= len(unit[3])
+            moves.append((unit, other))
+    if free[truck.truck_id] < load:
+        # Not enough room, undo the moves
+        for unit, other in moves:
+            free[truck.truck_id] -= len(unit[3])
+            free[other.truck_id] += len(unit[3])
+        return False
+    for unit, other in moves:
+        planned[truck.truck_id].remove(unit)
+        planned[other.truck_id].append(unit)
+    return True
+
+
+def _plan_units(truck, route_units, free, planned, first=False):
+    """
+    Plan units onto a truck.
+
+    Parameters:
+        truck (Trucks): The truck.
+        route_units (list): (vertex, truck ID or None, ready time, packages) of the units.
+        free (dict): Truck ID -> the packages the truck still has room for, updated.
+        planned (dict): Truck ID -> the units planned on the truck in load order, updated.
+        first (bool): True to load the units before the units already planned on the truck.
+
+    Returns:
+        None
+    """
+    if first:
+        planned[truck.truck_id][:0] = route_units
+    else:
+        planned[truck.truck_id].extend(route_units)
+    free[truck.truck_id] -= sum(len(unit[3]) for unit in route_units)
+
+
+# Put routes of units on the trucks, earliest deadline first, each on the first truck leaving late enough and before
+# its deadline that has room for it. When the trucks leaving before a route's deadline are full, the end of day units
+# planned on the last of them move to other trucks to make room and the route is loaded ahead of the truck's other
+# units, the order the route solver starts from. A route with a deadline is split over the trucks in departure order
+# when a truck leaving earlier than the one with room for all of it has room for part of it
+def assign_routes(trucks, units, routes, track_package_id):
+    """
+    Load the routes onto the trucks, the units of a route in route order.
+
+    Parameters:
+        trucks (list): The trucks to load, a truck without a start time leaves after the others.
+        units (list): (vertex, truck ID or None, ready time, packages) of every unit, see make_units.
+        routes (list): The routes, each a list of unit positions in delivery order.
+        track_package_id (set): A set of package IDs that have been loaded.
+
+    Returns:
+        None
+    """
+    # Trucks in the order they leave, a truck without a start time leaves once a driver is back
+    departures = {truck.truck_id: math.inf if truck.time_tracker.get_start_time() is None
+                  else truck.time_tracker.get_start_time() for truck in trucks}
+    trucks_by_departure = sorted(trucks, key=lambda truck: departures[truck.truck_id])
+    departure_order = [departures[truck.truck_id] for truck in trucks_by_departure]
+    free = {truck.truck_id: truck.capacity - truck.get_package_count() for truck in trucks}
+    for truck in trucks:
+        truck.route = [HUB]
+
+    # Earliest deadline first, among the same deadline the routes fewer trucks may take go first
+    route_loads = []
+    for route in routes:
+        route_units = [units[position] for position in route]
+        truck_id = next((unit[1] for unit in route_units if unit[1] is not None), None)
+        ready_time = max(unit[2] for unit in route_units)
+        candidates = sum(1 for truck in trucks if (truck_id is None or truck.truck_id == truck_id)
+                         and departures[truck.truck_id] >= ready_time)
+        load = sum(len(unit[3]) for unit in route_units)
+        route_loads.append((_get_earliest_deadline(units, route), candidates, -load, route_units, truck_id, ready_time))
+    route_loads.sort(key=lambda route_load: route_load[:3])
+    # Units are planned onto the trucks first, so planned units can still move to make room
+    planned = {truck.truck_id: [] for truck in trucks}
+    for deadline, _, negative_load, route_units, truck_id, ready_time in route_loads:
+        deadline *= SECONDS_PER_MINUTE
+        truck = _find_truck(trucks_by_departure, departures, free, truck_id, ready_time, -negative_load)
+        if truck is None or departures[truck.truck_id] >= deadline:
+            # No truck leaving in time has room, make room on the last one that may take the route, the trucks
+            # leaving before the deadline are the first ones in departure order
+            early = next((early for early in reversed(trucks_by_departure[:bisect_left(departure_order, deadline)])
+                          if (truck_id is None or early.truck_id == truck_id)
+                          and departures[early.truck_id] >= ready_time and early.capacity >= -negative_load), None)
+            if early is not None and _make_room(early, -negative_load, trucks_by_departure, departures, free,
+                                                planned):
+                _plan_units(early, route_units, free, planned, first=True)
+                continue
+        # A route with a deadline goes whole only when no truck leaving earlier has room for part of it
+        split = (truck is not None and deadline < END_OF_DAY * SECONDS_PER_MINUTE
+                 and departures[truck.truck_id] > departure_order[0]
+                 and _find_truck(trucks_by_departure, departures, free, truck_id, ready_time, 1) is not truck)
+        if truck is not None and not split:
+            _plan_units(truck, route_units, free, planned)
+            continue
+        # No truck has room for the whole route, or an earlier one has room for part of it, place its units one by one
+        for unit in route_units:
+            truck = _find_truck(trucks_by_departure, departures, free, unit[1], unit[2], len(unit[3]))
+            if truck is not None:
+                _plan_units(truck, [unit], free, planned)
+
+    for truck in trucks:
+        for unit in planned[truck.truck_id]:
+            for package in unit[3]:
+                truck.insert_packages(package)
+                track_package_id.add(package.package_id)
+
+    # Add hub back to route, the same as the nearest neighbor loader
+    for truck in trucks:
+        truck.route.append(HUB)
+
+
+# Load packages onto the trucks with the Clarke-Wright savings algorithm
+def load_packages_savings(trucks, graph, track_package_id, capacity=None, neighbors=SAVINGS_NEIGHBORS):
+    """
+    Loads packages into the trucks with routes built by the Clarke-Wright savings algorithm.
+
+    Parameters:
+        trucks (list): The trucks to load, a truck without a start time leaves after the others.
+        graph (Graph): An object representing the graph of locations and distances.
+        track_package_id (set): A set of package IDs that have been loaded.
+        capacity (int): The most packages a route can take, None for the largest truck capacity.
+        neighbors (int): The best savings kept per unit, see get_savings.
+
+    Returns:
+        None
+    """
+    constraints = graph.get_package_store.index.constraints
+    if capacity is None:
+        capacity = max(truck.capacity for truck in trucks)
+    units = make_units(util.get_all_packages_to_load(graph, track_package_id), constraints, capacity)
+    heap = get_savings(graph, [unit[0] for unit in units], [unit[1] for unit in units], neighbors)
+    routes = _merge_routes(units, heap, capacity)
+    assign_routes(trucks, units, routes, track_package_id)
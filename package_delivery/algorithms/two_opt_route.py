@@ -1,3 +1,11 @@
+import numpy as np
+
+# Number of nearest stops considered as the new neighbor of a stop in a 2-opt move
+NEIGHBOR_COUNT = 8
+# Smallest decrease in distance a move must make, smaller deltas are rounding errors and could undo each other forever
+MIN_IMPROVEMENT = 1e-9
+
+
 def two_opt_swap(route, i, j):
     """
     Reverses the order of vertices between indices i and j in the given route.
@@ -25,12 +33,11 @@ def calculate_route_distance(route, graph):
     Returns:
     int: The total distance of the route.
     """
-    total_distance = 0
-    for i in range(len(route) - 1):
-        from_vertex = route[i]
-        to_vertex = route[i + 1]
-        total_distance += graph.get_edge_weight[from_vertex][to_vertex]
-    return total_distance
+    if len(route) < 2:
+        return 0
+    # Gather every leg from the distance matrix by integer vertex id in one step
+    route_ids = graph.get_route_ids(route)
+    return float(graph.get_distance_matrix[route_ids[:-1], route_ids[1:]].sum())
 
 
 # Remove repeated vertices in the route list to optimize the route for the truck
@@ -54,8 +61,121 @@ def remove_repeated_vertices(route):
     return unique_route.copy()
 
 
-# Implement the two-opt algorithm, brute force approach, optimize the order of addresses in route in
-# conjunction to utilizing dijkstra's algorithm
+# Nearest neighbors of every stop of a route, closest first, by position in the route
+def get_neighbor_lists(weights, neighbor_count=NEIGHBOR_COUNT):
+    """
+    Get the k nearest other stops of every stop of a route.
+
+    Parameters:
+        weights (numpy.ndarray): n x n distances between the stops of the route.
+        neighbor_count (int): The number of neighbors to keep per stop.
+
+    Returns:
+        numpy.ndarray: n x k positions of the nearest stops, closest first.
+    """
+    stop_count = weights.shape[0]
+    neighbor_count = min(neighbor_count, stop_count - 1)
+    distances = np.where(np.isnan(weights), np.inf, weights)
+    np.fill_diagonal(distances, np.inf)  # A stop is not its own neighbor
+    # Stable sort keeps the route order between stops at the same distance
+    return np.argsort(distances, axis=1, kind='stable')[:, :neighbor_count]
+
+
+# 2-opt with O(1) move evaluation on a path whose first and last stops stay in place
+# Reversing route[lo..hi] only replaces the edges (route[lo - 1], route[lo]) and (route[hi], route[hi + 1]) with
+# (route[lo - 1], route[hi]) and (route[lo], route[hi + 1]), so a move is scored from those four edges.
+# Moves are only tried between a stop and its nearest neighbors, so an improving move joining stops outside each
+# other's neighbor lists (which are not symmetric) can be missed and the result may be worse than full 2-opt. A stop
+# with no improving move among its neighbors gets its don't-look bit set and is skipped until one of its edges changes.
+# Like the brute force version, each round applies the best move found and the route is reversed in place
+def two_opt_delta(weights, neighbor_count=NEIGHBOR_COUNT):
+    """
+    Improve the order of a path with 2-opt moves, keeping its first and last stops in place.
+
+    Parameters:
+        weights (numpy.ndarray): n x n symmetric distances between the stops, in their starting order.
+        neighbor_count (int): The number of nearest stops each stop tries to connect to.
+
+    Returns:
+        list: The improved order, as positions in the starting order.
+    """
+    stop_count = weights.shape[0]
+    order = list(range(stop_count))
+    if stop_count < 4:
+        # Fewer than two movable stops, nothing to reverse
+        return order
+    distance = np.where(np.isnan(weights), np.inf, weights).tolist()
+    neighbors = get_neighbor_lists(weights, neighbor_count).tolist()
+    position = list(range(stop_count))  # Stop -> position in order
+    look = [True] * stop_count  # Don't-look bits, False to skip the stop
+    last = stop_count - 1
+
+    while True:
+        best_move = None  # (delta, lo, hi) of the best reversal of order[lo..hi]
+        for stop in range(stop_count):
+            if not look[stop]:
+                continue
+            stop_best = None
+            stop_position = position[stop]
+            for neighbor in neighbors[stop]:
+                neighbor_position = position[neighbor]
+                lo, hi = (stop_position, neighbor_position) if stop_position < neighbor_position else \
+                    (neighbor_position, stop_position)
+                # Replace the edges after stop and after neighbor with (stop, neighbor), reversing order[lo + 1..hi]
+                if hi < last:
+                    after = order[stop_position + 1]
+                    if distance[stop][neighbor] < distance[stop][after]:
+                        neighbor_after = order[neighbor_position + 1]
+                        delta = (distance[stop][neighbor] + distance[after][neighbor_after] -
+                                 distance[stop][after] - distance[neighbor][neighbor_after])
+                        if delta < -MIN_IMPROVEMENT and (stop_best is None or (delta, lo + 1, hi) < stop_best):
+                            stop_best = (delta, lo + 1, hi)
+                # Replace the edges before stop and before neighbor with (stop, neighbor), reversing order[lo..hi - 1]
+                if lo > 0:
+                    before = order[stop_position - 1]
+                    if distance[stop][neighbor] < distance[before][stop]:
+                        neighbor_before = order[neighbor_position - 1]
+                        delta = (distance[stop][neighbor] + distance[before][neighbor_before] -
+                                 distance[before][stop] - distance[neighbor_before][neighbor])
+                        if delta < -MIN_IMPROVEMENT and (stop_best is None or (delta, lo, hi - 1) < stop_best):
+                            stop_best = (delta, lo, hi - 1)
+            if stop_best is None:
+                look[stop] = False
+            elif best_move is None or stop_best < best_move:
+                best_move = stop_best
+        if best_move is None:
+            return order
+        _, lo, hi = best_move
+        # The stops at both ends of the two replaced edges get new edges, look at them again
+        for changed in (order[lo - 1], order[lo], order[hi], order[hi + 1]):
+            look[changed] = True
+        # Reverse order[lo..hi] in place
+        order[lo:hi + 1] = order[hi:lo - 1:-1]
+        for moved_position in range(lo, hi + 1):
+            position[order[moved_position]] = moved_position
+
+
+# Stops of a truck's route to optimize and the distances between them
+def get_route_stops(trucks, graph):
+    """
+    Get the unique stops of a truck's route, excluding the hub, and the distances between them.
+
+    Args:
+        trucks (Truck): The truck to optimize.
+        graph (Graph): The graph representing the locations and distances.
+
+    Returns:
+        tuple: (unique_route, weights) the stops in route order and their n x n distance matrix.
+    """
+    # Only unique address on the route list (excluding hub)
+    unique_route = [vertex for vertex in remove_repeated_vertices(trucks.route) if vertex != '4001 South 700 East']
+    # Distances between the stops of the route, in route order
+    route_ids = graph.get_route_ids(unique_route)
+    return unique_route, graph.get_distance_matrix[np.ix_(route_ids, route_ids)]
+
+
+# Implement the two-opt algorithm, optimize the order of addresses in route in conjunction to utilizing dijkstra's
+# algorithm, see two_opt_delta
 # Used to further decrease the total_distance traveled by the three trucks after the nearest neighbor algorithm
 # Starts at the hub, 4001 South 700 East, and ends at the hub
 def two_opt_route(trucks, graph):
@@ -69,38 +189,30 @@ def two_opt_route(trucks, graph):
     Returns:
         None
     """
-    # Only unique address on the route list (excluding hub)
-    unique_route = [vertex for vertex in remove_repeated_vertices(trucks.route) if vertex != '4001 South 700 East']
-    # Initialize the unique_route to the current_route
-    current_route = unique_route
+    unique_route, weights = get_route_stops(trucks, graph)
     # Will be the best-optimized route
-    best_route = current_route
-    improvement = True
-    # Continue to optimize until no further improvements are made
-    while improvement:
-        improvement = False
-        # Calculate distance of current_route
-        best_distance = calculate_route_distance(current_route, graph)
-        # Iterate through each vertex in the route except the first and last
-        for i in range(1, len(current_route) - 2):
-            for j in range(i + 1, len(current_route) - 1):
-
-                new_route = two_opt_swap(current_route, i, j)
-                # Calculate distance of new_route
-                new_distance = calculate_route_distance(new_route, graph)
-                # If new_distance is improvement of current best_route then update
-                if new_distance < best_distance:
-                    best_route = new_route
-                    best_distance = new_distance
-                    improvement = True
-        # Set current_route to best_route in this iteration
-        current_route = best_route
-    # Update the truck's route with the optimized route
-    trucks.route = best_route
+    best_route = [unique_route[position] for position in two_opt_delta(weights)]
+    apply_route(trucks, best_route)
+
+
+# Give a truck an optimized route and put its packages in the same order
+def apply_route(trucks, route):
+    """
+    Update the route of a truck and order its packages by the route.
+
+    Args:
+        trucks (Truck): The truck to update.
+        route (list): The optimized route.
+
+    Returns:
+        None
+    """
+    # Update the truck's route with the optimized route, stops that ended up next to each other are visited once
+    trucks.route = remove_repeated_vertices(route) if route else []
     # Optimize the order of packages to reflect the optimized route
     optimized_packages = []
     added_packages = set()  # Keep track of packages already added
-    for address in current_route:
+    for address in trucks.route:
         for package in trucks.get_packages():
             if package.address == address and package not in added_packages:
                 optimized_packages.append(package)
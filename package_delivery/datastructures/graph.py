@@ -1,7 +1,99 @@
 import csv
+import time
+import warnings
+from collections import namedtuple
+from collections.abc import Mapping
 from pathlib import Path
 
+import numpy as np
+
 from package_delivery.datastructures.hash_map import package_hashmap
+from package_delivery.datastructures.shortest_paths import ShortestPaths, floyd_warshall
+
+
+# Summary of a bulk distance table load: locations loaded, asymmetric cells found and seconds taken
+GraphLoadReport = namedtuple('GraphLoadReport', ['vertex_count', 'asymmetric_cells', 'load_seconds'])
+
+
+# Read-only dict-of-dicts view over the distance matrix, so code written against the old adjacency dictionary,
+# graph.get_edge_weight[vertex1][vertex2], keeps working
+class EdgeWeightView(Mapping):
+    """
+    Class to represent the adjacency-list view of a Graph's distance matrix.
+
+    Attributes:
+        __graph (Graph): The graph whose distance matrix is viewed.
+    """
+
+    def __init__(self, graph):
+        """
+        Initialize the view.
+
+        Parameters:
+            graph (Graph): The graph whose distance matrix is viewed.
+        """
+        self.__graph = graph
+
+    def __getitem__(self, vertex):
+        """
+        Get the edges of a vertex.
+
+        Parameters:
+            vertex (str): The source vertex.
+
+        Raises:
+            KeyError: If the vertex has no edges.
+
+        Returns:
+            EdgeWeightRow: The destination vertex -> weight view for the vertex.
+        """
+        vertex_id = self.__graph.get_vertex_ids.get(vertex)
+        if vertex_id is None:
+            raise KeyError(vertex)
+        row = self.__graph.get_distance_matrix[vertex_id]
+        if np.isnan(row).all():
+            raise KeyError(vertex)
+        return EdgeWeightRow(row, self.__graph.get_vertex_ids, self.__graph.get_vertex_names)
+
+    def __iter__(self):
+        matrix = self.__graph.get_distance_matrix
+        has_edges = ~np.isnan(matrix).all(axis=1)
+        vertex_names = self.__graph.get_vertex_names
+        for vertex_id in np.flatnonzero(has_edges):
+            yield vertex_names[vertex_id]
+
+    def __len__(self):
+        return int((~np.isnan(self.__graph.get_distance_matrix).all(axis=1)).sum())
+
+
+class EdgeWeightRow(Mapping):
+    """
+    Class to represent the edges of one vertex as a destination vertex -> weight mapping.
+
+    Attributes:
+        __row (numpy.ndarray): The vertex's row of the distance matrix, NaN where there is no edge.
+        __vertex_ids (dict): Vertex -> row/column of the distance matrix.
+        __vertex_names (list): Row/column of the distance matrix -> vertex.
+    """
+    __slots__ = ('__row', '__vertex_ids', '__vertex_names')
+
+    def __init__(self, row, vertex_ids, vertex_names):
+        self.__row = row
+        self.__vertex_ids = vertex_ids
+        self.__vertex_names = vertex_names
+
+    def __getitem__(self, vertex):
+        weight = self.__row.item(self.__vertex_ids[vertex])
+        if weight != weight:  # NaN, no edge between the vertices
+            raise KeyError(vertex)
+        return weight
+
+    def __iter__(self):
+        for vertex_id in np.flatnonzero(~np.isnan(self.__row)):
+            yield self.__vertex_names[vertex_id]
+
+    def __len__(self):
+        return int((~np.isnan(self.__row)).sum())
 
 
 # The Graph class we will use to represent the delivery locations and distances associated with each package
@@ -13,17 +105,31 @@ class Graph:
 
     Attributes:
         __vertices (dict): Dictionary of all vertices, which will be street address and their associated packages
-        __edge_weight (dict): Dictionary that will act as an adjacency list. Store edges and their weights between
-        vertices
+        __edge_weight (EdgeWeightView): Adjacency-list view of the distance matrix, kept for dictionary-style access
+        __package_store (ResizableHashMap): The package store the vertices were associated with, used for its indexes
+        __vertex_position (dict): Integer id of each vertex, its position in the order the vertices were added and its
+        row/column in the distance matrix
+        __vertex_names (list): Vertex of each integer id
+        __matrix (numpy.ndarray): Distance matrix, NaN where there is no edge, may have unused spare rows/columns
+        __shortest_paths (dict): Cached ShortestPaths tables by vertex id set, None for the whole graph, cleared
+        whenever a vertex or edge weight changes
     """
 
+    # Number of vertex subset tables kept in the shortest path cache
+    SHORTEST_PATHS_CACHE_SIZE = 64
+
     def __init__(self):
         """
         Initialize the graph object
         """
         self.__vertices = {}  # Dictionary of all vertices, which will be street address and their associated packages
-        self.__edge_weight = {}  # Dictionary that will act as an adjacency list. Store edges and their weights between
-        # vertices
+        self.__package_store = None  # Package store associated with the vertices
+        self.__vertex_position = {}  # Integer id of each vertex, in insertion order, used to order index lookups
+        self.__vertex_names = []  # Vertex of each integer id
+        self.__matrix = np.full((0, 0), np.nan)  # Distances between vertices by integer id
+        self.__edge_weight = EdgeWeightView(self)  # Adjacency-list view of the distance matrix
+        self.__load_report = None  # Report of the last load_graph_vectorized call
+        self.__shortest_paths = {}  # Cached all-pairs shortest path tables
 
     # Add new vertices to the graph.
     # Takes vertex(address) as parameter adds it to key 'vertices' dictionary with an empty list of values.
@@ -37,6 +143,47 @@ class Graph:
 
         """
         self.__vertices[vertex] = []
+        self._add_vertex_id(vertex)
+
+    # Give a vertex the next integer id and a row and column in the distance matrix
+    def _add_vertex_id(self, vertex):
+        """
+        Assigns an integer id to a vertex, growing the distance matrix if needed.
+
+        Parameters:
+            vertex (str): The vertex to assign an id to.
+
+        Returns:
+            int: The id of the vertex.
+        """
+        vertex_id = self.__vertex_position.get(vertex)
+        if vertex_id is not None:
+            return vertex_id
+        vertex_id = len(self.__vertex_names)
+        self.__vertex_position[vertex] = vertex_id
+        self.__vertex_names.append(vertex)
+        self.__shortest_paths.clear()
+        if vertex_id >= self.__matrix.shape[0]:
+            # Double the capacity so adding vertices one at a time stays amortized O(V) per vertex
+            self._reserve_vertices(max(8, self.__matrix.shape[0] * 2))
+        return vertex_id
+
+    def _reserve_vertices(self, capacity):
+        """
+        Grows the distance matrix to hold at least capacity vertices.
+
+        Parameters:
+            capacity (int): The number of vertices to make room for.
+
+        Returns:
+            None
+        """
+        old_capacity = self.__matrix.shape[0]
+        if capacity <= old_capacity:
+            return
+        matrix = np.full((capacity, capacity), np.nan)
+        matrix[:old_capacity, :old_capacity] = self.__matrix
+        self.__matrix = matrix
 
     @property
     def get_vertices(self):
@@ -48,16 +195,159 @@ class Graph:
         """
         return self.__vertices
 
+    @property
+    def get_package_store(self):
+        """
+        Get the package store associated with the vertices of the graph.
+
+        Returns:
+            ResizableHashMap: The package store, or None if no packages have been associated yet.
+        """
+        return self.__package_store
+
+    def get_package_sort_key(self, package):
+        """
+        Get the key that orders packages the way iterating over get_vertices does, by vertex and then package ID.
+
+        Parameters:
+            package (HashMapEntry): The package to get the key for.
+
+        Returns:
+            tuple: (vertex position, package ID)
+        """
+        return self.__vertex_position.get(package.address, len(self.__vertex_position)), package.package_id
+
     @property
     def get_edge_weight(self):
         """
         Get the-edge weight.
 
         Returns:
-            dict: The-edge weight
+            EdgeWeightView: The-edge weight as a read-only dictionary view of the distance matrix
         """
         return self.__edge_weight
 
+    @property
+    def get_distance_matrix(self):
+        """
+        Get the distance matrix, row and column i belong to the vertex with integer id i.
+
+        Returns:
+            numpy.ndarray: A contiguous, read-only V x V float matrix, NaN where there is no edge. Use
+            update_edge_weight to change a weight so cached shortest paths are invalidated.
+        """
+        vertex_count = len(self.__vertex_names)
+        if self.__matrix.shape[0] != vertex_count:
+            # Drop the spare capacity once so the returned matrix is contiguous
+            self.__matrix = np.ascontiguousarray(self.__matrix[:vertex_count, :vertex_count])
+        matrix = self.__matrix.view()
+        matrix.flags.writeable = False
+        return matrix
+
+    # All-pairs shortest paths, computed once with Floyd-Warshall and cached until a vertex or edge weight changes
+    # Passing vertices restricts the paths to those vertices, the same as dijkstra restricted to a truck's route
+    def get_shortest_paths(self, vertices=None):
+        """
+        Get the all-pairs shortest path table of the graph, or of the subgraph induced by some of its vertices.
+
+        Parameters:
+            vertices (iterable, optional): The vertices paths may use, e.g. a truck route. Default to every vertex.
+
+        Raises:
+            KeyError: If a vertex is not in the graph.
+
+        Returns:
+            ShortestPaths: The shortest distance and next hop between every pair of the vertices.
+        """
+        if vertices is None:
+            key = None
+            vertex_ids = np.arange(len(self.__vertex_names))
+        else:
+            key = frozenset(self.__vertex_position[vertex] for vertex in vertices)
+            vertex_ids = np.fromiter(sorted(key), dtype=np.intp, count=len(key))
+        shortest_paths = self.__shortest_paths.get(key)
+        if shortest_paths is None:
+            matrix = self.get_distance_matrix
+            distances, next_hop = floyd_warshall(matrix[np.ix_(vertex_ids, vertex_ids)])
+            shortest_paths = ShortestPaths([self.__vertex_names[vertex_id] for vertex_id in vertex_ids], vertex_ids,
+                                           distances, next_hop)
+            if len(self.__shortest_paths) >= self.SHORTEST_PATHS_CACHE_SIZE:
+                # Evict the oldest table
+                del self.__shortest_paths[next(iter(self.__shortest_paths))]
+            self.__shortest_paths[key] = shortest_paths
+        return shortest_paths
+
+    @property
+    def get_load_report(self):
+        """
+        Get the report of the last load_graph_vectorized call.
+
+        Returns:
+            GraphLoadReport: The report, or None if the graph was not bulk loaded.
+        """
+        return self.__load_report
+
+    @property
+    def get_vertex_ids(self):
+        """
+        Get the integer id of every vertex.
+
+        Returns:
+            dict: Vertex -> integer id.
+        """
+        return self.__vertex_position
+
+    @property
+    def get_vertex_names(self):
+        """
+        Get the vertex of every integer id.
+
+        Returns:
+            list: Integer id -> vertex.
+        """
+        return self.__vertex_names
+
+    def get_vertex_id(self, vertex):
+        """
+        Get the integer id of a vertex.
+
+        Parameters:
+            vertex (str): The vertex.
+
+        Raises:
+            KeyError: If the vertex is not in the graph.
+
+        Returns:
+            int: The integer id of the vertex.
+        """
+        return self.__vertex_position[vertex]
+
+    def get_route_ids(self, route):
+        """
+        Convert a route of vertices to their integer ids.
+
+        Parameters:
+            route (list): A list of vertices.
+
+        Returns:
+            numpy.ndarray: The integer ids of the vertices in route order.
+        """
+        vertex_position = self.__vertex_position
+        return np.fromiter((vertex_position[vertex] for vertex in route), dtype=np.intp, count=len(route))
+
+    def get_distance(self, vertex1, vertex2):
+        """
+        Get the weight of the edge between two vertices.
+
+        Parameters:
+            vertex1 (str): The first vertex.
+            vertex2 (str): The second vertex.
+
+        Returns:
+            float: The weight of the edge, NaN if there is no edge.
+        """
+        return self.__matrix.item(self.__vertex_position[vertex1], self.__vertex_position[vertex2])
+
     # Add edges between vertex1 and vertex2, and the weight between them
     # Creates dictionaries for vertex1 and vertex2 and inner dictionaries for vertex1 and vertex2
     def _add_edge(self, vertex1, vertex2, weight=1.0):
@@ -73,28 +363,33 @@ class Graph:
         Returns:
             bool: True if the edge is successfully added, False otherwise.
         """
-        # self.edge_weight = [(edges)] = weight
         # Checks if vertex1 and vertex2 exist in the vertices dictionary
         if vertex1 in self.__vertices and vertex2 in self.__vertices:
-            # If vertex1 not already in the dictionary, then create an empty inner dictionary for vertex1
-            if vertex1 not in self.__edge_weight:
-                self.__edge_weight[vertex1] = {}
-            # If vertex2 not already in the dictionary, then create an empty inner dictionary for vertex2
-            if vertex2 not in self.__edge_weight:
-                self.__edge_weight[vertex2] = {}
-            self.__edge_weight[vertex1][
-                # Add vertex2 as the key to the inner dictionary of vertex1 with weight as the value -> key-value pair
-                vertex2] = weight
-            # Add vertex1 as the key of the inner dictionary of vertex2 with weight as the
-            # value -> key-value pair
-            # if vertex1 != vertex2: # If vertex1 and vertex2 are not the same, add vertex1 as key of the inner
-            # dictionary of vertex2 with weight as the value -> key-value pair self.edge_weight[vertex2][vertex1] =
-            # weight
-            self.__edge_weight[vertex2][vertex1] = weight
+            vertex1_id = self.__vertex_position[vertex1]
+            vertex2_id = self.__vertex_position[vertex2]
+            # Store the weight both ways, the distances are undirected
+            self.__matrix[vertex1_id, vertex2_id] = weight
+            self.__matrix[vertex2_id, vertex1_id] = weight
+            self.__shortest_paths.clear()
             return True
         else:
             return False
 
+    # Change the distance between two existing vertices, e.g. for a road closure or a corrected distance
+    def update_edge_weight(self, vertex1, vertex2, weight):
+        """
+        Updates the weight of the edge between two vertices, invalidating cached shortest paths.
+
+        Parameters:
+            vertex1 (str): The first vertex.
+            vertex2 (str): The second vertex.
+            weight (float): The new weight, NaN to remove the edge.
+
+        Returns:
+            bool: True if the edge is successfully updated, False if a vertex is not in the graph.
+        """
+        return self._add_edge(vertex1, vertex2, weight)
+
     def insert_packages_vertex_associate(self, hashmap):
         """
         Inserts packages into the vertex associate.
@@ -105,26 +400,14 @@ class Graph:
         Returns:
             None
         """
-        for bucket in hashmap.map:
-            for item in bucket:
-                package_package = item[1].address
-                package = item[1]
-                if package_package in self.__vertices:
-                    self.__vertices[package_package].append(package)
-                else:
-                    self.__vertices[package_package] = [package]
-
-        for address, packages in self.__vertices.items():
-            for package in packages:
-                if package.address in self.__edge_weight:
-                    package.edge_weight = self.__edge_weight[package.address]
-                    break
+        self.__package_store = hashmap
+        for package_id, package in hashmap.items():
+            package_package = package.address
+            if package_package in self.__vertices:
+                self.__vertices[package_package].append(package)
             else:
-                for vertex1, edges in self.__edge_weight.items():
-                    for vertex2, weight in edges.items():
-                        if package.address == vertex1 or package.address == vertex2:
-                            package.edge_weight = weight
-                            break
+                self.__vertices[package_package] = [package]
+                self._add_vertex_id(package_package)
 
     # Helper function to get data from WGUPS_distances in order to create edges between vertices
     @staticmethod
@@ -172,6 +455,94 @@ class Graph:
                 self._add_edge(vertex1, vertex2, weight)
         return self
 
+    # Load graph with vertices and weights in one vectorized pass over the distance table
+    # Produces the same graph as load_graph: each row only connects to the rows above it and itself, so the lower
+    # triangle (diagonal included) is the table and it is mirrored to fill the upper triangle
+    def load_graph_vectorized(self, file_name):
+        """
+        Loads a graph from a CSV file, converting each row of distances at once and building the matrix in bulk.
+
+        Parameters:
+            file_name (str): The name of the CSV file.
+
+        Raises:
+            ValueError: If a location is listed twice, a row has more distances than there are locations, a distance
+            is not a number or a cell in the lower triangle is missing.
+
+        Returns:
+            self (Graph): The updated graph object.
+        """
+        start = time.perf_counter()
+        # Get the current directory where this file is
+        csv_path = Path(__file__).parent / file_name
+        vertices = []
+        rows = []
+        with csv_path.open('r', newline='') as csv_file:
+            csv_reader = csv.reader(csv_file)
+            next(csv_reader, None)  # Skip header
+            for row in csv_reader:
+                if not row:
+                    continue
+                # 0-2 indexes are location_name, location_street, location_zip, the rest are distances
+                vertices.append(row[1])  # Addresses will act as vertices
+                rows.append(self._parse_distance_row(row[3:]))
+
+        vertex_count = len(vertices)
+        if len(set(vertices)) != vertex_count:
+            raise ValueError(f"Duplicate locations in {file_name}")
+        table = np.full((vertex_count, vertex_count), np.nan)
+        for i in range(vertex_count):
+            if len(rows[i]) > vertex_count:
+                raise ValueError(f"More distances than locations in row {i + 1} ({vertices[i]}) of {file_name}")
+            table[i, :len(rows[i])] = rows[i]
+            rows[i] = None  # Free the row once it is in the table
+
+        lower = np.tri(vertex_count, dtype=bool)
+        missing = np.argwhere(lower & np.isnan(table))
+        if len(missing) > 0:
+            row, column = missing[0]
+            raise ValueError(f"{len(missing)} missing distances in {file_name}, first at row {row + 1} "
+                             f"({vertices[row]}) column {column + 1} ({vertices[column]})")
+        # Mirror the lower triangle, the upper triangle of the file is only used to check symmetry
+        weights = np.where(lower, table, table.T)
+        asymmetric_cells = int(np.count_nonzero(~lower & ~np.isnan(table) & (table != weights)))
+        if asymmetric_cells > 0:
+            warnings.warn(f"{asymmetric_cells} distances in the upper triangle of {file_name} differ from the lower "
+                          f"triangle, the lower triangle is used")
+
+        self._reserve_vertices(len(self.__vertex_names) + vertex_count)
+        for vertex in vertices:
+            self._add_vertex(vertex)
+        vertex_ids = self.get_route_ids(vertices)
+        self.__matrix[np.ix_(vertex_ids, vertex_ids)] = weights
+        self.__shortest_paths.clear()
+
+        self.__load_report = GraphLoadReport(vertex_count, asymmetric_cells, time.perf_counter() - start)
+        return self
+
+    @staticmethod
+    def _parse_distance_row(cells):
+        """
+        Converts the distance cells of one CSV row to floats in a single call, blank cells become NaN.
+
+        Parameters:
+            cells (list): The distance cells of the row, without the location columns.
+
+        Raises:
+            ValueError: If a non-blank cell is not a number.
+
+        Returns:
+            numpy.ndarray: The distances of the row.
+        """
+        cells = [cell.strip() for cell in cells]
+        # Trailing blank cells, the upper triangle of a lower-triangular table, are left to the NaN padding
+        while cells and not cells[-1]:
+            cells.pop()
+        try:
+            return np.array([cell or 'nan' for cell in cells], dtype=float)
+        except ValueError:
+            raise ValueError(f"could not convert string to float in distances: {','.join(cells)!r}") from None
+
     # Print all vertices and weights in Edge: vertex1 -> vertex2, Weight: format
     # It iterates over the graph.edge_weight dictionary, which is functions like an adjacency list of the graph.
     def print_graph_edge_weight(self):
@@ -253,7 +624,7 @@ class Graph:
 
 # Create a graph and load it with data from WGUPS_distances.csv of edges between packages and their distances
 graph_access = Graph()
-graph_access.load_graph('WGUPS_distances.csv')
+graph_access.load_graph_vectorized('WGUPS_distances.csv')
 # Associate packages with their vertices in the graph to allow for easy access to packages
 graph_access.insert_packages_vertex_associate(package_hashmap)
 
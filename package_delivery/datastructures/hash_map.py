@@ -1,6 +1,11 @@
 import csv
 from pathlib import Path
 
+from package_delivery.datastructures.package_constraints import PackageConstraints, load_overrides
+from package_delivery.datastructures.package_index import PackageIndex
+from package_delivery.datastructures.package_table import PackageTable
+from package_delivery.timeutil.time_util import convert_12h_to_minutes
+
 
 # Individual packages with their delivery relevant information to be represented as HashMap entries
 # Will be the values in key_value pair to enter into Hash Map
@@ -71,6 +76,16 @@ class HashMapEntry:
         self.special_notes = special_notes
         self.delivery_status = delivery_status
 
+    @property
+    def deadline_minutes(self):
+        """
+        Get the delivery deadline in minutes since midnight, EOD is 5:00 PM.
+
+        Returns:
+            int: The delivery deadline in minutes since midnight.
+        """
+        return convert_12h_to_minutes(self.delivery_deadline)
+
     # Overwrite print(HashMapEntry) otherwise it will print object reference, 7/14/23 working for now
     def __repr__(self):
         """
@@ -151,6 +166,44 @@ class HashMap:
             bucket_list.append(key_value)
             return True
 
+    # Create the package object stored as the value for a row of the package file
+    def _create_package(self, package_id, address, city, state, zipcode, delivery_deadline, mass, special_notes,
+                        delivery_status):
+        """
+        Create a package to be inserted into the hash map.
+
+        Returns:
+            HashMapEntry: The new package.
+        """
+        return HashMapEntry(package_id, address, city, state, zipcode, delivery_deadline, mass, special_notes,
+                            delivery_status)
+
+    # Add a package received after the package file was loaded, e.g. during the day
+    def add_package(self, package_id, address, city, state, zipcode, delivery_deadline, mass, special_notes=''):
+        """
+        Adds a new package to the map.
+
+        Parameters:
+            package_id (int): The ID of the package, not in the map yet.
+            address (str): The delivery address.
+            city (str): The delivery city.
+            state (str): The delivery state.
+            zipcode (str): The delivery zipcode.
+            delivery_deadline (str): The delivery deadline, 'hh:mm AM/PM' or 'EOD'.
+            mass (str): The mass of the package.
+            special_notes (str): The special notes of the package.
+
+        Returns:
+            HashMapEntry: The new package, or None if the ID is already in the map.
+        """
+        if self.get_value_from_key(package_id) is not None:
+            print(f"Error adding package with key: {package_id}")
+            return None
+        package = self._create_package(package_id, address, city, state, zipcode, delivery_deadline, mass,
+                                       special_notes, 'AT_HUB')
+        self._insert_package(package_id, package)
+        return package
+
     # Get value in key-value pair data from packaged_id of Hash Map
     def get_value_from_key(self, key):
         """
@@ -214,6 +267,23 @@ class HashMap:
         """
         return self.map
 
+    def items(self):
+        """
+        Iterate over all key-value pairs stored in the map.
+
+        Yields:
+            tuple: (key, value) for every package stored in the map.
+        """
+        for bucket in self.map:
+            for key, value in bucket:
+                yield key, value
+
+    def __len__(self):
+        """
+        Returns the number of key-value pairs stored in the map.
+        """
+        return sum(len(bucket) for bucket in self.map)
+
     def get_packages(self):
         """
         Returns the hashmap associated with the object.
@@ -323,9 +393,9 @@ class HashMap:
                         # Key to direct hash
                         key = package_id
 
-                        # HashMapEntry object
-                        value = HashMapEntry(package_id, address, city, state, zipcode, delivery_deadline, mass,
-                                             special_notes, delivery_status)
+                        # HashMapEntry object, or a PackageRow for maps backed by a PackageTable
+                        value = self._create_package(package_id, address, city, state, zipcode, delivery_deadline,
+                                                     mass, special_notes, delivery_status)
                         self._insert_package(key, value)
                     except Exception as e:
                         print(f"Error occurred while processing package: {e}")
@@ -364,6 +434,425 @@ class HashMap:
         return True
 
 
-# Create a hash map and load it with data from WGUPS Package File Formatted.csv of all packages
-package_hashmap = HashMap()
-package_hashmap.load_hash_map('WGUPS Package File Formatted.csv')
+# Slot markers for ResizableHashMap; a deleted slot keeps its marker so probe chains through it are not broken
+_EMPTY = object()
+_DELETED = object()
+
+
+# Open-addressing HashMap that grows with the number of packages, the fixed 10 buckets of HashMap turn every lookup
+# into a walk over a long bucket list once the daily package files reach thousands of IDs
+class ResizableHashMap(HashMap):
+    """
+    Class to represent an open-addressing HashMap with load-factor-driven, incremental resizing.
+
+    Keys and values are stored in two flat slot lists instead of a [key, value] list per entry and collisions are
+    resolved with linear probing. Once the load factor passes max_load_factor a larger table is allocated and the
+    entries are moved over a few slots at a time on each following operation, so a single insert never has to copy
+    the whole table.
+
+    Attributes:
+        __keys (list): Key slots of the current table.
+        __values (list): Value slots of the current table.
+        __old_keys (list): Key slots of the table being migrated, None when no resize is in progress.
+        __old_values (list): Value slots of the table being migrated, None when no resize is in progress.
+        index (PackageIndex): Secondary indexes kept in step with every insert, update and delete, or None.
+        table (PackageTable): Columnar storage for packages loaded from a file, or None to store HashMapEntry objects.
+    """
+
+    def __init__(self, initial_size=8, max_load_factor=0.7, rehash_step=4, index=None, table=None):
+        """
+        Initialize a ResizableHashMap.
+
+        Parameters:
+            initial_size (int): The initial number of slots, rounded up to a power of two.
+            max_load_factor (float): The fraction of used slots that triggers a resize.
+            rehash_step (int): The number of old slots migrated on each operation while resizing.
+            index (PackageIndex): Secondary indexes to maintain, None to store values without indexing them.
+            table (PackageTable): Columnar storage for loaded packages, None to load them as HashMapEntry objects.
+        """
+        capacity = 8
+        while capacity < initial_size:
+            capacity *= 2
+        self.__keys = [_EMPTY] * capacity
+        self.__values = [None] * capacity
+        self.__size = 0  # Live entries across both tables
+        self.__filled = 0  # Live entries and deleted markers in the current table
+        self.__max_load_factor = max_load_factor
+        self.__rehash_step = rehash_step
+        self.__old_keys = None
+        self.__old_values = None
+        self.__rehash_index = 0
+        self.index = index
+        self.table = table
+
+    @property
+    def map(self):
+        """
+        Get a bucket-style view of the map, one [key, value] bucket per stored package.
+
+        Returns:
+            list: A list of buckets compatible with code written against HashMap.map.
+        """
+        return [[[key, value]] for key, value in self.items()]
+
+    @property
+    def capacity(self):
+        """
+        Get the number of slots in the current table.
+
+        Returns:
+            int: The number of slots.
+        """
+        return len(self.__keys)
+
+    @property
+    def is_rehashing(self):
+        """
+        Check if a resize is still migrating entries from the old table.
+
+        Returns:
+            bool: True while entries remain in the old table, False otherwise.
+        """
+        return self.__old_keys is not None
+
+    # The loading workarounds of a package file only apply to the packages loaded from it
+    def load_hash_map(self, file_name, overrides_file=None):
+        """
+        Loads the contents of a CSV file into the hash map.
+
+        Parameters:
+            file_name (str): The name of the CSV file to load.
+            overrides_file (str): The JSON file of loading workarounds made for this CSV file, e.g.
+                BUNDLED_OVERRIDES_FILE for the bundled one, None to load the packages by their notes alone.
+
+        Returns:
+            None: If an error occurs while loading the hash map.
+            self: The instance of the class after the CSV file is successfully loaded into the hash map.
+        """
+        if self.index is not None and self.index.constraints is not None:
+            self.index.constraints.set_overrides(*(load_overrides(overrides_file) if overrides_file else ({}, ())))
+        return super().load_hash_map(file_name)
+
+    # Hash function to generate the home slot of a key, table sizes are powers of two so a mask replaces modulo
+    def _get_hash(self, key):
+        """
+        Calculate the home slot for the given key in the current table.
+
+        Parameters:
+            key (int): The key for which the slot needs to be calculated.
+
+        Returns:
+            int: The calculated slot index.
+        """
+        return hash(key) & (len(self.__keys) - 1)
+
+    @staticmethod
+    def _probe(keys, key):
+        """
+        Find the slot holding the given key using linear probing.
+
+        Parameters:
+            keys (list): The key slots to search.
+            key (int): The key to search for.
+
+        Returns:
+            int: The slot index of the key, or -1 if the key is not stored in these slots.
+        """
+        mask = len(keys) - 1
+        index = hash(key) & mask
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return -1
+            if slot_key is not _DELETED and slot_key == key:
+                return index
+            index = (index + 1) & mask
+
+    def _locate(self, key):
+        """
+        Find the table and slot holding the given key, checking the table being migrated as well.
+
+        Parameters:
+            key (int): The key to search for.
+
+        Returns:
+            tuple: (keys, values, index) of the slot, index is -1 if the key is not found.
+        """
+        index = self._probe(self.__keys, key)
+        if index >= 0 or self.__old_keys is None:
+            return self.__keys, self.__values, index
+        return self.__old_keys, self.__old_values, self._probe(self.__old_keys, key)
+
+    def _place(self, key, value):
+        """
+        Place a key that is known to be absent into the current table, reusing a deleted slot if one is found first.
+
+        Parameters:
+            key (int): The key to place.
+            value (HashMapEntry): The value to place.
+
+        Returns:
+            None
+        """
+        keys = self.__keys
+        mask = len(keys) - 1
+        index = hash(key) & mask
+        while keys[index] is not _EMPTY and keys[index] is not _DELETED:
+            index = (index + 1) & mask
+        if keys[index] is _EMPTY:
+            self.__filled += 1
+        keys[index] = key
+        self.__values[index] = value
+
+    def _start_resize(self):
+        """
+        Allocate a larger table and start migrating entries into it.
+
+        Returns:
+            None
+        """
+        # Only one migration runs at a time, finish the previous one before starting the next
+        while self.__old_keys is not None:
+            self._rehash_some()
+        capacity = len(self.__keys)
+        # Keep the new table at most half of max_load_factor full once every live entry has moved over
+        while (self.__size + 1) > capacity * self.__max_load_factor / 2:
+            capacity *= 2
+        self.__old_keys, self.__old_values = self.__keys, self.__values
+        self.__keys = [_EMPTY] * capacity
+        self.__values = [None] * capacity
+        self.__filled = 0
+        self.__rehash_index = 0
+
+    def _rehash_some(self):
+        """
+        Move the next rehash_step slots of the old table into the current table.
+
+        Returns:
+            None
+        """
+        old_keys = self.__old_keys
+        if old_keys is None:
+            return
+        old_values = self.__old_values
+        stop = min(self.__rehash_index + self.__rehash_step, len(old_keys))
+        for index in range(self.__rehash_index, stop):
+            key = old_keys[index]
+            if key is not _EMPTY and key is not _DELETED:
+                self._place(key, old_values[index])
+                old_keys[index] = _DELETED
+                old_values[index] = None
+        self.__rehash_index = stop
+        if stop == len(old_keys):
+            self.__old_keys = None
+            self.__old_values = None
+
+    # Loaded packages become rows of the package table when the map has one
+    def _create_package(self, package_id, address, city, state, zipcode, delivery_deadline, mass, special_notes,
+                        delivery_status):
+        """
+        Create a package to be inserted into the hash map.
+
+        Returns:
+            PackageRow: A view of the new table row, or a HashMapEntry if the map has no table.
+        """
+        if self.table is None:
+            return super()._create_package(package_id, address, city, state, zipcode, delivery_deadline, mass,
+                                           special_notes, delivery_status)
+        row = self.table.append(package_id, address, city, state, zipcode, delivery_deadline, mass, special_notes,
+                                delivery_status)
+        return self.table.get_row(row)
+
+    # Insert new packages into the map, growing the table when the load factor is passed
+    def _insert_package(self, key, value):
+        """
+        Inserts a key-value pair into the hash table.
+
+        Parameters:
+            key (int): The key to be inserted into the hash table.
+            value (HashMapEntry): The corresponding value to be inserted.
+
+        Returns:
+            bool: True if the insertion was successful, False otherwise.
+        """
+        self._rehash_some()
+        if self.index is not None:
+            self.index.add(key, value)
+        keys, values, index = self._locate(key)
+        if index >= 0:
+            values[index] = value
+            return True
+        if self.__filled + 1 > len(self.__keys) * self.__max_load_factor:
+            self._start_resize()
+        self._place(key, value)
+        self.__size += 1
+        return True
+
+    # Get value in key-value pair data from packaged_id of the map
+    def get_value_from_key(self, key):
+        """
+        Given a key, this function retrieves the corresponding value from the hash map.
+
+        Parameters:
+            key (int): The key to search for in the hash map.
+
+        Returns:
+            HashMapEntry: The value associated with the given key, or None if the key is not found.
+        """
+        self._rehash_some()
+        keys, values, index = self._locate(key)
+        if index >= 0:
+            return values[index]
+        return None
+
+    def get_address_from_key(self, key):
+        """
+        Retrieves the address associated with a given key from the hash map.
+
+        Args:
+            key (int): The key to search for in the hash map.
+
+        Returns:
+            Union[str, None]: The address associated with the key, or None if the key is not found.
+        """
+        value = self.get_value_from_key(key)
+        if value is not None:
+            return value.address
+        return None
+
+    def get_key_from_address(self, address):
+        """
+        Returns the key associated with the given address in the map.
+
+        Parameters:
+            address (str): The address to search for in the map.
+
+        Returns:
+            int: The key associated with the given address, or None if the address is not found.
+        """
+        if self.index is not None:
+            for key in self.index.get_ids_by_address(address):
+                return key
+            return None
+        for key, value in self.items():
+            if value.address == address:
+                return key
+        return None
+
+    def get_hashmap(self):
+        """
+        Returns a bucket-style view of the hashmap associated with the object.
+        """
+        return self.map
+
+    def items(self):
+        """
+        Iterate over all key-value pairs stored in the map.
+
+        Yields:
+            tuple: (key, value) for every package stored in the map.
+        """
+        # Snapshot both tables first, a lookup while iterating migrates old entries into slots already passed
+        pairs = [(key, values[index])
+                 for keys, values in ((self.__keys, self.__values), (self.__old_keys, self.__old_values))
+                 if keys is not None
+                 for index, key in enumerate(keys) if key is not _EMPTY and key is not _DELETED]
+        yield from pairs
+
+    def __len__(self):
+        """
+        Returns the number of key-value pairs stored in the map.
+        """
+        return self.__size
+
+    def print_get_all_packages(self):
+        """
+        Prints all the packages stored in the map.
+        """
+        print("All Packages:")
+        print("-" * 40)
+        for package_id, package in self.items():
+            print(f"Package ID: {package_id}")
+            print(package)
+            print("-" * 20)
+        print("=" * 40)
+
+    # To update value in a key-value pair if changed
+    def update_key_value_pair(self, key, value):
+        """
+        Updates the value of a key in the map.
+
+        Parameters:
+            key (int): The key to update the value for.
+            value (HashMapEntry): The new value to update the key with.
+
+        Returns:
+            bool: True if the value was updated successfully, False otherwise.
+        """
+        self._rehash_some()
+        keys, values, index = self._locate(key)
+        if index >= 0:
+            values[index] = value
+            if self.index is not None:
+                self.index.update(key, value)
+            print(f"Updated value: {values[index]}")
+            return True
+        print(f"Error updating package with key: {key}")
+        return False
+
+    # Change fields of a stored package in place and re-index it, the package object stays the same so every
+    # reference to it, e.g. a truck's load or a TimeTracker key, sees the new values
+    def update_package(self, key, **fields):
+        """
+        Updates fields of a package in place.
+
+        Parameters:
+            key (int): The key of the package.
+            **fields: New values of address, city, state, zipcode, delivery_deadline, special_notes or
+            delivery_status.
+
+        Returns:
+            dict: The previous values of the changed fields, or None if the key is not found.
+        """
+        package = self.get_value_from_key(key)
+        if package is None:
+            print(f"Error updating package with key: {key}")
+            return None
+        previous = {field: getattr(package, field) for field in fields}
+        for field, value in fields.items():
+            setattr(package, field, value)
+        if self.index is not None:
+            self.index.update(key, package)
+        return previous
+
+    # Find a key-value pair to delete, the slot is marked deleted so later probes continue past it
+    def delete_key_value_pair(self, key):
+        """
+        Deletes a key-value pair from the map based on the given key.
+
+        Parameters:
+            key (int): The key of the key-value pair to be deleted.
+
+        Returns:
+            bool: True if the key-value pair was successfully deleted, False otherwise.
+        """
+        self._rehash_some()
+        keys, values, index = self._locate(key)
+        if index < 0:
+            print(f"Error deleting key-value pair with key: {key}")
+            return False
+        keys[index] = _DELETED
+        values[index] = None
+        self.__size -= 1
+        if self.index is not None:
+            self.index.remove(key)
+        return True
+
+
+# Loading workarounds of the bundled package file the nearest neighbor loads depend on, see load_overrides
+BUNDLED_OVERRIDES_FILE = 'WGUPS Package Overrides.json'
+
+# Create a hash map and load it with data from WGUPS Package File Formatted.csv of all packages, compiling the loading
+# constraints of their notes with the workarounds of the bundled file
+package_hashmap = ResizableHashMap(index=PackageIndex(PackageConstraints()), table=PackageTable())
+package_hashmap.load_hash_map('WGUPS Package File Formatted.csv', overrides_file=BUNDLED_OVERRIDES_FILE)
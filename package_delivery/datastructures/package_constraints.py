@@ -0,0 +1,508 @@
+import json
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from package_delivery.datastructures.package_index import NOTE_NONE, classify_special_notes
+from package_delivery.timeutil.time_util import convert_12h_to_minutes, convert_12h_to_seconds
+
+# Compiled loading constraints of the package store
+# The special notes of a package are parsed once when it is stored into typed constraints, and the trucks the package
+# may go on and the trucks that take it in their constrained loading pass are precomputed as bitsets with one bit per
+# truck ID. Loader checks are then a shift and a mask instead of string searches over the notes for every truck.
+
+# Typed constraints read from the special notes, times are seconds since midnight
+# The package can only go on one truck
+TruckOnly = namedtuple('TruckOnly', ['truck_id'])
+# The package must be delivered together with the listed packages
+DeliverTogether = namedtuple('DeliverTogether', ['package_ids'])
+# The package does not reach the hub before a time
+AvailableAfter = namedtuple('AvailableAfter', ['time'])
+# The address of the package is wrong until a time, None when the notes do not say when it is corrected
+WrongAddressUntil = namedtuple('WrongAddressUntil', ['time'])
+
+# Compiled constraints of one package: its typed constraints, the bitset of trucks it may go on, the bitset of trucks
+# that take it in their constrained pass, whether it is kept out of the nearest neighbor pass and its deliver-together
+# group, the package itself included
+CompiledConstraints = namedtuple('CompiledConstraints', ['constraints', 'allowed_trucks', 'assigned_trucks',
+                                                         'restricted', 'group'])
+
+# Bitset of every truck, for packages not bound to one
+ALL_TRUCKS = -1
+# Latest deadline taken by the early truck
+EARLY_DEADLINE = '9:00 AM'
+
+_TRUCK_ONLY = re.compile(r'Can only be on truck (\d+)')
+_DELIVER_TOGETHER = re.compile(r'Must be delivered with (\d+(?:\s*,\s*\d+)*)')
+_AVAILABLE_AFTER = re.compile(r'Delayed on flight.*until (\d{1,2}:\d{2} ?[AaPp][Mm])')
+_WRONG_ADDRESS = re.compile(r'Wrong address listed(?:.*until (\d{1,2}:\d{2} ?[AaPp][Mm]))?')
+
+
+# Notes write times as '9:05 am', the time helpers read '9:05 AM'
+def _parse_clock(clock):
+    """
+    Convert a clock time from the special notes to seconds since midnight.
+
+    Parameters:
+        clock (str): The time, e.g. '9:05 am' or '9:05am'.
+
+    Returns:
+        int: The time in seconds since midnight.
+    """
+    clock = clock.upper()
+    if ' ' not in clock:
+        clock = clock[:-2] + ' ' + clock[-2:]
+    return convert_12h_to_seconds(clock)
+
+
+def parse_special_notes(special_notes):
+    """
+    Parse the special notes of a package into typed constraints.
+
+    Parameters:
+        special_notes (str): The special notes, e.g. 'Can only be on truck 2'.
+
+    Returns:
+        tuple: The TruckOnly, DeliverTogether, AvailableAfter and WrongAddressUntil constraints of the notes, empty if
+        the notes do not constrain the package.
+    """
+    special_notes = special_notes or ''
+    constraints = []
+    match = _TRUCK_ONLY.search(special_notes)
+    if match is not None:
+        constraints.append(TruckOnly(int(match.group(1))))
+    match = _DELIVER_TOGETHER.search(special_notes)
+    if match is not None:
+        constraints.append(DeliverTogether(tuple(int(package_id) for package_id in match.group(1).split(','))))
+    match = _AVAILABLE_AFTER.search(special_notes)
+    if match is not None:
+        constraints.append(AvailableAfter(_parse_clock(match.group(1))))
+    match = _WRONG_ADDRESS.search(special_notes)
+    if match is not None:
+        constraints.append(WrongAddressUntil(_parse_clock(match.group(1)) if match.group(1) else None))
+    return tuple(constraints)
+
+
+# Fields of a package the truck rules read
+_PackageFacts = namedtuple('_PackageFacts', ['deadline_minutes', 'is_eod', 'note_kind', 'constraints'])
+
+
+# Truck rules, each tells whether a truck takes a package in its constrained loading pass
+def _has_early_deadline(facts, group):
+    """
+    The deadline is at or before EARLY_DEADLINE.
+    """
+    return facts.deadline_minutes <= convert_12h_to_minutes(EARLY_DEADLINE)
+
+
+def _is_grouped(facts, group):
+    """
+    The package must be delivered together with other packages.
+    """
+    return len(group) > 1
+
+
+def _is_eod_without_notes(facts, group):
+    """
+    The package is due by the end of the day and has no special notes.
+    """
+    return facts.is_eod and facts.note_kind == NOTE_NONE
+
+
+def _has_wrong_address(facts, group):
+    """
+    The address of the package is wrong.
+    """
+    return any(isinstance(constraint, WrongAddressUntil) for constraint in facts.constraints)
+
+
+def _is_delayed(facts, group):
+    """
+    The package reaches the hub late.
+    """
+    return any(isinstance(constraint, AvailableAfter) for constraint in facts.constraints)
+
+
+# Rules of the trucks leaving first, they take the early deadlines and the deliver-together groups
+EARLY_TRUCK_RULES = (_has_early_deadline, _is_grouped)
+# Rules of the trucks waiting for a driver, they take the packages that can wait or have to
+WAITING_TRUCK_RULES = (_is_eod_without_notes, _has_wrong_address, _is_delayed)
+
+
+def make_truck_rules(start_times):
+    """
+    Derive the rules of every truck's constrained loading pass from the times the trucks leave.
+
+    Parameters:
+        start_times (dict): Truck ID -> the time the truck leaves in seconds since midnight, None if it waits for a
+            driver.
+
+    Returns:
+        dict: Truck ID -> the rules of its constrained pass, a package matching any of them is taken. Trucks with no
+        rules only take their truck-only packages.
+    """
+    scheduled = [start_time for start_time in start_times.values() if start_time is not None]
+    first_start = min(scheduled, default=None)
+    truck_rules = {}
+    for truck_id, start_time in start_times.items():
+        if start_time is None:
+            truck_rules[truck_id] = WAITING_TRUCK_RULES
+        elif start_time == first_start:
+            truck_rules[truck_id] = EARLY_TRUCK_RULES
+    return truck_rules
+
+
+# Workarounds of a package file kept in a JSON file next to this module, for the bundled WGUPS file:
+#
+#   {"load": {"25": {"1": false}, ...}, "restrict": [13, ...]}
+#
+# "load" maps a package ID to {truck ID: whether the truck takes the package in its constrained pass}, applied after
+# the truck rules, and "restrict" lists package IDs kept out of the nearest neighbor pass although their notes do not
+# restrict them
+def load_overrides(file_name):
+    """
+    Load the loading workarounds of a package file.
+
+    Parameters:
+        file_name (str): The JSON file, relative to this module's directory or absolute.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a workarounds file.
+
+    Returns:
+        tuple: The load overrides, package ID -> {truck ID -> whether the truck takes the package}, and the frozenset
+        of restricted package IDs.
+    """
+    overrides_path = Path(__file__).parent / file_name
+    try:
+        with overrides_path.open('r') as overrides_file:
+            config = json.load(overrides_file)
+        load = {int(package_id): {int(truck_id): bool(assigned) for truck_id, assigned in trucks.items()}
+                for package_id, trucks in config.get('load', {}).items()}
+        restrict = frozenset(int(package_id) for package_id in config.get('restrict', ()))
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        raise ValueError(f"Cannot load the package overrides from {overrides_path}: {e!r}") from e
+    return load, restrict
+
+
+class PackageConstraints:
+    """
+    Class to compile and look up the loading constraints of the packages in the store.
+
+    Kept in step with the store through PackageIndex like the other indexes. A package's deliver-together group is
+    every package linked to it by a 'Must be delivered with' note in either direction, so storing or changing one
+    package recompiles the packages of its group. The truck rules come from the fleet being loaded, see
+    make_truck_rules, and the overrides from the package file, see load_overrides.
+
+    Attributes:
+        __truck_rules (dict): Truck ID -> the rules of its constrained pass.
+        __load_overrides (dict): Package ID -> {truck ID -> whether the truck takes it}, applied after the rules.
+        __restrict_overrides (frozenset): Package IDs always kept out of the nearest neighbor pass.
+        __facts (dict): Package ID -> the _PackageFacts of the package.
+        __links (dict): Package ID -> the package IDs its own notes name.
+        __linked_by (dict): Package ID -> {package ID whose notes name it: None}.
+        __compiled (dict): Package ID -> CompiledConstraints.
+    """
+
+    def __init__(self, truck_rules=None, load_overrides=None, restrict_overrides=()):
+        """
+        Initialize empty constraints.
+
+        Parameters:
+            truck_rules (dict): Truck ID -> the rules of its constrained pass, None for none.
+            load_overrides (dict): Package ID -> {truck ID -> whether the truck takes the package}, None for none.
+            restrict_overrides (iterable): Package IDs always kept out of the nearest neighbor pass.
+        """
+        self.__truck_rules = truck_rules or {}
+        self.__load_overrides = load_overrides or {}
+        self.__restrict_overrides = frozenset(restrict_overrides)
+        self.__facts = {}
+        self.__links = {}
+        self.__linked_by = {}
+        self.__compiled = {}
+
+    def __len__(self):
+        """
+        Returns the number of compiled packages.
+        """
+        return len(self.__compiled)
+
+    def __contains__(self, package_id):
+        """
+        Returns True if the package has compiled constraints.
+        """
+        return package_id in self.__compiled
+
+    def add(self, package_id, package):
+        """
+        Parse and compile the constraints of a package, replacing any compiled for the same package ID.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            package (HashMapEntry): The package to compile.
+
+        Returns:
+            None
+        """
+        old_group = self._get_group(package_id)
+        self._unlink(package_id)
+        constraints = parse_special_notes(package.special_notes)
+        deadline = package.delivery_deadline
+        self.__facts[package_id] = _PackageFacts(convert_12h_to_minutes(deadline), deadline == 'EOD',
+                                                 classify_special_notes(package.special_notes), constraints)
+        links = tuple(linked_id for constraint in constraints if isinstance(constraint, DeliverTogether)
+                      for linked_id in constraint.package_ids)
+        self.__links[package_id] = links
+        for linked_id in links:
+            self.__linked_by.setdefault(linked_id, {})[package_id] = None
+        self._recompile(old_group | self._get_group(package_id))
+
+    def remove(self, package_id):
+        """
+        Remove the constraints of a package.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            bool: True if the package was compiled, False otherwise.
+        """
+        if package_id not in self.__facts:
+            return False
+        old_group = self._get_group(package_id)
+        self._unlink(package_id)
+        del self.__facts[package_id]
+        del self.__compiled[package_id]
+        self._recompile(old_group - {package_id})
+        return True
+
+    # Recompile a package after its fields changed
+    def update(self, package_id, package):
+        """
+        Update the compiled constraints of a package.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            package (HashMapEntry): The package with its new values.
+
+        Returns:
+            None
+        """
+        self.add(package_id, package)
+
+    # Truck rules follow the fleet being loaded, the packages are only recompiled when they change
+    def set_truck_rules(self, truck_rules):
+        """
+        Replace the truck rules and recompile every package.
+
+        Parameters:
+            truck_rules (dict): Truck ID -> the rules of its constrained pass, see make_truck_rules.
+
+        Returns:
+            None
+        """
+        if truck_rules != self.__truck_rules:
+            self.__truck_rules = truck_rules
+            self._recompile(list(self.__facts))
+
+    def set_overrides(self, load_overrides, restrict_overrides):
+        """
+        Replace the overrides and recompile every package.
+
+        Parameters:
+            load_overrides (dict): Package ID -> {truck ID -> whether the truck takes the package}.
+            restrict_overrides (iterable): Package IDs always kept out of the nearest neighbor pass.
+
+        Returns:
+            None
+        """
+        self.__load_overrides = load_overrides
+        self.__restrict_overrides = frozenset(restrict_overrides)
+        self._recompile(list(self.__facts))
+
+    def get_compiled(self, package_id):
+        """
+        Get the compiled constraints of a package.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            CompiledConstraints: The constraints, or None if the package is not compiled.
+        """
+        return self.__compiled.get(package_id)
+
+    def get_constraints(self, package_id):
+        """
+        Get the typed constraints parsed from a package's notes.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            tuple: The constraints, empty if the package has none or is not compiled.
+        """
+        compiled = self.__compiled.get(package_id)
+        return compiled.constraints if compiled is not None else ()
+
+    def can_load(self, truck_id, package_id):
+        """
+        Check whether a package may go on a truck at all.
+
+        Parameters:
+            truck_id (int): The ID of the truck.
+            package_id (int): The ID of the package.
+
+        Returns:
+            bool: True if no truck-only constraint keeps the package off the truck.
+        """
+        compiled = self.__compiled.get(package_id)
+        return compiled is None or bool(compiled.allowed_trucks >> truck_id & 1)
+
+    def is_assigned(self, truck_id, package_id):
+        """
+        Check whether a truck takes a package in its constrained loading pass.
+
+        Parameters:
+            truck_id (int): The ID of the truck.
+            package_id (int): The ID of the package.
+
+        Returns:
+            bool: True if the truck takes the package, False otherwise.
+        """
+        compiled = self.__compiled.get(package_id)
+        return compiled is not None and bool(compiled.assigned_trucks >> truck_id & 1)
+
+    def is_restricted(self, package_id):
+        """
+        Check whether a package is kept out of the nearest neighbor pass.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            bool: True if the package has a truck-only, delayed or wrong address constraint, False otherwise.
+        """
+        compiled = self.__compiled.get(package_id)
+        return compiled is not None and compiled.restricted
+
+    def get_group(self, package_id):
+        """
+        Get the packages that must be delivered together with a package.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            frozenset: The package IDs of its group, the package itself included.
+        """
+        compiled = self.__compiled.get(package_id)
+        return compiled.group if compiled is not None else frozenset((package_id,))
+
+    def get_available_time(self, package_id):
+        """
+        Get the time a delayed package reaches the hub.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            int: The time in seconds since midnight, or None if the package is not delayed.
+        """
+        for constraint in self.get_constraints(package_id):
+            if isinstance(constraint, AvailableAfter):
+                return constraint.time
+        return None
+
+    def get_wrong_address(self, package_id):
+        """
+        Get the wrong address constraint of a package.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            WrongAddressUntil: The constraint, its time None if the correction time is unknown, or None if the
+            package's address is not wrong.
+        """
+        for constraint in self.get_constraints(package_id):
+            if isinstance(constraint, WrongAddressUntil):
+                return constraint
+        return None
+
+    def _unlink(self, package_id):
+        """
+        Remove the links of a package's own notes.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            None
+        """
+        for linked_id in self.__links.pop(package_id, ()):
+            linked_by = self.__linked_by[linked_id]
+            del linked_by[package_id]
+            if not linked_by:
+                del self.__linked_by[linked_id]
+
+    # Connected package IDs over the links in both directions
+    def _get_group(self, package_id):
+        """
+        Find the deliver-together group of a package from the current links.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            frozenset: The package IDs of the group, the package itself included.
+        """
+        group = {package_id}
+        stack = [package_id]
+        while stack:
+            current_id = stack.pop()
+            for linked_id in (*self.__links.get(current_id, ()), *self.__linked_by.get(current_id, ())):
+                if linked_id not in group:
+                    group.add(linked_id)
+                    stack.append(linked_id)
+        return frozenset(group)
+
+    def _recompile(self, package_ids):
+        """
+        Compile the bitsets of packages.
+
+        Parameters:
+            package_ids (iterable): The IDs of the packages, IDs not in the store are skipped.
+
+        Returns:
+            None
+        """
+        groups = {}
+        for package_id in package_ids:
+            facts = self.__facts.get(package_id)
+            if facts is None:
+                continue
+            group = groups.get(package_id)
+            if group is None:
+                group = self._get_group(package_id)
+                groups.update(dict.fromkeys(group, group))
+            allowed_trucks = ALL_TRUCKS
+            assigned_trucks = 0
+            for constraint in facts.constraints:
+                if isinstance(constraint, TruckOnly):
+                    allowed_trucks = 1 << constraint.truck_id
+                    assigned_trucks |= allowed_trucks
+            for truck_id, rules in self.__truck_rules.items():
+                if any(rule(facts, group) for rule in rules):
+                    assigned_trucks |= 1 << truck_id
+            assigned_trucks &= allowed_trucks
+            for truck_id, assigned in self.__load_overrides.get(package_id, {}).items():
+                if assigned:
+                    assigned_trucks |= 1 << truck_id
+                else:
+                    assigned_trucks &= ~(1 << truck_id)
+            restricted = package_id in self.__restrict_overrides or any(
+                isinstance(constraint, (TruckOnly, AvailableAfter, WrongAddressUntil))
+                for constraint in facts.constraints)
+            self.__compiled[package_id] = CompiledConstraints(facts.constraints, allowed_trucks, assigned_trucks,
+                                                              restricted, group)
@@ -0,0 +1,205 @@
+# Secondary indexes over the package store
+# Maps address, delivery_deadline, special note kind, delivery_status and zipcode to the package IDs holding them,
+# so loader filters become lookups instead of a scan over every package in the graph
+
+# Kinds of special notes found in the package file
+NOTE_NONE = 'NONE'
+NOTE_TRUCK_ONLY = 'TRUCK_ONLY'
+NOTE_DELIVER_WITH = 'DELIVER_WITH'
+NOTE_DELAYED = 'DELAYED'
+NOTE_WRONG_ADDRESS = 'WRONG_ADDRESS'
+NOTE_OTHER = 'OTHER'
+
+# Note prefix -> kind, checked in order
+_NOTE_PREFIXES = (
+    ('Can only be on truck', NOTE_TRUCK_ONLY),
+    ('Must be delivered with', NOTE_DELIVER_WITH),
+    ('Delayed on flight', NOTE_DELAYED),
+    ('Wrong address listed', NOTE_WRONG_ADDRESS),
+)
+
+
+def classify_special_notes(special_notes):
+    """
+    Classify the special notes of a package into a note kind.
+
+    Parameters:
+        special_notes (str): The special notes of the package.
+
+    Returns:
+        str: One of the NOTE_* kinds.
+    """
+    if special_notes == 'None' or not special_notes:
+        return NOTE_NONE
+    for prefix, kind in _NOTE_PREFIXES:
+        if special_notes.startswith(prefix):
+            return kind
+    return NOTE_OTHER
+
+
+class PackageIndex:
+    """
+    Class to represent the secondary indexes of the package store.
+
+    Every index maps a field value to the IDs of the packages with that value, kept as an insertion-ordered dict
+    used as a set, so adding and removing a package is O(1) per index.
+
+    Attributes:
+        FIELDS (tuple): The names of the indexed fields.
+        __indexes (dict): Field name -> {field value -> {package_id: None}}.
+        __entries (dict): Package ID -> tuple of indexed field values, used to remove a package's old values.
+        constraints (PackageConstraints): Compiled loading constraints kept in step with the indexes, or None.
+    """
+    FIELDS = ('address', 'delivery_deadline', 'note_kind', 'delivery_status', 'zipcode')
+
+    def __init__(self, constraints=None):
+        """
+        Initialize empty indexes for every field.
+
+        Parameters:
+            constraints (PackageConstraints): Compiled loading constraints to maintain, None to not compile them.
+        """
+        self.__indexes = {field: {} for field in self.FIELDS}
+        self.__entries = {}
+        self.constraints = constraints
+
+    def __len__(self):
+        """
+        Returns the number of indexed packages.
+        """
+        return len(self.__entries)
+
+    @staticmethod
+    def _get_field_values(package):
+        """
+        Get the indexed field values of a package, in the order of FIELDS.
+
+        Parameters:
+            package (HashMapEntry): The package to read.
+
+        Returns:
+            tuple: The indexed field values.
+        """
+        return (package.address, package.delivery_deadline, classify_special_notes(package.special_notes),
+                package.delivery_status, package.zipcode)
+
+    def add(self, package_id, package):
+        """
+        Add a package to every index, replacing any values indexed for the same package ID.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            package (HashMapEntry): The package to index.
+
+        Returns:
+            None
+        """
+        if package_id in self.__entries:
+            self.remove(package_id)
+        values = self._get_field_values(package)
+        for field, value in zip(self.FIELDS, values):
+            self.__indexes[field].setdefault(value, {})[package_id] = None
+        self.__entries[package_id] = values
+        if self.constraints is not None:
+            self.constraints.add(package_id, package)
+
+    def remove(self, package_id):
+        """
+        Remove a package from every index.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            bool: True if the package was indexed, False otherwise.
+        """
+        values = self.__entries.pop(package_id, None)
+        if values is None:
+            return False
+        if self.constraints is not None:
+            self.constraints.remove(package_id)
+        for field, value in zip(self.FIELDS, values):
+            index = self.__indexes[field]
+            package_ids = index[value]
+            del package_ids[package_id]
+            if not package_ids:
+                del index[value]
+        return True
+
+    # Re-index a package after its fields changed
+    def update(self, package_id, package):
+        """
+        Update the indexed values of a package.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            package (HashMapEntry): The package with its new values.
+
+        Returns:
+            None
+        """
+        self.add(package_id, package)
+
+    def lookup(self, field, value):
+        """
+        Get the IDs of all packages with the given value for a field.
+
+        Parameters:
+            field (str): One of FIELDS.
+            value (str): The value to look up.
+
+        Returns:
+            KeysView: The matching package IDs in insertion order, empty if none match.
+        """
+        return self.__indexes[field].get(value, {}).keys()
+
+    def get_values(self, field):
+        """
+        Get every distinct value indexed for a field.
+
+        Parameters:
+            field (str): One of FIELDS.
+
+        Returns:
+            KeysView: The distinct values.
+        """
+        return self.__indexes[field].keys()
+
+    def get_all_ids(self):
+        """
+        Get the IDs of every indexed package.
+
+        Returns:
+            KeysView: All package IDs in insertion order.
+        """
+        return self.__entries.keys()
+
+    def get_ids_by_address(self, address):
+        """
+        Get the IDs of all packages delivered to an address.
+        """
+        return self.lookup('address', address)
+
+    def get_ids_by_deadline(self, delivery_deadline):
+        """
+        Get the IDs of all packages with a delivery deadline, e.g. '10:30 AM' or 'EOD'.
+        """
+        return self.lookup('delivery_deadline', delivery_deadline)
+
+    def get_ids_by_note_kind(self, note_kind):
+        """
+        Get the IDs of all packages with a kind of special note, one of the NOTE_* kinds.
+        """
+        return self.lookup('note_kind', note_kind)
+
+    def get_ids_by_status(self, delivery_status):
+        """
+        Get the IDs of all packages with a delivery status, e.g. 'AT_HUB'.
+        """
+        return self.lookup('delivery_status', delivery_status)
+
+    def get_ids_by_zipcode(self, zipcode):
+        """
+        Get the IDs of all packages delivered to a zipcode.
+        """
+        return self.lookup('zipcode', zipcode)
@@ -0,0 +1,716 @@
+# Columnar package table
+# Packages are stored one column per field in typed arrays, text fields are interned once and stored as integer ids,
+# deadlines are parsed once to minutes since midnight and mass to a float when the package is added.
+# PackageRow is a two-slot view onto one row so code reading package.address keeps working.
+from array import array
+
+from package_delivery.timeutil.time_util import convert_12h_to_minutes
+
+# Delivery status codes stored in the status column
+STATUS_AT_HUB = 0
+STATUS_IN_TRANSIT = 1
+STATUS_DELIVERED = 2
+STATUS_CANCELLED = 3
+STATUS_NAMES = ('AT_HUB', 'IN_TRANSIT', 'DELIVERED', 'CANCELLED')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+class StringPool:
+    """
+    Class to represent a pool of interned strings, each distinct string is stored once and referenced by an int id.
+
+    Attributes:
+        __ids (dict): String -> id.
+        __strings (list): id -> string.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty pool.
+        """
+        self.__ids = {}
+        self.__strings = []
+
+    def __len__(self):
+        """
+        Returns the number of distinct strings in the pool.
+        """
+        return len(self.__strings)
+
+    def intern(self, string):
+        """
+        Get the id of a string, adding it to the pool if it is new.
+
+        Parameters:
+            string (str): The string to intern.
+
+        Returns:
+            int: The id of the string.
+        """
+        string_id = self.__ids.get(string)
+        if string_id is None:
+            string_id = len(self.__strings)
+            self.__ids[string] = string_id
+            self.__strings.append(string)
+        return string_id
+
+    def get_id(self, string):
+        """
+        Get the id of a string without adding it.
+
+        Parameters:
+            string (str): The string to look up.
+
+        Returns:
+            int: The id of the string, or None if it is not in the pool.
+        """
+        return self.__ids.get(string)
+
+    def get_string(self, string_id):
+        """
+        Get the string for an id.
+
+        Parameters:
+            string_id (int): The id of the string.
+
+        Returns:
+            str: The interned string.
+        """
+        return self.__strings[string_id]
+
+
+class PackageTable:
+    """
+    Class to represent all packages as typed columns.
+
+    Attributes:
+        addresses (StringPool): Interned addresses, the address column holds ids into this pool.
+        __text (StringPool): Interned city, state, zipcode, deadline and special notes strings.
+        __package_id (array): Package IDs.
+        __address (array): Address ids.
+        __city (array): City ids.
+        __state (array): State ids.
+        __zipcode (array): Zipcode ids.
+        __deadline (array): Delivery deadline string ids, kept so the original text can be shown.
+        __deadline_minutes (array): Delivery deadlines in minutes since midnight, EOD is 5:00 PM.
+        __mass (array): Package mass string ids, kept so the original text can be shown.
+        __mass_value (array): Package mass as a number, NaN if the mass is not a number.
+        __special_notes (array): Special notes ids.
+        __status (array): Delivery status codes, one of the STATUS_* constants.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty table.
+        """
+        self.addresses = StringPool()
+        self.__text = StringPool()
+        self.__package_id = array('i')
+        self.__address = array('i')
+        self.__city = array('i')
+        self.__state = array('i')
+        self.__zipcode = array('i')
+        self.__deadline = array('i')
+        self.__deadline_minutes = array('H')
+        self.__mass = array('i')
+        self.__mass_value = array('d')
+        self.__special_notes = array('i')
+        self.__status = array('B')
+
+    def __len__(self):
+        """
+        Returns the number of rows in the table.
+        """
+        return len(self.__package_id)
+
+    # Add a package as a new row, parsing and interning its fields once
+    def append(self, package_id, address, city, state, zipcode, delivery_deadline, mass, special_notes,
+               delivery_status):
+        """
+        Add a package to the table.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            address (str): The address of the package.
+            city (str): The city of the package.
+            state (str): The state of the package.
+            zipcode (str): The zipcode of the package.
+            delivery_deadline (str): The delivery deadline of the package, e.g. '10:30 AM' or 'EOD'.
+            mass (str): The mass of the package.
+            special_notes (str): Any special notes for the package.
+            delivery_status (str): The delivery status of the package, one of STATUS_NAMES.
+
+        Raises:
+            ValueError: If the deadline or delivery status cannot be parsed.
+
+        Returns:
+            int: The row of the new package.
+        """
+        # Parse everything before appending so a bad package leaves no partial row behind
+        deadline_minutes = convert_12h_to_minutes(delivery_deadline)
+        try:
+            mass_value = float(mass)
+        except ValueError:
+            mass_value = float('nan')
+        if delivery_status not in STATUS_CODES:
+            raise ValueError(f"Unknown delivery status: {delivery_status}")
+        status = STATUS_CODES[delivery_status]
+        self.__package_id.append(package_id)
+        self.__address.append(self.addresses.intern(address))
+        self.__city.append(self.__text.intern(city))
+        self.__state.append(self.__text.intern(state))
+        self.__zipcode.append(self.__text.intern(zipcode))
+        self.__deadline.append(self.__text.intern(delivery_deadline))
+        self.__deadline_minutes.append(deadline_minutes)
+        self.__mass.append(self.__text.intern(mass))
+        self.__mass_value.append(mass_value)
+        self.__special_notes.append(self.__text.intern(special_notes))
+        self.__status.append(status)
+        return len(self.__package_id) - 1
+
+    def get_row(self, row):
+        """
+        Get a view of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            PackageRow: A view reading and writing the row's columns.
+        """
+        return PackageRow(self, row)
+
+    def get_package_id(self, row):
+        """
+        Get the package ID of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            int: The package ID.
+        """
+        return self.__package_id[row]
+
+    def get_address_id(self, row):
+        """
+        Get the address id of a row, an id into the addresses pool.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            int: The address id.
+        """
+        return self.__address[row]
+
+    def get_address(self, row):
+        """
+        Get the address of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            str: The address.
+        """
+        return self.addresses.get_string(self.__address[row])
+
+    def set_address(self, row, address):
+        """
+        Set the address of a row.
+
+        Parameters:
+            row (int): The row.
+            address (str): The new address.
+
+        Returns:
+            None
+        """
+        self.__address[row] = self.addresses.intern(address)
+
+    def get_city(self, row):
+        """
+        Get the city of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            str: The city.
+        """
+        return self.__text.get_string(self.__city[row])
+
+    def set_city(self, row, city):
+        """
+        Set the city of a row.
+
+        Parameters:
+            row (int): The row.
+            city (str): The new city.
+
+        Returns:
+            None
+        """
+        self.__city[row] = self.__text.intern(city)
+
+    def get_state(self, row):
+        """
+        Get the state of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            str: The state.
+        """
+        return self.__text.get_string(self.__state[row])
+
+    def set_state(self, row, state):
+        """
+        Set the state of a row.
+
+        Parameters:
+            row (int): The row.
+            state (str): The new state.
+
+        Returns:
+            None
+        """
+        self.__state[row] = self.__text.intern(state)
+
+    def get_zipcode(self, row):
+        """
+        Get the zipcode of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            str: The zipcode.
+        """
+        return self.__text.get_string(self.__zipcode[row])
+
+    def set_zipcode(self, row, zipcode):
+        """
+        Set the zipcode of a row.
+
+        Parameters:
+            row (int): The row.
+            zipcode (str): The new zipcode.
+
+        Returns:
+            None
+        """
+        self.__zipcode[row] = self.__text.intern(zipcode)
+
+    def get_delivery_deadline(self, row):
+        """
+        Get the delivery deadline of a row as it was given.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            str: The deadline, e.g. '10:30 AM' or 'EOD'.
+        """
+        return self.__text.get_string(self.__deadline[row])
+
+    def get_deadline_minutes(self, row):
+        """
+        Get the delivery deadline of a row in minutes since midnight.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            int: The deadline, EOD is 5:00 PM.
+        """
+        return self.__deadline_minutes[row]
+
+    def set_delivery_deadline(self, row, delivery_deadline):
+        """
+        Set the delivery deadline of a row, parsing it to minutes since midnight.
+
+        Parameters:
+            row (int): The row.
+            delivery_deadline (str): The new deadline, e.g. '10:30 AM' or 'EOD'.
+
+        Returns:
+            None
+        """
+        self.__deadline_minutes[row] = convert_12h_to_minutes(delivery_deadline)
+        self.__deadline[row] = self.__text.intern(delivery_deadline)
+
+    def get_mass(self, row):
+        """
+        Get the mass of a row as it was given.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            str: The mass.
+        """
+        return self.__text.get_string(self.__mass[row])
+
+    def get_mass_value(self, row):
+        """
+        Get the mass of a row as a number.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            float: The mass, NaN if it is not a number.
+        """
+        return self.__mass_value[row]
+
+    def get_special_notes(self, row):
+        """
+        Get the special notes of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            str: The special notes.
+        """
+        return self.__text.get_string(self.__special_notes[row])
+
+    def set_special_notes(self, row, special_notes):
+        """
+        Set the special notes of a row.
+
+        Parameters:
+            row (int): The row.
+            special_notes (str): The new special notes.
+
+        Returns:
+            None
+        """
+        self.__special_notes[row] = self.__text.intern(special_notes)
+
+    def get_status_code(self, row):
+        """
+        Get the delivery status code of a row.
+
+        Parameters:
+            row (int): The row.
+
+        Returns:
+            int: One of the STATUS_* constants.
+        """
+        return self.__status[row]
+
+    def set_status_code(self, row, status_code):
+        """
+        Set the delivery status code of a row.
+
+        Parameters:
+            row (int): The row.
+            status_code (int): One of the STATUS_* constants.
+
+        Returns:
+            None
+        """
+        self.__status[row] = status_code
+
+    def get_column_bytes(self):
+        """
+        Get the number of bytes held by the typed columns, excluding the interned strings.
+
+        Returns:
+            int: The size of all columns in bytes.
+        """
+        columns = (self.__package_id, self.__address, self.__city, self.__state, self.__zipcode, self.__deadline,
+                   self.__deadline_minutes, self.__mass, self.__mass_value, self.__special_notes, self.__status)
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+class PackageRow:
+    """
+    Class to represent a lightweight view of one package in a PackageTable.
+
+    Offers the same attributes as HashMapEntry, plus the parsed deadline_minutes, mass_value, address_id and
+    status_code. Two views of the same row compare and hash equal, so views can be used as dictionary keys.
+
+    Attributes:
+        _table (PackageTable): The table holding the package.
+        _row (int): The row of the package.
+    """
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        """
+        Initialize a view of a row.
+
+        Parameters:
+            table (PackageTable): The table holding the package.
+            row (int): The row of the package.
+        """
+        self._table = table
+        self._row = row
+
+    @property
+    def row(self):
+        """
+        Get the row of the package in its table.
+
+        Returns:
+            int: The row.
+        """
+        return self._row
+
+    @property
+    def package_id(self):
+        """
+        Get the ID of the package.
+
+        Returns:
+            int: The package ID.
+        """
+        return self._table.get_package_id(self._row)
+
+    @property
+    def address(self):
+        """
+        Get the delivery address.
+
+        Returns:
+            str: The address.
+        """
+        return self._table.get_address(self._row)
+
+    @address.setter
+    def address(self, address):
+        """
+        Set the address.
+
+        Parameters:
+            address (str): The new address.
+
+        Returns:
+            None
+        """
+        self._table.set_address(self._row, address)
+
+    @property
+    def address_id(self):
+        """
+        Get the id of the delivery address in the table's addresses pool.
+
+        Returns:
+            int: The address id.
+        """
+        return self._table.get_address_id(self._row)
+
+    @property
+    def city(self):
+        """
+        Get the delivery city.
+
+        Returns:
+            str: The city.
+        """
+        return self._table.get_city(self._row)
+
+    @city.setter
+    def city(self, city):
+        """
+        Set the city.
+
+        Parameters:
+            city (str): The new city.
+
+        Returns:
+            None
+        """
+        self._table.set_city(self._row, city)
+
+    @property
+    def state(self):
+        """
+        Get the delivery state.
+
+        Returns:
+            str: The state.
+        """
+        return self._table.get_state(self._row)
+
+    @state.setter
+    def state(self, state):
+        """
+        Set the state.
+
+        Parameters:
+            state (str): The new state.
+
+        Returns:
+            None
+        """
+        self._table.set_state(self._row, state)
+
+    @property
+    def zipcode(self):
+        """
+        Get the delivery zipcode.
+
+        Returns:
+            str: The zipcode.
+        """
+        return self._table.get_zipcode(self._row)
+
+    @zipcode.setter
+    def zipcode(self, zipcode):
+        """
+        Set the zipcode.
+
+        Parameters:
+            zipcode (str): The new zipcode.
+
+        Returns:
+            None
+        """
+        self._table.set_zipcode(self._row, zipcode)
+
+    @property
+    def delivery_deadline(self):
+        """
+        Get the delivery deadline as it was given.
+
+        Returns:
+            str: The deadline, e.g. '10:30 AM' or 'EOD'.
+        """
+        return self._table.get_delivery_deadline(self._row)
+
+    @delivery_deadline.setter
+    def delivery_deadline(self, delivery_deadline):
+        """
+        Set the delivery deadline.
+
+        Parameters:
+            delivery_deadline (str): The new deadline, e.g. '10:30 AM' or 'EOD'.
+
+        Returns:
+            None
+        """
+        self._table.set_delivery_deadline(self._row, delivery_deadline)
+
+    @property
+    def deadline_minutes(self):
+        """
+        Get the delivery deadline in minutes since midnight.
+
+        Returns:
+            int: The deadline, EOD is 5:00 PM.
+        """
+        return self._table.get_deadline_minutes(self._row)
+
+    # Kept as the string it was added with like HashMapEntry.mass, mass_value is the parsed number
+    @property
+    def mass(self):
+        """
+        Get the mass as it was given.
+
+        Returns:
+            str: The mass.
+        """
+        return self._table.get_mass(self._row)
+
+    @property
+    def mass_value(self):
+        """
+        Get the mass as a number.
+
+        Returns:
+            float: The mass, NaN if it is not a number.
+        """
+        return self._table.get_mass_value(self._row)
+
+    @property
+    def special_notes(self):
+        """
+        Get the special notes.
+
+        Returns:
+            str: The special notes.
+        """
+        return self._table.get_special_notes(self._row)
+
+    @special_notes.setter
+    def special_notes(self, special_notes):
+        """
+        Set the special notes.
+
+        Parameters:
+            special_notes (str): The new special notes.
+
+        Returns:
+            None
+        """
+        self._table.set_special_notes(self._row, special_notes)
+
+    @property
+    def delivery_status(self):
+        """
+        Get the delivery status.
+
+        Returns:
+            str: One of STATUS_NAMES.
+        """
+        return STATUS_NAMES[self._table.get_status_code(self._row)]
+
+    @delivery_status.setter
+    def delivery_status(self, delivery_status):
+        """
+        Set the delivery status.
+
+        Parameters:
+            delivery_status (str): One of STATUS_NAMES.
+
+        Returns:
+            None
+        """
+        self._table.set_status_code(self._row, STATUS_CODES[delivery_status])
+
+    @property
+    def status_code(self):
+        """
+        Get the delivery status code.
+
+        Returns:
+            int: One of the STATUS_* constants.
+        """
+        return self._table.get_status_code(self._row)
+
+    def __eq__(self, other):
+        """
+        Check if two views are of the same row of the same table.
+
+        Parameters:
+            other (PackageRow): The other view.
+
+        Returns:
+            bool: True if both views are of the same row, False otherwise.
+        """
+        if not isinstance(other, PackageRow):
+            return NotImplemented
+        return self._table is other._table and self._row == other._row
+
+    def __hash__(self):
+        """
+        Returns a hash of the table and row, equal for views of the same row.
+        """
+        return hash((id(self._table), self._row))
+
+    # Same text as HashMapEntry so printed packages look the same
+    def __repr__(self):
+        """
+        Returns a string representation of the object.
+
+        Returns:
+            str: A string representation of the object.
+        """
+        return (f'<{self.package_id} {self.address} {self.city} {self.state} {self.zipcode} {self.delivery_deadline} '
+                f'{self.mass} {self.special_notes} {self.delivery_status}>')
@@ -0,0 +1,126 @@
+# All-pairs shortest paths over the distance matrix of a Graph
+# The table is computed once with a vectorized Floyd-Warshall and then answers every distance in O(1) and every path
+# in O(path length) through a next-hop matrix
+import numpy as np
+
+
+def floyd_warshall(distance_matrix):
+    """
+    Computes all-pairs shortest distances and the next-hop matrix with Floyd-Warshall, one vectorized pass per vertex.
+
+    Parameters:
+        distance_matrix (numpy.ndarray): V x V edge weights, NaN or inf where there is no edge.
+
+    Returns:
+        tuple: (distances, next_hop) where distances[i, j] is the shortest distance from i to j (inf if unreachable)
+        and next_hop[i, j] is the vertex after i on that path (-1 if unreachable).
+    """
+    vertex_count = distance_matrix.shape[0]
+    distances = np.where(np.isnan(distance_matrix), np.inf, distance_matrix)
+    next_hop = np.where(np.isfinite(distances), np.arange(vertex_count)[None, :], -1)
+    np.fill_diagonal(next_hop, np.arange(vertex_count))
+    through_k = np.empty_like(distances)
+    shorter = np.empty(distances.shape, dtype=bool)
+    for k in range(vertex_count):
+        # Distance of every i -> k -> j path at once
+        np.add(distances[:, k, None], distances[None, k, :], out=through_k)
+        np.less(through_k, distances, out=shorter)
+        np.copyto(distances, through_k, where=shorter)
+        # Paths that now go through k start the same way as the path to k
+        np.copyto(next_hop, np.broadcast_to(next_hop[:, k, None], next_hop.shape), where=shorter)
+    return distances, next_hop
+
+
+class ShortestPaths:
+    """
+    Class to represent the all-pairs shortest path table of a set of graph vertices.
+
+    Attributes:
+        vertex_ids (numpy.ndarray): Graph vertex id of each row/column of the table.
+        distances (numpy.ndarray): Shortest distance between every pair of vertices in the set.
+        next_hop (numpy.ndarray): Row/column of the vertex after i on the shortest path from i to j, -1 if unreachable.
+        __positions (dict): Vertex -> row/column of the table.
+        __vertex_names (list): Row/column of the table -> vertex.
+    """
+
+    def __init__(self, vertex_names, vertex_ids, distances, next_hop):
+        """
+        Initialize the table.
+
+        Parameters:
+            vertex_names (list): The vertex of each row/column.
+            vertex_ids (numpy.ndarray): The graph vertex id of each row/column.
+            distances (numpy.ndarray): The shortest distances.
+            next_hop (numpy.ndarray): The next-hop matrix.
+        """
+        self.vertex_ids = vertex_ids
+        self.distances = distances
+        self.next_hop = next_hop
+        self.__vertex_names = vertex_names
+        self.__positions = {vertex: position for position, vertex in enumerate(vertex_names)}
+
+    def __contains__(self, vertex):
+        return vertex in self.__positions
+
+    def get_position(self, vertex):
+        """
+        Get the row/column of a vertex in the table.
+
+        Parameters:
+            vertex (str): The vertex.
+
+        Raises:
+            KeyError: If the vertex is not in the table.
+
+        Returns:
+            int: The row/column of the vertex.
+        """
+        return self.__positions[vertex]
+
+    def get_distance(self, vertex1, vertex2):
+        """
+        Get the shortest distance between two vertices.
+
+        Parameters:
+            vertex1 (str): The source vertex.
+            vertex2 (str): The destination vertex.
+
+        Returns:
+            float: The shortest distance, inf if vertex2 cannot be reached.
+        """
+        return self.distances.item(self.__positions[vertex1], self.__positions[vertex2])
+
+    def get_path(self, vertex1, vertex2):
+        """
+        Get the vertices on the shortest path between two vertices.
+
+        Parameters:
+            vertex1 (str): The source vertex.
+            vertex2 (str): The destination vertex.
+
+        Returns:
+            list: The vertices from vertex1 to vertex2, both included, or an empty list if vertex2 cannot be reached.
+        """
+        current = self.__positions[vertex1]
+        target = self.__positions[vertex2]
+        if self.next_hop[current, target] < 0:
+            return []
+        path = [self.__vertex_names[current]]
+        while current != target:
+            current = int(self.next_hop[current, target])
+            path.append(self.__vertex_names[current])
+        return path
+
+    def get_predecessor(self, vertex1, vertex2):
+        """
+        Get the vertex before vertex2 on the shortest path from vertex1.
+
+        Parameters:
+            vertex1 (str): The source vertex.
+            vertex2 (str): The destination vertex.
+
+        Returns:
+            str: The predecessor vertex, or None if the vertices are the same or vertex2 cannot be reached.
+        """
+        path = self.get_path(vertex1, vertex2)
+        return path[-2] if len(path) > 1 else None
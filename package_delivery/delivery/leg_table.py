@@ -0,0 +1,149 @@
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate
+
+# Cumulative leg table of one truck's day
+# The departure and the arrival at every stop are kept in time order with the miles driven by each of them, the prefix
+# sums of the leg miles. Where a truck is and how far it has driven at any time is a bisect over the times, with the
+# leg being driven interpolated linearly, instead of re-running the delivery. Times are seconds since midnight.
+
+# Where a truck is at a time: the vertex it last left or reached, the vertex it is driving to (None when it is not
+# moving), the fraction of that leg driven and the miles driven so far
+TruckPosition = namedtuple('TruckPosition', ['time', 'vertex', 'next_vertex', 'fraction', 'miles'])
+
+
+class LegTable:
+    """
+    Class to answer position and mileage queries over a truck's legs.
+
+    Attributes:
+        __vertices (list): The start vertex, then the vertex of every stop in order.
+        __times (list): The departure time, then the arrival time at every stop.
+        __miles (list): The miles driven by each time in __times.
+    """
+
+    def __init__(self, start_vertex, departure_time, stops, legs):
+        """
+        Build the table of a truck's legs.
+
+        Parameters:
+            start_vertex (str): Where the truck starts.
+            departure_time (int): The time the truck leaves, None if it never does.
+            stops (iterable): (vertex, arrival time) of every stop in order.
+            legs (iterable): The miles of the leg to each stop.
+        """
+        stops = list(stops) if departure_time is not None else []
+        self.__vertices = [start_vertex] + [vertex for vertex, _ in stops]
+        self.__times = [departure_time] + [time for _, time in stops] if departure_time is not None else []
+        self.__miles = list(accumulate(legs, initial=0)) if departure_time is not None else [0]
+
+    def __len__(self):
+        """
+        Returns the number of legs.
+        """
+        return len(self.__vertices) - 1
+
+    @property
+    def get_total_miles(self):
+        """
+        Get the miles of every leg.
+
+        Returns:
+            float: The miles driven over the day.
+        """
+        return self.__miles[-1]
+
+    def get_position(self, time):
+        """
+        Get where the truck is at a time.
+
+        Parameters:
+            time (int): The time in seconds since midnight.
+
+        Returns:
+            TruckPosition: The position, the truck is at its start before it leaves and at its last stop after.
+        """
+        index = bisect_right(self.__times, time) - 1
+        if index < 0:
+            return TruckPosition(time, self.__vertices[0], None, 0.0, 0)
+        if index == len(self.__times) - 1:
+            return TruckPosition(time, self.__vertices[index], None, 0.0, self.__miles[index])
+        duration = self.__times[index + 1] - self.__times[index]
+        fraction = (time - self.__times[index]) / duration if duration else 1.0
+        miles = self.__miles[index] + (self.__miles[index + 1] - self.__miles[index]) * fraction
+        return TruckPosition(time, self.__vertices[index], self.__vertices[index + 1], fraction, miles)
+
+    def get_miles(self, time):
+        """
+        Get the miles the truck has driven by a time.
+
+        Parameters:
+            time (int): The time in seconds since midnight.
+
+        Returns:
+            float: The miles driven, part of the leg being driven included.
+        """
+        return self.get_position(time).miles
+
+    def get_fuel_used(self, time, miles_per_gallon):
+        """
+        Get the fuel the truck has used by a time.
+
+        Parameters:
+            time (int): The time in seconds since midnight.
+            miles_per_gallon (float): The fuel consumption of the truck.
+
+        Returns:
+            float: The gallons used.
+        """
+        return self.get_miles(time) / miles_per_gallon
+
+    # Point on the straight line between the coordinates of the two vertices of the leg being driven
+    def get_coordinates(self, time, coordinates):
+        """
+        Get the interpolated map coordinates of the truck at a time.
+
+        Parameters:
+            time (int): The time in seconds since midnight.
+            coordinates (dict): Vertex -> (x, y), e.g. Visualize.get_all_coordinates.
+
+        Returns:
+            tuple: (x, y), or None if a vertex of the leg has no coordinates.
+        """
+        position = self.get_position(time)
+        start = coordinates.get(position.vertex)
+        if position.next_vertex is None:
+            return start
+        end = coordinates.get(position.next_vertex)
+        if start is None or end is None:
+            return None
+        return (start[0] + (end[0] - start[0]) * position.fraction,
+                start[1] + (end[1] - start[1]) * position.fraction)
+
+
+def make_timeline_leg_table(truck_timeline):
+    """
+    Build the leg table of a simulated truck.
+
+    Parameters:
+        truck_timeline (TruckTimeline): The truck's timeline from DeliverySimulator.run.
+
+    Returns:
+        LegTable: The table.
+    """
+    return LegTable(truck_timeline.start_vertex, truck_timeline.departure_time, truck_timeline.stops,
+                    truck_timeline.legs)
+
+
+def make_walk_leg_table(route_walk):
+    """
+    Build the leg table of a delivery walk.
+
+    Parameters:
+        route_walk (RouteWalk): The walk of deliver_packages, see Trucks.route_walk.
+
+    Returns:
+        LegTable: The table.
+    """
+    return LegTable(route_walk.start_vertex, route_walk.start_time,
+                    zip(route_walk.stops, route_walk.arrival_times.tolist()), route_walk.leg_distances.tolist())
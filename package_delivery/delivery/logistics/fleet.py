@@ -0,0 +1,79 @@
+import json
+from collections import namedtuple
+from pathlib import Path
+
+from package_delivery.timeutil.time_util import convert_12h_to_seconds
+
+# Fleet definition loaded from a JSON file next to this module, fleet.json for the bundled day:
+#
+#   {"driver_count": 2,
+#    "trucks": [{"truck_id": 1, "truck_name": "HIGH_PRIORITY", "capacity": 16, "start_time": "8:10 AM",
+#                "speed_mph": 18}, ...]}
+#
+# A truck with a null start_time waits for a driver to be handed over. An entry with "count": n stands for n trucks
+# with consecutive IDs from its truck_id, named truck_name_1 to truck_name_n, so large fleets stay one line each.
+
+# One truck of the fleet, start time in seconds since midnight (None to wait for a driver), speed in miles per minute
+TruckSpec = namedtuple('TruckSpec', ['truck_id', 'truck_name', 'capacity', 'start_time', 'speed'])
+# The fleet: the number of drivers and the TruckSpec of every truck in ID order
+Fleet = namedtuple('Fleet', ['driver_count', 'trucks'])
+
+# Fleet file of the bundled day
+FLEET_FILE = 'fleet.json'
+
+
+def _parse_truck_specs(entry):
+    """
+    Get the trucks of one entry of the fleet file.
+
+    Parameters:
+        entry (dict): The entry, see the module comment.
+
+    Raises:
+        ValueError: If the capacity, speed or count is not positive.
+
+    Returns:
+        list: The TruckSpec of every truck of the entry.
+    """
+    capacity = int(entry['capacity'])
+    # Miles per hour -> miles per minute, 18 mph is 0.3
+    speed = float(entry['speed_mph']) / 60
+    count = int(entry.get('count', 1))
+    if capacity <= 0 or speed <= 0 or count <= 0:
+        raise ValueError(f"Capacity, speed and count of truck {entry['truck_id']} must be positive")
+    start_time = entry.get('start_time')
+    start_time = convert_12h_to_seconds(start_time) if start_time else None
+    if 'count' not in entry:
+        return [TruckSpec(int(entry['truck_id']), entry['truck_name'], capacity, start_time, speed)]
+    return [TruckSpec(int(entry['truck_id']) + number, f"{entry['truck_name']}_{number + 1}", capacity, start_time,
+                      speed) for number in range(count)]
+
+
+def load_fleet(file_name=FLEET_FILE):
+    """
+    Load a fleet definition.
+
+    Parameters:
+        file_name (str): The JSON file, relative to this module's directory or absolute.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a fleet definition, there are no drivers or two trucks share
+            an ID.
+
+    Returns:
+        Fleet: The fleet.
+    """
+    fleet_path = Path(__file__).parent / file_name
+    try:
+        with fleet_path.open('r') as fleet_file:
+            config = json.load(fleet_file)
+        trucks = [spec for entry in config['trucks'] for spec in _parse_truck_specs(entry)]
+        driver_count = int(config['driver_count'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Cannot load the fleet from {fleet_path}: {e!r}") from e
+    truck_ids = [spec.truck_id for spec in trucks]
+    if len(set(truck_ids)) != len(truck_ids):
+        raise ValueError("Every truck of the fleet needs its own truck_id")
+    if driver_count <= 0:
+        raise ValueError("The fleet needs at least one driver")
+    return Fleet(driver_count, tuple(sorted(trucks, key=lambda spec: spec.truck_id)))
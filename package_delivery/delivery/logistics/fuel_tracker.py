@@ -107,6 +107,16 @@ class FuelTracker:
                     'diesel': utah_data['diesel']
                 })
 
+    @property
+    def get_miles_per_gallon(self):
+        """
+        Get the fuel consumption of the trucks.
+
+        Returns:
+            float: Miles per gallon.
+        """
+        return self.__MPG
+
     def _calculate_fuel_used(self, truck_id, miles_traveled):
         fuel_used = miles_traveled / self.__MPG
         self.total_fuel_used[truck_id] += fuel_used
@@ -122,7 +132,7 @@ class FuelTracker:
         self.track_fuel_current_level[truck_id] -= fuel_used
         if self.track_fuel_current_level[truck_id] < 0:
             print("Fuel level is empty!")
-            self.track_fuel_current_level = 0
+            self.track_fuel_current_level[truck_id] = 0
         self.__TRAVEL_COST[truck_id] = self._calculate_travel_cost(truck_id)
 
     def print_fuel_level(self, truck_id):
@@ -0,0 +1,205 @@
+from collections import namedtuple
+
+from package_delivery.datastructures.hash_map import HashMapEntry
+
+# A change to a package received during the day: the package, the time the change is known in seconds since midnight
+# and the new values, None for the fields that do not change. cancelled=True cancels the package
+PackageChange = namedtuple('PackageChange', ['package_id', 'time', 'address', 'city', 'state', 'zipcode',
+                                             'delivery_deadline', 'special_notes', 'cancelled'],
+                           defaults=(None, None, None, None, None, None, False))
+
+# Fields of a package a change can set
+CHANGE_FIELDS = ('address', 'city', 'state', 'zipcode', 'delivery_deadline', 'special_notes')
+# Delivery status of a cancelled package in the package store
+CANCELLED = 'CANCELLED'
+
+
+# New values of a change, field -> value, cancelling sets the delivery status
+def get_changed_fields(change):
+    """
+    Get the fields a change sets.
+
+    Parameters:
+        change (PackageChange): The change.
+
+    Returns:
+        dict: Field -> new value.
+    """
+    fields = {field: getattr(change, field) for field in CHANGE_FIELDS if getattr(change, field) is not None}
+    if change.cancelled:
+        fields['delivery_status'] = CANCELLED
+    return fields
+
+
+class PackageChangeLog:
+    """
+    Class to keep the changes to packages received during the day and apply them to the package store.
+
+    The store is updated in place, see ResizableHashMap.update_package, and holds the packages as of one time, every
+    change known by then applied. The values each applied change replaced are kept, so the store can be moved to any
+    other time and a package can be read as of any time without changing the store. A change that comes after the
+    package was delivered is never applied, see set_delivery_times.
+
+    Attributes:
+        __store (ResizableHashMap): The package store the changes are applied to.
+        __changes (list): The changes, in time order.
+        __previous (dict): Position in __changes -> the values an applied change replaced.
+        __time (int): The time the store is at, in seconds since midnight.
+        __delivery_times (dict): Package ID -> the time the package was delivered, in seconds since midnight.
+    """
+
+    def __init__(self, store, time=0):
+        """
+        Initialize an empty log
+
+        Parameters:
+            store (ResizableHashMap): The package store the changes are applied to.
+            time (int): The time the store is at, in seconds since midnight.
+        """
+        self.__store = store
+        self.__changes = []
+        self.__previous = {}
+        self.__time = time
+        self.__delivery_times = {}
+
+    def __len__(self):
+        """
+        Returns the number of changes.
+        """
+        return len(self.__changes)
+
+    @property
+    def get_changes(self):
+        """
+        Get the changes in time order.
+
+        Returns:
+            tuple: The PackageChange of every change.
+        """
+        return tuple(self.__changes)
+
+    @property
+    def get_time(self):
+        """
+        Get the time the store is at.
+
+        Returns:
+            int: Seconds since midnight.
+        """
+        return self.__time
+
+    def add(self, change):
+        """
+        Add a change, applying it to the store if the store is already past the change.
+
+        Parameters:
+            change (PackageChange): The change.
+
+        Returns:
+            None
+        """
+        time = self.__time
+        # Changes after the new one are undone first so every change is applied on top of the ones before it
+        self.set_time(min(time, change.time - 1))
+        position = len(self.__changes)
+        while position and self.__changes[position - 1].time > change.time:
+            position -= 1
+        self.__changes.insert(position, change)
+        self.set_time(time)
+
+    def set_delivery_times(self, delivery_times):
+        """
+        Set when the packages were delivered, the changes that come after a package's delivery are undone.
+
+        Parameters:
+            delivery_times (dict): Package ID -> the delivery time in seconds since midnight, e.g. from a simulated
+                day. Packages left out were not delivered.
+
+        Returns:
+            None
+        """
+        time = self.__time
+        self.set_time(-1)
+        self.__delivery_times = dict(delivery_times)
+        self.set_time(time)
+
+    # A change applies once it is known, unless its package was delivered before it
+    def _applies(self, change, time):
+        """
+        Check if a change is applied at a time.
+
+        Parameters:
+            change (PackageChange): The change.
+            time (int): The time in seconds since midnight.
+
+        Returns:
+            bool: True if the change is known by the time and not after the package's delivery.
+        """
+        delivery_time = self.__delivery_times.get(change.package_id)
+        return change.time <= time and (delivery_time is None or change.time <= delivery_time)
+
+    def set_time(self, time):
+        """
+        Move the store to a time, applying the changes known by then and undoing the later ones.
+
+        Parameters:
+            time (int): The time in seconds since midnight.
+
+        Returns:
+            None
+        """
+        # Undo the newest changes first, then apply the oldest first
+        for position in range(len(self.__changes) - 1, -1, -1):
+            if not self._applies(self.__changes[position], time) and position in self.__previous:
+                self.__store.update_package(self.__changes[position].package_id, **self.__previous.pop(position))
+        for position, change in enumerate(self.__changes):
+            if self._applies(change, time) and position not in self.__previous:
+                self.__previous[position] = self.__store.update_package(change.package_id,
+                                                                        **get_changed_fields(change))
+        self.__time = time
+
+    def get_package_at(self, package, time):
+        """
+        Get a package as of a time, without moving the store.
+
+        Parameters:
+            package (HashMapEntry): The package in the store.
+            time (int): The time in seconds since midnight.
+
+        Returns:
+            HashMapEntry: The package itself if no change separates the time from the store, otherwise a copy with
+            the values as of the time.
+        """
+        values = None
+        for position in range(len(self.__changes) - 1, -1, -1):
+            change = self.__changes[position]
+            if change.package_id == package.package_id and not self._applies(change, time) \
+                    and position in self.__previous:
+                values = values or _get_values(package)
+                values.update(self.__previous[position])
+        for position, change in enumerate(self.__changes):
+            if change.package_id == package.package_id and self._applies(change, time) \
+                    and position not in self.__previous:
+                values = values or _get_values(package)
+                values.update(get_changed_fields(change))
+        if values is None:
+            return package
+        return HashMapEntry(package.package_id, values['address'], values['city'], values['state'],
+                            values['zipcode'], values['delivery_deadline'], package.mass, values['special_notes'],
+                            values['delivery_status'])
+
+
+# Current values of the fields a change can set
+def _get_values(package):
+    """
+    Get the values of a package's changeable fields.
+
+    Parameters:
+        package (HashMapEntry): The package.
+
+    Returns:
+        dict: Field -> value, including delivery_status.
+    """
+    values = {field: getattr(package, field) for field in CHANGE_FIELDS}
+    values['delivery_status'] = package.delivery_status
+    return values
@@ -0,0 +1,101 @@
+from collections import namedtuple
+
+# Result of optimizing and driving a truck's route once: the optimized route and package order, the distances and
+# predecessor vertices of each leg, the truck time when the last package is delivered, the total distance, the
+# time_delivered of every package in the truck's TimeTracker and the RouteWalk of the delivery
+RoutePlan = namedtuple('RoutePlan', ['route', 'packages', 'distances', 'pred_vertex', 'end_time', 'total_distance',
+                                     'time_delivered', 'walk'])
+
+
+class RoutePlanCache:
+    """
+    Class to cache the route plans of a truck. Composite of Trucks class
+
+    A plan is keyed on the truck's stop set, every (package_id, address) loaded on the truck, its start time and the
+    route solver used, so a repeated deliver_packages call for the same load only re-reads the plan. Re-addressing a
+    package changes its key, and invalidate/invalidate_package drop plans explicitly when packages are added, removed
+    or re-addressed.
+
+    Attributes:
+        MAX_PLANS (int): The number of plans kept, the oldest plan is dropped first.
+        __plans (dict): Key -> RoutePlan, in insertion order.
+    """
+    MAX_PLANS = 16
+
+    def __init__(self):
+        """
+        Initialize an empty cache
+        """
+        self.__plans = {}
+
+    def __len__(self):
+        """
+        Returns the number of cached plans.
+        """
+        return len(self.__plans)
+
+    @staticmethod
+    def get_key(truck, route_solver):
+        """
+        Get the cache key of a truck's current load.
+
+        Parameters:
+            truck (Truck): The truck about to be routed.
+            route_solver (str): The route solver that will be used.
+
+        Returns:
+            tuple: (stop set, start time, route solver)
+        """
+        stops = frozenset((package.package_id, package.address) for package in truck.get_packages())
+        return stops, truck.time_tracker.get_current_truck_time(), route_solver
+
+    def get(self, key):
+        """
+        Get a cached plan.
+
+        Parameters:
+            key (tuple): The key from get_key.
+
+        Returns:
+            RoutePlan: The plan, or None if there is no plan for the key.
+        """
+        return self.__plans.get(key)
+
+    def put(self, key, plan):
+        """
+        Cache a plan.
+
+        Parameters:
+            key (tuple): The key from get_key.
+            plan (RoutePlan): The plan to cache.
+
+        Returns:
+            None
+        """
+        if key not in self.__plans and len(self.__plans) >= self.MAX_PLANS:
+            del self.__plans[next(iter(self.__plans))]
+        self.__plans[key] = plan
+
+    def invalidate(self):
+        """
+        Drop every cached plan, e.g. after packages are added to or removed from the truck.
+
+        Returns:
+            None
+        """
+        self.__plans.clear()
+
+    def invalidate_package(self, package_id):
+        """
+        Drop the cached plans that include a package, e.g. after the package is re-addressed.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            int: The number of plans dropped.
+        """
+        stale = [key for key in self.__plans if any(stop[0] == package_id for stop in key[0])]
+        for key in stale:
+            del self.__plans[key]
+        return len(stale)
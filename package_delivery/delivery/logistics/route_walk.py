@@ -0,0 +1,59 @@
+from collections import namedtuple
+
+import numpy as np
+
+from package_delivery.timeutil.time_util import SECONDS_PER_MINUTE
+
+# Delivery walk of a truck's route in one pass
+# Packages next to each other in delivery order with the same address are one stop. The legs between the stops are read
+# from the shortest path table at once and the arrival times are the running sum of the whole-second travel times, so
+# a load of n packages is walked in O(n) instead of searching paths and scanning the load for every package.
+
+# One walk: the vertex and packages of every stop in order, the miles of the leg to each stop and the arrival time at
+# each stop in seconds since midnight
+RouteWalk = namedtuple('RouteWalk', ['start_vertex', 'start_time', 'stops', 'stop_packages', 'leg_distances',
+                                     'arrival_times'])
+
+
+def group_stops(packages):
+    """
+    Group packages into stops, packages next to each other with the same address are delivered at the same stop.
+
+    Parameters:
+        packages (list): The packages in delivery order.
+
+    Returns:
+        tuple: (stop vertices, tuple of the packages of each stop)
+    """
+    stops = []
+    stop_packages = []
+    for package in packages:
+        if stops and stops[-1] == package.address:
+            stop_packages[-1].append(package)
+        else:
+            stops.append(package.address)
+            stop_packages.append([package])
+    return tuple(stops), tuple(tuple(group) for group in stop_packages)
+
+
+def walk_route(packages, start_vertex, start_time, shortest_paths, speed):
+    """
+    Walk the stops of a delivery in order.
+
+    Parameters:
+        packages (list): The packages in delivery order.
+        start_vertex (str): Where the truck starts.
+        start_time (int): The time the truck starts in seconds since midnight.
+        shortest_paths (ShortestPaths): Shortest paths over the start and every stop.
+        speed (float): The truck speed in miles per minute.
+
+    Returns:
+        RouteWalk: The stops, their leg distances and arrival times.
+    """
+    stops, stop_packages = group_stops(packages)
+    positions = np.array([shortest_paths.get_position(vertex) for vertex in (start_vertex,) + stops], dtype=np.intp)
+    leg_distances = shortest_paths.distances[positions[:-1], positions[1:]]
+    # Whole seconds per leg like travel_seconds, rounded half to even like round
+    travel_times = np.rint(leg_distances / speed * SECONDS_PER_MINUTE).astype(np.int64)
+    arrival_times = start_time + np.cumsum(travel_times)
+    return RouteWalk(start_vertex, start_time, stops, stop_packages, leg_distances, arrival_times)
@@ -1,8 +1,9 @@
-from datetime import timedelta
-
-from package_delivery.datastructures.hash_map import HashMapEntry
+from package_delivery.delivery.status_report import PackageStatus
 from package_delivery.timeutil import time_util as util
 
+# Keys of a package's status_info that hold times in seconds since midnight
+TIME_KEYS = ('delivery_deadline', 'time_to_start_delivery', 'time_delivered')
+
 
 class TimeTracker:
     """
@@ -10,21 +11,25 @@ class TimeTracker:
 
     Attributes:
         __TRUCK_SPEED (float): The speed of the truck.
-        track_truck_current_time (dict): Dictionary to track current_time for each truck.
+        __start_time (int): The time the truck starts in seconds since midnight, None if it waits for a driver.
+        track_truck_current_time (dict): Dictionary to track current_time for each truck, in seconds since midnight.
         packages_status (dict): Dictionary to track packages_status for each truck.
         track_miles_traveled (dict): Dictionary to track miles traveled for each truck.
         __id (int): The ID of the truck
     """
 
-    def __init__(self, truck_id):
+    def __init__(self, truck_id, start_time, speed):
         """
         Initialize the TimeTracker object
 
         Parameters:
             truck_id (int): The ID of the truck
+            start_time (int): The time the truck starts in seconds since midnight, None if it starts when a driver
+            is back from another truck.
+            speed (float): The speed of the truck in miles per minute, 18mph -> 0.3.
         """
-        # Trucks_speed 18mph -> 0.3 miles per minute
-        self.__TRUCK_SPEED = 0.3
+        self.__TRUCK_SPEED = speed
+        self.__start_time = start_time
         # Dictionary to track current_time for each truck
         self.track_truck_current_time = {}
         # Dictionary of packages on truck and their status; AT_HUB, IN_TRANSIT, or DELIVERED
@@ -37,23 +42,31 @@ class TimeTracker:
 
         self.__id = truck_id
 
-        # Set the current time for each truck based on its truck ID
-        if truck_id == 1:
-            self.track_truck_current_time[truck_id] = 8.1688  # Set truck 1 start time to string 8:10 AM
-        elif truck_id == 2:
-            self.track_truck_current_time[truck_id] = 9.0844  # Set truck 2 start time 9:05 AM
-        elif truck_id == 3:
-            self.track_truck_current_time[truck_id] = 0  # Set truck 3 start time to zero will be updated when start
-            # delivery after truck 1
+        # Set the current time of the truck to its start time
+        self.reset_truck_current_time(truck_id)
 
     def reset_truck_current_time(self, truck_id):
-        """Reset the track_truck_current_time for the truck to its initial value."""
-        if truck_id == 1:
-            self.track_truck_current_time[truck_id] = 8.1688  # Reset truck 1 start time to 8:10 AM
-        elif truck_id == 2:
-            self.track_truck_current_time[truck_id] = 9.0844  # Reset truck 2 start time to 9:05 AM
-        elif truck_id == 3:
-            self.track_truck_current_time[truck_id] = 0  # Reset truck 3 start time to zero
+        """Reset the track_truck_current_time for the truck to its initial value, midnight if it waits for a driver."""
+        self.track_truck_current_time[truck_id] = 0 if self.__start_time is None else self.__start_time
+
+    def get_start_time(self):
+        """
+        Get the time the truck starts delivering.
+
+        Returns:
+            int: Seconds since midnight, None if the truck waits for a driver.
+        """
+        return self.__start_time
+
+    @property
+    def get_truck_speed(self):
+        """
+        Get the speed of the truck.
+
+        Returns:
+            float: The speed in miles per minute.
+        """
+        return self.__TRUCK_SPEED
 
     # Fixed speed of truck to calculate travel time
     def _get_truck_speed(self):
@@ -84,7 +97,7 @@ class TimeTracker:
         Sets the current time for a specified truck.
 
         Parameters:
-            new_time (float): The new current time to set for the truck.
+            new_time (int): The new current time to set for the truck, in seconds since midnight.
 
         Raises:
             ValueError: If the current time is not updated.
@@ -104,75 +117,22 @@ class TimeTracker:
 
         Parameters:
             package_id (int): The ID of the package to look up.
-            current_time (str): The current time in the format 'HH:MM'.
+            current_time (str): The current time in the format 'HH:MM AM/PM'.
 
         Returns:
             None
         """
-        current_time = util.convert_12h_to_24h_datetime(current_time)
+        current_time = _get_end_of_minute(current_time)
         for package, status_info in self.packages_status.items():
             if package.package_id == package_id:
-                time_delivered_str = status_info['time_delivered']
-                time_delivered = util.convert_time_str_to_datetime(time_delivered_str)
-                time_to_start_delivery_str = status_info['time_to_start_delivery']
-                time_to_start_delivery = util.convert_time_str_to_datetime(time_to_start_delivery_str)
                 status_info_copy = status_info.copy()
-                if current_time >= time_delivered:
-                    status_info_copy['status'] = 'DELIVERED'
-                elif time_to_start_delivery <= current_time < time_delivered:
-                    status_info_copy['status'] = 'IN_TRANSIT'
-                else:
-                    status_info_copy['status'] = 'AT_HUB'
+                status_info_copy['status'] = _get_status_at(status_info, current_time)
 
                 print("Package ID: ", package.package_id, " - Address: ", package.address, " - City: ", package.city,
                       " - State: ", package.state, " - Zipcode: ", package.zipcode, " - Delivery Deadline: ",
                       package.delivery_deadline, " - Mass: ", package.mass, " - Special Notes: ", package.special_notes,
                       " - Package Status: ", status_info_copy['status'],
-                      "Package Time Delivered: ", status_info_copy['time_delivered'])
-
-    # Update package in package_status dictionary
-    def update_package_status(self, package, new_address, new_city, new_state, new_zipcode, new_special_notes,
-                              current_time):
-        """
-        Updates the status of a package in the package status dictionary.
-
-        Parameters:
-        - package (HashMapEntry): The package to update.
-        - new_address (str): The new address for the package.
-        - new_city (str): The new city for the package.
-        - new_state (str): The new state for the package.
-        - new_zipcode (str): The new zipcode for the package.
-        - new_special_notes (str): The new special notes for the package.
-
-        Returns:
-        - bool: True if the package status was successfully updated, False otherwise.
-        """
-
-        time = util.convert_12h_to_24h_datetime(current_time)
-        target_time = util.convert_12h_to_24h_datetime('10:20 AM')
-        if time >= target_time:
-            if package in self.packages_status:
-                # Get the old status
-                old_status = self.packages_status[package]
-
-                # Create the updated package with new information
-                updated_package = HashMapEntry(
-                    package.package_id,
-                    new_address,
-                    new_city,
-                    new_state,
-                    new_zipcode,
-                    package.delivery_deadline,
-                    package.mass,
-                    new_special_notes,
-                    package.delivery_status
-                )
-                # Remove old package entry
-                del self.packages_status[package]
-                # Update the package status dictionary
-                self.packages_status[updated_package] = old_status
-
-                print("PACKAGE UPDATED, Address updated from 300 State St to 410 S State St: #9")
+                      "Package Time Delivered: ", util.seconds_24hr_str(status_info_copy['time_delivered']))
 
     # See the status of all packages during the day
     def print_all_package_status(self):
@@ -191,6 +151,9 @@ class TimeTracker:
         for package, status in self.packages_status.items():
             print(f"Package: {package}")
             for key, value in status.items():
+                # Times are kept in seconds, only formatted here
+                if key in TIME_KEYS:
+                    value = util.seconds_24hr_str(value)
                 print(f"  {key}: {value}")
             print("----------------------")
 
@@ -207,16 +170,15 @@ class TimeTracker:
         Returns:
             None
         """
-        formatted_time_to_start_delivery = util.float_time_24hr_str(self.track_truck_current_time[self.__id])
+        time_to_start_delivery = self.track_truck_current_time[self.__id]
         for package in packages:
-            delivery_deadline = util.convert_12h_to_24h_datetime(package.delivery_deadline)
-            formatted_delivery_time = delivery_deadline.strftime('%H:%M')
             if package not in self.packages_status:
+                # Deadlines are parsed once at load, times are kept in seconds and only formatted for output
                 self.packages_status[package] = {
                     'status': initial_status,
                     'truck': self.__id,
-                    'delivery_deadline': formatted_delivery_time,
-                    'time_to_start_delivery': formatted_time_to_start_delivery,
+                    'delivery_deadline': package.deadline_minutes * util.SECONDS_PER_MINUTE,
+                    'time_to_start_delivery': time_to_start_delivery,
                     'time_delivered': None
                 }
 
@@ -226,14 +188,14 @@ class TimeTracker:
         Updates the time to start delivery for all packages assigned to a given truck.
 
         Parameters:
-            new_time (float): The new time to start delivery.
+            new_time (int): The new time to start delivery, in seconds since midnight.
 
         Returns:
             None
         """
         for package_id, package_info in self.packages_status.items():
             if package_info['truck'] == self.__id:
-                package_info['time_to_start_delivery'] = util.float_time_24hr_str(new_time)
+                package_info['time_to_start_delivery'] = new_time
 
     def get_single_package_status(self, package):
         return self.packages_status[package]
@@ -244,7 +206,7 @@ class TimeTracker:
         Increment the current time of a specific truck.
 
         Parameters:
-            time (float): The amount of time to increment the current time by.
+            time (int): The number of seconds to increment the current time by.
 
         Returns:
             None
@@ -260,7 +222,7 @@ class TimeTracker:
         - None
 
         Returns:
-            datetime.datetime: The current time of the specified truck.
+            int: The current time of the specified truck, in seconds since midnight.
         """
         return self.track_truck_current_time[self.__id]
 
@@ -293,19 +255,18 @@ class TimeTracker:
         """
         return sum(self.track_miles_traveled.values())
 
-    # Calculate the time in minutes: time = distance / speed
-    def _calculate_travel_time_minutes(self, distance):
+    # Calculate the time in seconds: time = distance / speed
+    def _calculate_travel_time_seconds(self, distance):
         """
-        Calculate the travel time in minutes based on the distance and the truck's speed.
+        Calculate the travel time in seconds based on the distance and the truck's speed.
 
         Parameters:
-            distance (float): The distance to travel in kilometers.
+            distance (float): The distance to travel in miles.
 
         Returns:
-            float: The travel time in minutes.
+            int: The travel time in whole seconds.
         """
-        speed = self._get_truck_speed()
-        return distance / speed
+        return util.travel_seconds(distance, self._get_truck_speed())
 
     # Update current_truck delivery time and insert into delivery_time of package
     def update_current_truck_time(self, distance):
@@ -316,17 +277,12 @@ class TimeTracker:
         - distance (float): The distance traveled by the truck.
 
         Returns:
-        - str: The formatted current time of the truck.
+        - int: The current time of the truck, in seconds since midnight.
         """
         # Calculate travel time for each segment of the route for the current truck
-        # Add to current_time
-        transit_time = self._calculate_travel_time_minutes(distance)
-        transit_time_hours = transit_time / 60  # Convert transit_time from minutes to hours
-
-        self._increment_current_truck_time(transit_time_hours)
-        # Float to string for current_time
-        formatted_truck_current_time = util.float_time_24hr_str(self.track_truck_current_time[self.__id])
-        return formatted_truck_current_time
+        # Add to current_time, whole seconds so long routes do not drift
+        self._increment_current_truck_time(self._calculate_travel_time_seconds(distance))
+        return self.track_truck_current_time[self.__id]
 
     def insert_current_truck_time_to_package(self, package, time_delivered):
         """
@@ -334,7 +290,7 @@ class TimeTracker:
 
         Parameters:
             package (any): The package to insert the time for.
-            time_delivered (str): The time the package was delivered.
+            time_delivered (int): The time the package was delivered, in seconds since midnight.
 
         Returns:
             None
@@ -385,69 +341,49 @@ class TimeTracker:
             end_interval (str): The end time interval for package delivery.
 
         Returns:
-            filtered_packages (list): A list of filtered packages
+            filtered_packages (list): A PackageStatus record for every package, see status_report to format them
         """
         filtered_packages = []
-        start_time = util.convert_12h_to_24h_datetime(start_interval)
-        end_time = util.convert_12h_to_24h_datetime(end_interval)
-        # Incase start_time is equal to end_time
-        end_time = util.time_plus_delta(end_time, timedelta(seconds=30))
+        # Packages delivered before start_interval are delivered too, the status is the status at end_interval
+        end_time = _get_end_of_minute(end_interval)
         for package, status_info in self.packages_status.items():
-            time_delivered_str = status_info['time_delivered']
-            time_to_start_delivery_str = status_info['time_to_start_delivery']
-            try:
-                time_delivered = util.convert_time_str_to_datetime(time_delivered_str)
-                time_start_delivery = util.convert_time_str_to_datetime(time_to_start_delivery_str)
-                status_info_copy = status_info.copy()
-                if time_start_delivery > end_time:
-                    # Package is still at the hub
-                    status_info_copy['status'] = 'AT_HUB'
-                elif start_time <= time_delivered <= end_time or time_delivered < start_time:
-                    # Package has been delivered
-                    status_info_copy['status'] = 'DELIVERED'
-                elif time_start_delivery < end_time < time_delivered:
-                    # The Package is in transit
-                    status_info_copy['status'] = 'IN_TRANSIT'
-                filtered_packages.append(format_output(package.package_id, package.address,
-                                                       status_info_copy['status'],
-                                                       status_info_copy['delivery_deadline'],
-                                                       status_info_copy['time_delivered'], status_info_copy['truck'],
-                                                       package.city, package.state, package.zipcode,
-                                                       package.mass, package.special_notes))
-            except ValueError as e:
-                print(f"Error parsing time for package {package}: {e}, time_delivered: {0}")
+            filtered_packages.append(PackageStatus(package.package_id, package.address, package.city, package.state,
+                                                   package.zipcode, package.mass, package.special_notes,
+                                                   _get_status_at(status_info, end_time),
+                                                   status_info['delivery_deadline'], status_info['time_delivered'],
+                                                   status_info['truck']))
         return filtered_packages
 
 
-# Function to format filtered packages from get_filtered_packages_by_time_range
-def format_output(package_id, address, status, delivery_deadline, time_delivered, truck, city, state, zipcode, mass, special_notes):
+# Last second of the minute of a time, a time asked for covers its whole minute like the HH:MM times shown
+def _get_end_of_minute(time_str):
+    """
+    Get the last second of the minute of a time.
+
+    Parameters:
+        time_str (str): The time in the format 'HH:MM AM/PM'.
+
+    Returns:
+        int: The last second of the minute, in seconds since midnight.
+    """
+    return util.convert_12h_to_seconds(time_str) + util.SECONDS_PER_MINUTE - 1
+
+
+# Status of a package at a time from its status_info in packages_status
+def _get_status_at(status_info, time):
     """
-    Format the output of the package information.
+    Get the status of a package at a time.
 
     Parameters:
-        package_id (int): The ID of the package.
-        address (str): The address of the package.
-        status (str): The status of the package.
-        delivery_deadline (str): The deadline for delivery.
-        time_delivered (str): The time the package was delivered.
-        truck (str): The truck used for delivery.
-        city (str): The city of the package's destination.
-        state (str): The state of the package's destination.
-        zipcode (str): The zipcode of the package's destination.
-        mass (str): The mass/weight of the package.
-        special_notes (str): Any special notes related to the package.
+        status_info (dict): The status_info of the package in packages_status.
+        time (int): The time in seconds since midnight.
 
     Returns:
-        str: The formatted output of the package information.
+        str: 'AT_HUB', 'IN_TRANSIT' or 'DELIVERED'.
     """
-    return (f"Package ID: {package_id} | "
-            f"Address: {address} | "
-            f"City: {city} | "
-            f"State: {state} | "
-            f"Zipcode: {zipcode} | "
-            f"Mass: {mass} | "
-            f"Special Notes: {special_notes} | "
-            f"Status: {status} | "
-            f"Delivery Deadline: {delivery_deadline} | "
-            f"Time Delivered: {time_delivered} | "
-            f"Truck: {truck} | ")
+    time_delivered = status_info['time_delivered']
+    if time_delivered is not None and time_delivered <= time:
+        return 'DELIVERED'
+    if status_info['time_to_start_delivery'] <= time:
+        return 'IN_TRANSIT'
+    return 'AT_HUB'
@@ -0,0 +1,200 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from package_delivery.delivery.simulation import EVENT_ADDRESS_CORRECTED, TRUCK_SPEED
+from package_delivery.timeutil.time_util import SECONDS_PER_MINUTE
+
+# Monte Carlo robustness of a fixed delivery plan
+# The plan, every truck's stops, leg miles and packages from one simulated day, is re-driven under sampled scenarios.
+# A scenario scales the speed of every leg, adds a stop time at every stop and delays the late packages. A package with
+# a wrong address is never delivered before its address is corrected and cancelled packages are left out of the plan.
+# Scenarios are driven in chunks with numpy, one row per scenario, and the chunks are spread over a process pool. Times
+# are seconds since midnight like the simulator.
+
+# Standard deviation of the speed of a leg, as a fraction of the truck's speed
+SPEED_SPREAD = 0.1
+# Slowest and fastest leg, as a fraction of the truck's speed
+SPEED_LIMITS = (0.5, 1.5)
+# Mean minutes spent at a stop, exponentially distributed
+STOP_DELAY_MINUTES = 1.0
+# Mean minutes a late package arrives after its announced time, exponentially distributed
+ARRIVAL_DELAY_MINUTES = 10.0
+# Scenarios driven together by one worker
+CHUNK_SIZE = 2000
+
+# One truck of a plan: its ID, scheduled departure (None to wait for a free driver), its speed in miles per minute, the
+# miles of the leg to each stop and, for each of its packages, the position of the package in DeliveryPlan.package_ids
+# and the stop delivering it
+PlanTruck = namedtuple('PlanTruck', ['truck_id', 'departure_time', 'speed', 'legs', 'package_positions',
+                                     'package_stops'])
+# A fixed delivery plan: the trucks in the order they take drivers, the package IDs, their deadlines and the time they
+# reach the hub (0 for packages at the hub from the start), which packages are late, the time the address of each
+# package is corrected (0 for packages with a right address), the number of drivers and the IDs of the cancelled
+# packages, which are not part of the plan
+DeliveryPlan = namedtuple('DeliveryPlan', ['trucks', 'package_ids', 'deadlines', 'available', 'late', 'release',
+                                           'driver_count', 'cancelled'])
+# On-time probability per package ID and per truck ID (every package of the truck on time) over the scenarios and the
+# IDs of the cancelled packages, which have no probability
+RobustnessResult = namedtuple('RobustnessResult', ['scenarios', 'package_on_time', 'truck_on_time', 'cancelled'])
+
+
+def make_plan(simulation_result, departure_times, deadlines, driver_count=2, speeds=None):
+    """
+    Make a fixed delivery plan from a simulated day, its cancelled packages left out.
+
+    Parameters:
+        simulation_result (SimulationResult): The simulated day, its stops and packages are the plan.
+        departure_times (dict): Truck ID -> scheduled departure in seconds since midnight, None to wait for a driver.
+        deadlines (dict): Package ID -> delivery deadline in seconds since midnight.
+        driver_count (int): The number of drivers.
+        speeds (dict, optional): Truck ID -> the truck's speed in miles per minute, TRUCK_SPEED for a truck left out.
+
+    Returns:
+        DeliveryPlan: The plan.
+    """
+    cancelled = tuple(sorted(package_id for package_id, timeline in simulation_result.packages.items()
+                             if timeline.cancelled))
+    package_ids = sorted(set(simulation_result.packages) - set(cancelled))
+    positions = {package_id: position for position, package_id in enumerate(package_ids)}
+    available = [simulation_result.packages[package_id].available_time for package_id in package_ids]
+    # A package with a wrong address is released by its ADDRESS_CORRECTED event
+    release = [max((event.time for event in simulation_result.packages[package_id].events
+                    if event.kind == EVENT_ADDRESS_CORRECTED), default=0) for package_id in package_ids]
+    # Trucks with a departure time take their drivers first in departure order, waiting trucks take them in the order
+    # they were added
+    truck_ids = sorted(simulation_result.trucks, key=lambda truck_id: (departure_times.get(truck_id) is None,
+                                                                       departure_times.get(truck_id) or 0))
+    trucks = []
+    for truck_id in truck_ids:
+        timeline = simulation_result.trucks[truck_id]
+        package_positions = []
+        package_stops = []
+        for stop, package_group in enumerate(timeline.deliveries):
+            for package_id in package_group:
+                if package_id not in positions:
+                    continue
+                package_positions.append(positions[package_id])
+                package_stops.append(stop)
+        trucks.append(PlanTruck(truck_id, departure_times.get(truck_id), (speeds or {}).get(truck_id, TRUCK_SPEED),
+                                np.array(timeline.legs, dtype=float), np.array(package_positions, dtype=np.int64),
+                                np.array(package_stops, dtype=np.int64)))
+    return DeliveryPlan(tuple(trucks), np.array(package_ids, dtype=np.int64),
+                        np.array([deadlines[package_id] for package_id in package_ids], dtype=float),
+                        np.array([time or 0 for time in available], dtype=float),
+                        np.array([time is not None for time in available]), np.array(release, dtype=float),
+                        driver_count, cancelled)
+
+
+# Drive a chunk of scenarios at once, every array has one row per scenario
+def drive_scenarios(plan, scenario_count, rng, speed_spread=SPEED_SPREAD, stop_delay=STOP_DELAY_MINUTES,
+                    arrival_delay=ARRIVAL_DELAY_MINUTES):
+    """
+    Drive a plan under sampled scenarios.
+
+    Parameters:
+        plan (DeliveryPlan): The plan to drive.
+        scenario_count (int): The number of scenarios.
+        rng (numpy.random.Generator): The random generator of the scenarios.
+        speed_spread (float): Standard deviation of the speed of a leg, as a fraction of the truck's speed.
+        stop_delay (float): Mean minutes spent at a stop.
+        arrival_delay (float): Mean minutes a late package arrives after its announced time.
+
+    Returns:
+        numpy.ndarray: scenario_count x packages delivery times in seconds since midnight, inf if never delivered.
+    """
+    delivery = np.full((scenario_count, len(plan.package_ids)), np.inf)
+    available = plan.available + plan.late * rng.exponential(arrival_delay * SECONDS_PER_MINUTE,
+                                                             (scenario_count, len(plan.package_ids)))
+    # Time each driver is free, a truck takes the driver that is free first, the drivers no scheduled truck needs are
+    # free when the first scheduled truck leaves, the same as the simulator
+    departure_times = [truck.departure_time for truck in plan.trucks if truck.departure_time is not None]
+    free = np.full((scenario_count, plan.driver_count), float(min(departure_times, default=0)))
+    rows = np.arange(scenario_count)
+    for truck in plan.trucks:
+        driver = free.argmin(axis=1)
+        start = free[rows, driver]
+        if truck.departure_time is not None:
+            start = np.maximum(start, truck.departure_time)
+        if len(truck.package_positions):
+            start = np.maximum(start, available[:, truck.package_positions].max(axis=1))
+        leg_count = len(truck.legs)
+        if leg_count == 0:
+            free[rows, driver] = start
+            continue
+        speed = truck.speed * np.clip(rng.normal(1.0, speed_spread, (scenario_count, leg_count)), *SPEED_LIMITS)
+        # Time of each leg plus the stop time at the stop before it, the first leg starts at the departure
+        leg_seconds = truck.legs / speed * SECONDS_PER_MINUTE
+        stop_seconds = rng.exponential(stop_delay * SECONDS_PER_MINUTE, (scenario_count, leg_count)) if stop_delay \
+            else np.zeros((scenario_count, leg_count))
+        leg_seconds[:, 1:] += stop_seconds[:, :-1]
+        arrival = start[:, None] + np.cumsum(leg_seconds, axis=1)
+        # A package reached before its address is corrected is delivered once it is
+        delivery[:, truck.package_positions] = np.maximum(arrival[:, truck.package_stops],
+                                                          plan.release[truck.package_positions])
+        # The driver is free after the stop time at the last stop
+        free[rows, driver] = arrival[:, -1] + stop_seconds[:, -1]
+    return delivery
+
+
+# One worker's share of the scenarios, module level so the process pool can pickle it
+def _run_chunk(plan, scenario_count, seed, speed_spread, stop_delay, arrival_delay):
+    """
+    Drive a chunk of scenarios and count the on-time deliveries.
+
+    Parameters:
+        plan (DeliveryPlan): The plan to drive.
+        scenario_count (int): The number of scenarios.
+        seed (numpy.random.SeedSequence): The seed of the chunk.
+        speed_spread (float): See drive_scenarios.
+        stop_delay (float): See drive_scenarios.
+        arrival_delay (float): See drive_scenarios.
+
+    Returns:
+        tuple: (on-time count per package, on-time count per truck in plan order)
+    """
+    delivery = drive_scenarios(plan, scenario_count, np.random.default_rng(seed), speed_spread, stop_delay,
+                               arrival_delay)
+    on_time = delivery <= plan.deadlines
+    truck_counts = [np.count_nonzero(on_time[:, truck.package_positions].all(axis=1)) for truck in plan.trucks]
+    return on_time.sum(axis=0), np.array(truck_counts)
+
+
+def run_monte_carlo(plan, scenarios=10000, speed_spread=SPEED_SPREAD, stop_delay=STOP_DELAY_MINUTES,
+                    arrival_delay=ARRIVAL_DELAY_MINUTES, workers=None, seed=0, chunk_size=CHUNK_SIZE):
+    """
+    Estimate the on-time probability of every package and truck of a plan.
+
+    Parameters:
+        plan (DeliveryPlan): The plan to drive, see make_plan.
+        scenarios (int): The number of scenarios.
+        speed_spread (float): Standard deviation of the speed of a leg, as a fraction of the truck's speed.
+        stop_delay (float): Mean minutes spent at a stop.
+        arrival_delay (float): Mean minutes a late package arrives after its announced time.
+        workers (int, optional): The number of worker processes, 1 to drive every chunk in this process. Default to
+        the number of CPUs.
+        seed (int): The seed of the scenarios, the result only depends on the seed and the chunk size.
+        chunk_size (int): The number of scenarios driven together.
+
+    Returns:
+        RobustnessResult: The on-time probability per package ID and per truck ID and the cancelled package IDs.
+    """
+    chunk_counts = [min(chunk_size, scenarios - start) for start in range(0, scenarios, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_counts))
+    arguments = [(plan, count, chunk_seed, speed_spread, stop_delay, arrival_delay)
+                 for count, chunk_seed in zip(chunk_counts, seeds)]
+    workers = min(workers or os.cpu_count() or 1, len(arguments)) if arguments else 1
+    if workers == 1:
+        results = [_run_chunk(*argument) for argument in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_chunk, *zip(*arguments)))
+    package_counts = sum((result[0] for result in results), np.zeros(len(plan.package_ids), dtype=np.int64))
+    truck_counts = sum((result[1] for result in results), np.zeros(len(plan.trucks), dtype=np.int64))
+    total = max(scenarios, 1)
+    return RobustnessResult(scenarios,
+                            dict(zip(plan.package_ids.tolist(), (package_counts / total).tolist())),
+                            {truck.truck_id: count / total for truck, count in zip(plan.trucks, truck_counts.tolist())},
+                            plan.cancelled)
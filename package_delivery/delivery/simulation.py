@@ -0,0 +1,761 @@
+import heapq
+from collections import namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+from package_delivery.algorithms.insertion_route import InsertionRoute
+from package_delivery.algorithms.two_opt_route import two_opt_delta
+from package_delivery.timeutil.time_util import SECONDS_PER_MINUTE, convert_12h_to_seconds, travel_seconds
+
+# Discrete-event simulation of a delivery day
+# The day is run once from a heap of timed events instead of replaying every truck for every status query. Times are
+# whole seconds since midnight, like TimeTracker, and every result is immutable so it can be shared between queries.
+
+# Hub all trucks load at
+HUB = '4001 South 700 East'
+# Trucks_speed 18mph -> 0.3 miles per minute
+TRUCK_SPEED = 0.3
+# Each truck can carry a maximum of 16 packages
+TRUCK_CAPACITY = 16
+
+# Kinds of events, in the order events at the same time are processed
+EVENT_PACKAGE_ARRIVAL = 'PACKAGE_ARRIVAL'  # A late package reaches the hub
+EVENT_PACKAGE_CHANGE = 'PACKAGE_CHANGE'  # The address or deadline of a package changes or it is cancelled
+EVENT_ADDRESS_CORRECTED = 'ADDRESS_CORRECTED'  # A package with a wrong address can be delivered
+EVENT_PACKAGE_INTAKE = 'PACKAGE_INTAKE'  # A new package reaches the hub and is put on a truck
+EVENT_HUB_RETURN = 'HUB_RETURN'  # A truck finished its route and its driver is free
+EVENT_DRIVER_HANDOFF = 'DRIVER_HANDOFF'  # A free driver takes a waiting truck
+EVENT_DEPARTURE = 'DEPARTURE'  # A truck leaves with its load
+EVENT_ARRIVAL = 'ARRIVAL'  # A truck reaches a stop
+EVENT_DELIVERY = 'DELIVERY'  # A package is delivered
+_EVENT_ORDER = {kind: order for order, kind in enumerate((EVENT_PACKAGE_ARRIVAL, EVENT_PACKAGE_CHANGE,
+                                                           EVENT_ADDRESS_CORRECTED, EVENT_PACKAGE_INTAKE, EVENT_HUB_RETURN,
+                                                           EVENT_DRIVER_HANDOFF, EVENT_DEPARTURE, EVENT_ARRIVAL,
+                                                           EVENT_DELIVERY))}
+
+# One processed event, fields that do not apply to the kind of event are None, change is the PackageChange of a
+# PACKAGE_CHANGE event
+Event = namedtuple('Event', ['time', 'kind', 'truck_id', 'driver_id', 'package_id', 'vertex', 'change'],
+                   defaults=(None, None, None, None, None))
+# Everything that happened to one package: its truck (None if no truck could take a new package), final address, when
+# it reached the hub, left on its truck and was delivered (None if it never was), its events in time order and whether
+# it was cancelled before delivery
+PackageTimeline = namedtuple('PackageTimeline', ['package_id', 'truck_id', 'address', 'available_time',
+                                                 'departure_time', 'delivery_time', 'events', 'cancelled'])
+# Everything that happened to one truck: its driver, departure and return times, miles driven, the
+# (vertex, arrival time) of every stop in the order visited, the miles of the leg to each stop, the package IDs
+# delivered at each stop and where the truck started. A truck driving back to the hub has the hub as a stop with no
+# packages
+TruckTimeline = namedtuple('TruckTimeline', ['truck_id', 'driver_id', 'departure_time', 'return_time', 'miles',
+                                             'stops', 'legs', 'deliveries', 'start_vertex'])
+# Result of DeliverySimulator.run, package ID -> PackageTimeline, truck ID -> TruckTimeline and every event in order
+SimulationResult = namedtuple('SimulationResult', ['packages', 'trucks', 'events'])
+
+
+class _TruckState:
+    """
+    Class to represent the mutable state of a truck while the simulation runs.
+
+    Attributes:
+        truck_id (int): The ID of the truck.
+        stops (list): [vertex, [package IDs]] of the stops not visited yet, in route order.
+        departure_time (int): The scheduled departure, None to wait for a free driver.
+        vertex (str): The current location of the truck.
+        start_vertex (str): Where the truck started.
+        return_to_hub (bool): Whether the truck drives back to the hub after its last stop.
+        driver_id (int): The driver of the truck, None until one takes it.
+        departed (bool): Whether the truck has left.
+        en_route (bool): Whether an arrival at stops[0] is already scheduled.
+        miles (float): Miles driven so far.
+        visited (list): (vertex, arrival time) of the stops visited.
+        legs (list): Miles of the leg to each stop visited.
+        deliveries (list): Tuple of the package IDs delivered at each stop visited.
+        leg_miles (float): Miles of the leg being driven.
+        vertices (dict): Every vertex the route has had, legs may pass through any of them.
+        shortest_paths (ShortestPaths): Shortest paths over vertices, None after a vertex is added.
+        start_time (int): The time the truck left.
+        return_time (int): The time the truck finished its route.
+        hub_arrival (int): The time the truck reaches the hub while driving back to it, None otherwise.
+        speed (float): The speed of the truck in miles per minute.
+        capacity (int): The number of packages the truck can carry.
+        held (set): IDs of the packages on the truck kept off its stops until their address is corrected.
+        waiting (bool): Whether the truck waits at its last stop for a held package's address to be corrected.
+        next_arrival (int): The time the truck reaches stops[0] while en route.
+    """
+    __slots__ = ('truck_id', 'stops', 'departure_time', 'vertex', 'start_vertex', 'return_to_hub', 'driver_id',
+                 'departed', 'en_route', 'miles', 'visited', 'legs', 'deliveries', 'leg_miles', 'vertices',
+                 'shortest_paths', 'start_time', 'return_time', 'hub_arrival', 'speed', 'capacity', 'held', 'waiting',
+                 'next_arrival')
+
+    def __init__(self, truck_id, stops, departure_time, vertex, return_to_hub, speed, capacity):
+        self.truck_id = truck_id
+        self.stops = stops
+        self.departure_time = departure_time
+        self.vertex = vertex
+        self.start_vertex = vertex
+        self.return_to_hub = return_to_hub
+        self.driver_id = None
+        self.departed = False
+        self.en_route = False
+        self.miles = 0
+        self.visited = []
+        self.legs = []
+        self.deliveries = []
+        self.leg_miles = 0
+        self.vertices = dict.fromkeys([vertex] + [stop[0] for stop in stops])
+        self.shortest_paths = None
+        self.start_time = None
+        self.return_time = None
+        self.hub_arrival = None
+        self.speed = speed
+        self.capacity = capacity
+        self.held = set()
+        self.waiting = False
+        self.next_arrival = None
+
+
+class DeliverySimulator:
+    """
+    Class to simulate a delivery day with a heap of timed events.
+
+    Trucks drive their stops in the given order. A truck with a departure time takes a free driver then, a truck without
+    one waits for a driver to be handed over when another truck returns, or takes one of the drivers no scheduled truck
+    needs when the first scheduled truck leaves. A returning driver goes to a scheduled truck that could not leave for
+    lack of a driver first, and is kept for the scheduled trucks not departed yet before an unscheduled truck gets it. A truck does not leave before every package it carries has reached the
+    hub. A changed address moves the package to the cheapest position
+    among the stops its truck has not reached yet and a cancellation takes it off its stop, then only that truck's
+    remaining stops are re-optimized with 2-opt, starting from their current order. A new package reaching the hub
+    during the day is put on the truck, not departed yet, driving back to the hub or back at the hub with a free driver,
+    where it adds the fewest miles without making a delivery late. A truck not departed yet is checked from the earliest
+    time a driver can take it, when a free driver or one finishing its route, drive back to the hub included, reaches
+    it. If no truck can take it, it waits at the hub and is
+    tried again whenever a truck finishes its route. Legs use the shortest paths between the truck's start and stops, see
+    Graph.get_shortest_paths.
+
+    Attributes:
+        __graph (Graph): The graph of delivery locations and distances.
+        __driver_count (int): The number of drivers.
+        __speed (float): Truck speed in miles per minute.
+        __hub (str): The hub vertex.
+        __trucks (dict): Truck ID -> _TruckState, in the order the trucks were added.
+        __available (dict): Package ID -> time it reaches the hub, for late packages.
+        __holds (dict): Package ID -> earliest time it may leave the hub, None for no set time, for packages with a
+            wrong address waiting for their correction.
+        __changes (list): PackageChange of the changes to packages.
+        __intake (dict): Package ID -> (time, package) of the new packages reaching the hub during the day.
+        __deadlines (dict): Package ID -> delivery deadline in seconds since midnight.
+        __capacity (int): The number of packages a truck can carry, unless added with its own.
+    """
+
+    def __init__(self, graph, driver_count=2, speed=TRUCK_SPEED, hub=HUB, capacity=TRUCK_CAPACITY):
+        """
+        Initialize the simulator
+
+        Parameters:
+            graph (Graph): The graph of delivery locations and distances.
+            driver_count (int): The number of drivers.
+            speed (float): Truck speed in miles per minute, for trucks added without their own.
+            hub (str): The hub vertex.
+            capacity (int): The number of packages a truck can carry, for trucks added without their own.
+        """
+        self.__graph = graph
+        self.__driver_count = driver_count
+        self.__speed = speed
+        self.__hub = hub
+        self.__trucks = {}
+        self.__available = {}
+        self.__holds = {}
+        self.__changes = []
+        self.__intake = {}
+        self.__deadlines = {}
+        self.__capacity = capacity
+
+    def add_truck(self, truck_id, packages, departure_time=None, start_vertex=None, return_to_hub=False, speed=None,
+                  capacity=None):
+        """
+        Add a truck and its load.
+
+        Parameters:
+            truck_id (int): The ID of the truck.
+            packages (list): The packages on the truck in delivery order, packages next to each other with the same
+            address are delivered at the same stop.
+            departure_time (int, optional): Seconds since midnight the truck leaves, None to wait for a free driver.
+            start_vertex (str, optional): Where the truck starts from. Default to the hub.
+            return_to_hub (bool, optional): Whether the truck drives back to the hub after its last stop, otherwise
+            its driver is free at the last stop.
+            speed (float, optional): The speed of the truck in miles per minute. Default to the simulator's.
+            capacity (int, optional): The number of packages the truck can carry. Default to the simulator's.
+
+        Returns:
+            None
+        """
+        stops = []
+        for package in packages:
+            self.__deadlines[package.package_id] = package.deadline_minutes * SECONDS_PER_MINUTE
+            if stops and stops[-1][0] == package.address:
+                stops[-1][1].append(package.package_id)
+            else:
+                stops.append([package.address, [package.package_id]])
+        self.__trucks[truck_id] = _TruckState(truck_id, stops, departure_time, start_vertex or self.__hub,
+                                              return_to_hub, speed or self.__speed, capacity or self.__capacity)
+
+    def add_package_arrival(self, package_id, time):
+        """
+        Add a package that reaches the hub late.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            time (int): Seconds since midnight the package reaches the hub.
+
+        Returns:
+            None
+        """
+        self.__available[package_id] = time
+
+    def add_package_hold(self, package_id, time=None):
+        """
+        Add a package with a wrong address, it is not delivered before its address is corrected.
+
+        The address is corrected at the time given or by the last address change added for the package, whichever is
+        later. A truck reaching the package's stop earlier keeps the package and puts it back on its stops once the
+        address is corrected, waiting at its last stop if it has no other stops left. A package whose address is
+        never corrected is not delivered.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            time (int, optional): Seconds since midnight the address is corrected, None if only a change corrects it.
+
+        Returns:
+            None
+        """
+        self.__holds[package_id] = time
+
+    def add_package_change(self, change):
+        """
+        Add a change to a package, a new address, a new deadline or a cancellation.
+
+        Parameters:
+            change (PackageChange): The change, its time in seconds since midnight. A new address must be a vertex of
+            the graph.
+
+        Returns:
+            None
+        """
+        self.__changes.append(change)
+
+    def add_package_intake(self, package, time):
+        """
+        Add a new package that reaches the hub during the day, it is put on a truck when it arrives.
+
+        Parameters:
+            package (HashMapEntry): The package, its address must be a vertex of the graph.
+            time (int): Seconds since midnight the package reaches the hub.
+
+        Returns:
+            None
+        """
+        self.__intake[package.package_id] = (time, package)
+        self.__deadlines[package.package_id] = package.deadline_minutes * SECONDS_PER_MINUTE
+
+    def run(self):
+        """
+        Simulate the day.
+
+        Returns:
+            SimulationResult: The immutable timelines of every package and truck and all events.
+        """
+        heap = []
+        sequence = 0
+        events = []
+        package_events = {}
+        package_truck = {}
+        address = {}
+        departure = {}
+        delivery = {}
+        cancelled = set()
+        arrived = {package_id: False for package_id in self.__available}
+        # Time the address of every package with a wrong address is corrected, None if it never is
+        release = {}
+        for package_id, time in self.__holds.items():
+            corrections = [change.time for change in self.__changes
+                           if change.package_id == package_id and change.address is not None]
+            release[package_id] = max([time] + corrections if time is not None else corrections, default=None)
+        free_drivers = list(range(self.__driver_count, 0, -1))  # Popped from the end, driver 1 first
+        waiting = []  # Trucks waiting for a driver, in the order they were added
+        unplaced = []  # New packages at the hub no truck could take yet, in the order they arrived
+        handoffs = {}  # Truck ID -> time of the driver hand-overs not processed yet
+
+        def push(time, kind, truck_id=None, driver_id=None, package_id=None, vertex=None, change=None):
+            nonlocal sequence
+            heapq.heappush(heap, (time, _EVENT_ORDER[kind], sequence,
+                                  Event(time, kind, truck_id, driver_id, package_id, vertex, change)))
+            sequence += 1
+
+        def log(event, package_ids=()):
+            events.append(event)
+            for package_id in package_ids:
+                package_events[package_id].append(event)
+
+        def leg_distance(truck, vertex):
+            return self._get_shortest_paths(truck, vertex).get_distance(truck.vertex, vertex)
+
+        def travel_time(truck, distance):
+            return travel_seconds(distance, truck.speed)
+
+        def next_leg(truck, time):
+            if truck.stops:
+                distance = leg_distance(truck, truck.stops[0][0])
+                truck.miles += distance
+                truck.leg_miles = distance
+                truck.en_route = True
+                truck.next_arrival = time + travel_time(truck, distance)
+                push(truck.next_arrival, EVENT_ARRIVAL, truck.truck_id, truck.driver_id, vertex=truck.stops[0][0])
+            elif any(release[package_id] is not None for package_id in truck.held):
+                # Wait for the held packages, their correction puts them back on the stops
+                truck.en_route = False
+                truck.waiting = True
+            else:
+                truck.en_route = False
+                distance = leg_distance(truck, self.__hub) if truck.return_to_hub else 0
+                truck.miles += distance
+                truck.leg_miles = distance
+                return_time = time + travel_time(truck, distance)
+                if truck.return_to_hub:
+                    truck.hub_arrival = return_time
+                push(return_time, EVENT_HUB_RETURN, truck.truck_id, truck.driver_id,
+                     vertex=self.__hub if truck.return_to_hub else truck.vertex)
+
+        # Free drivers take the waiting trucks, a scheduled truck past its departure first, the unscheduled ones only
+        # with the drivers the scheduled trucks not departed yet do not need
+        def hand_over(time):
+            reserved = sum(1 for truck in self.__trucks.values() if truck.departure_time is not None
+                           and not truck.departed and truck.driver_id is None and truck not in waiting)
+            while waiting and free_drivers:
+                truck = next((truck for truck in waiting if truck.departure_time is not None), None)
+                if truck is None:
+                    if len(free_drivers) <= reserved:
+                        break
+                    truck = waiting[0]
+                waiting.remove(truck)
+                handoffs[truck.truck_id] = time
+                push(time, EVENT_DRIVER_HANDOFF, truck.truck_id, free_drivers.pop())
+
+        # Time a truck not departed can leave once it has a driver, after the late packages of its load
+        def get_ready_time(truck, time):
+            return max([time] + [self.__available[package_id] for _, package_ids in truck.stops
+                                 for package_id in package_ids if package_id in self.__available])
+
+        # Time a departed truck's driver is free, at the end of its route, None while it waits for held packages
+        def get_finish_time(truck, time):
+            if truck.waiting:
+                return None
+            if truck.hub_arrival is not None:
+                # Driving back, the packages taken on go out on a new trip from the hub
+                return truck.hub_arrival + (self._get_route_seconds(truck, self.__hub, truck.stops) if truck.stops
+                                            else 0)
+            if truck.en_route:
+                return truck.next_arrival + self._get_route_seconds(truck, truck.stops[0][0], truck.stops[1:])
+            return time
+
+        # Earliest time a driver can take each truck not departed yet. The free drivers are free now and the drivers
+        # out when their trucks finish, the scheduled trucks take them first, in departure order, then the waiting
+        # trucks in turn, each freeing its driver again at the end of its route
+        def get_driver_times(time):
+            free_times = [time] * len(free_drivers)
+            driver_times = {}
+            queue = []
+            for truck in self.__trucks.values():
+                if truck.departed:
+                    finish_time = get_finish_time(truck, time) if truck.return_time is None else None
+                    if finish_time is not None:
+                        free_times.append(finish_time)
+                elif truck.driver_id is not None or truck.truck_id in handoffs:
+                    driver_times[truck.truck_id] = get_ready_time(truck, handoffs.get(truck.truck_id, time))
+                    free_times.append(driver_times[truck.truck_id] +
+                                      self._get_route_seconds(truck, truck.vertex, truck.stops))
+                else:
+                    queue.append(truck)
+            heapq.heapify(free_times)
+            queue.sort(key=lambda truck: (truck.departure_time is None, truck.departure_time or 0,
+                                          waiting.index(truck) if truck in waiting else 0))
+            for truck in queue:
+                if not free_times:
+                    driver_times[truck.truck_id] = float('inf')
+                    continue
+                driver_time = heapq.heappop(free_times)
+                if truck.departure_time is not None:
+                    driver_time = max(driver_time, truck.departure_time)
+                driver_times[truck.truck_id] = get_ready_time(truck, driver_time)
+                heapq.heappush(free_times, driver_times[truck.truck_id] +
+                               self._get_route_seconds(truck, truck.vertex, truck.stops))
+            return driver_times
+
+        def take_in(package_id, time):
+            truck = self._insert_package(package_id, address[package_id], time, bool(free_drivers),
+                                         get_driver_times(time))
+            if truck is not None:
+                package_truck[package_id] = truck.truck_id
+                if truck.return_time is not None:
+                    # Back at the hub, a free driver takes it out again
+                    truck.return_time = None
+                    truck.driver_id = None
+                    push(time, EVENT_DEPARTURE, truck.truck_id)
+            return truck
+
+        for truck in self.__trucks.values():
+            for vertex, package_ids in truck.stops:
+                for package_id in package_ids:
+                    package_truck[package_id] = truck.truck_id
+                    address[package_id] = vertex
+                    package_events[package_id] = []
+            if truck.departure_time is None:
+                waiting.append(truck)
+            else:
+                push(truck.departure_time, EVENT_DEPARTURE, truck.truck_id)
+        # Drivers no scheduled truck needs take the waiting trucks when the first scheduled truck leaves, the highest
+        # driver IDs first so the scheduled trucks keep drivers 1, 2, ...
+        departure_times = [truck.departure_time for truck in self.__trucks.values() if truck.departure_time is not None]
+        for _ in range(min(self.__driver_count - len(departure_times), len(waiting))):
+            truck = waiting.pop(0)
+            handoffs[truck.truck_id] = min(departure_times, default=0)
+            push(handoffs[truck.truck_id], EVENT_DRIVER_HANDOFF, truck.truck_id, free_drivers.pop(0))
+        for package_id, time in self.__available.items():
+            package_events.setdefault(package_id, [])
+            address.setdefault(package_id, None)
+            push(time, EVENT_PACKAGE_ARRIVAL, package_id=package_id, vertex=self.__hub)
+        for change in self.__changes:
+            package_events.setdefault(change.package_id, [])
+            address.setdefault(change.package_id, None)
+            push(change.time, EVENT_PACKAGE_CHANGE, package_truck.get(change.package_id),
+                 package_id=change.package_id, vertex=change.address, change=change)
+        for package_id, time in release.items():
+            if time is not None:
+                push(time, EVENT_ADDRESS_CORRECTED, package_truck.get(package_id), package_id=package_id)
+        for package_id, (time, package) in self.__intake.items():
+            package_events[package_id] = []
+            address[package_id] = package.address
+            push(time, EVENT_PACKAGE_INTAKE, package_id=package_id, vertex=package.address)
+
+        while heap:
+            time, _, _, event = heapq.heappop(heap)
+            kind = event.kind
+            truck = self.__trucks.get(event.truck_id)
+
+            if kind == EVENT_PACKAGE_ARRIVAL:
+                arrived[event.package_id] = True
+                log(event, (event.package_id,))
+
+            elif kind == EVENT_PACKAGE_CHANGE:
+                package_id = event.package_id
+                change = event.change
+                log(event, (package_id,))
+                if package_id in delivery or package_id in cancelled:
+                    continue  # The change comes too late
+                if change.address is not None:
+                    address[package_id] = change.address
+                if change.delivery_deadline is not None:
+                    self.__deadlines[package_id] = convert_12h_to_seconds(change.delivery_deadline)
+                if change.cancelled:
+                    cancelled.add(package_id)
+                if truck is None:
+                    continue
+                if change.cancelled:
+                    self._remove_package(truck, package_id)
+                    truck.held.discard(package_id)
+                    if truck.waiting and all(release[held_id] is None for held_id in truck.held):
+                        # No held package left to wait for
+                        truck.waiting = False
+                        next_leg(truck, time)
+                        continue
+                elif package_id in truck.held:
+                    continue  # Put back on the stops when its address is corrected
+                elif change.address is not None:
+                    self._move_package(truck, package_id, change.address)
+                else:
+                    continue  # A new deadline does not change the route
+                self._reoptimize_stops(truck)
+
+            elif kind == EVENT_ADDRESS_CORRECTED:
+                package_id = event.package_id
+                log(event._replace(vertex=address[package_id]), (package_id,))
+                if truck is None or package_id not in truck.held or package_id in cancelled:
+                    continue  # Not reached yet, it is delivered at its stop
+                truck.held.discard(package_id)
+                self._move_package(truck, package_id, address[package_id])
+                self._reoptimize_stops(truck)
+                if truck.waiting:
+                    truck.waiting = False
+                    next_leg(truck, time)
+
+            elif kind == EVENT_PACKAGE_INTAKE:
+                package_id = event.package_id
+                truck = take_in(package_id, time)
+                if truck is None:
+                    unplaced.append(package_id)
+                log(event._replace(truck_id=None if truck is None else truck.truck_id), (package_id,))
+
+            elif kind == EVENT_DEPARTURE:
+                if truck.driver_id is None:
+                    if not free_drivers:
+                        waiting.append(truck)
+                        continue
+                    truck.driver_id = free_drivers.pop()
+                    hand_over(time)
+                # Wait for the late packages of the load
+                load = [package_id for _, package_ids in truck.stops for package_id in package_ids]
+                pending = [self.__available[package_id] for package_id in load
+                           if package_id in self.__available and not arrived[package_id]]
+                if pending:
+                    push(max(pending), EVENT_DEPARTURE, truck.truck_id, truck.driver_id)
+                    continue
+                truck.departed = True
+                if truck.start_time is None:
+                    truck.start_time = time
+                for package_id in load:
+                    departure[package_id] = time
+                log(event._replace(driver_id=truck.driver_id, vertex=truck.vertex), load)
+                next_leg(truck, time)
+
+            elif kind == EVENT_ARRIVAL:
+                vertex, package_ids = truck.stops.pop(0)
+                # Packages with a wrong address stay on the truck until it is corrected
+                held = [package_id for package_id in package_ids if package_id in release
+                        and (release[package_id] is None or release[package_id] > time)]
+                truck.held.update(held)
+                package_ids = [package_id for package_id in package_ids if package_id not in truck.held]
+                truck.vertex = vertex
+                truck.visited.append((vertex, time))
+                truck.legs.append(truck.leg_miles)
+                truck.deliveries.append(tuple(package_ids))
+                log(event, package_ids)
+                for package_id in package_ids:
+                    push(time, EVENT_DELIVERY, truck.truck_id, truck.driver_id, package_id, vertex)
+                next_leg(truck, time)
+
+            elif kind == EVENT_DELIVERY:
+                delivery[event.package_id] = time
+                log(event, (event.package_id,))
+
+            elif kind == EVENT_HUB_RETURN:
+                truck.vertex = event.vertex
+                truck.hub_arrival = None
+                if truck.return_to_hub:
+                    # The drive back is a leg to the hub with no deliveries
+                    truck.visited.append((truck.vertex, time))
+                    truck.legs.append(truck.leg_miles)
+                    truck.deliveries.append(())
+                if truck.stops:
+                    # Packages taken on while driving back, the driver leaves again
+                    log(event)
+                    push(time, EVENT_DEPARTURE, truck.truck_id, truck.driver_id)
+                    continue
+                truck.return_time = time
+                log(event)
+                free_drivers.append(truck.driver_id)
+                hand_over(time)
+                # The new packages waiting at the hub are tried again
+                for package_id in list(unplaced):
+                    placed = take_in(package_id, time)
+                    if placed is not None:
+                        unplaced.remove(package_id)
+                        log(Event(time, EVENT_PACKAGE_INTAKE, placed.truck_id, package_id=package_id,
+                                  vertex=address[package_id]), (package_id,))
+
+            elif kind == EVENT_DRIVER_HANDOFF:
+                del handoffs[truck.truck_id]
+                truck.driver_id = event.driver_id
+                log(event)
+                push(time, EVENT_DEPARTURE, truck.truck_id, truck.driver_id)
+
+        packages = {}
+        for package_id, package_event_list in package_events.items():
+            available_time = self.__intake[package_id][0] if package_id in self.__intake \
+                else self.__available.get(package_id)
+            packages[package_id] = PackageTimeline(package_id, package_truck.get(package_id), address[package_id],
+                                                   available_time, departure.get(package_id),
+                                                   delivery.get(package_id), tuple(package_event_list),
+                                                   package_id in cancelled)
+        trucks = {truck_id: TruckTimeline(truck_id, truck.driver_id, truck.start_time, truck.return_time, truck.miles,
+                                          tuple(truck.visited), tuple(truck.legs), tuple(truck.deliveries),
+                                          truck.start_vertex)
+                  for truck_id, truck in self.__trucks.items()}
+        return SimulationResult(MappingProxyType(packages), MappingProxyType(trucks), tuple(events))
+
+    # Shortest paths over the truck's route, the same paths dijkstra restricted to the route takes
+    def _get_shortest_paths(self, truck, vertex):
+        """
+        Get the shortest paths between the vertices of a truck's route, adding a vertex to the route first.
+
+        Parameters:
+            truck (_TruckState): The truck.
+            vertex (str): A vertex the truck will visit.
+
+        Returns:
+            ShortestPaths: The shortest paths over the route.
+        """
+        if vertex not in truck.vertices:
+            truck.vertices[vertex] = None
+            truck.shortest_paths = None
+        if truck.shortest_paths is None:
+            truck.shortest_paths = self.__graph.get_shortest_paths(truck.vertices)
+        return truck.shortest_paths
+
+    # Driving time over a truck's route, back to the hub at the end if the truck returns there
+    def _get_route_seconds(self, truck, start, stops):
+        """
+        Get the time a truck takes to drive from a vertex through stops.
+
+        Parameters:
+            truck (_TruckState): The truck.
+            start (str): The vertex the truck starts from.
+            stops (list): [vertex, [package IDs]] of the stops in route order.
+
+        Returns:
+            int: The driving time in seconds.
+        """
+        distance = self._get_shortest_paths(truck, self.__hub).get_distance
+        route = [start] + [stop[0] for stop in stops] + ([self.__hub] if truck.return_to_hub else [])
+        return sum(travel_seconds(distance(before, after), truck.speed) for before, after in zip(route, route[1:]))
+
+    def _move_package(self, truck, package_id, new_address):
+        """
+        Move an undelivered package to its corrected address, at the cheapest position among the stops its truck has
+        not reached yet.
+
+        Parameters:
+            truck (_TruckState): The truck carrying the package.
+            package_id (int): The ID of the package.
+            new_address (str): The corrected address.
+
+        Returns:
+            None
+        """
+        self._remove_package(truck, package_id)
+        # The stop the truck is driving to stays, only later stops can change
+        first = 1 if truck.en_route else 0
+        for vertex, package_ids in truck.stops[first:]:
+            if vertex == new_address:
+                package_ids.append(package_id)
+                return
+        distance = self._get_shortest_paths(truck, new_address).get_distance
+        # Cost of visiting new_address between each pair of consecutive stops, or after the last one
+        route = [truck.vertex] + [stop[0] for stop in truck.stops]
+        best_index, best_cost = len(truck.stops), None
+        for index in range(first, len(route)):
+            before = route[index]
+            cost = distance(before, new_address)
+            if index + 1 < len(route):
+                after = route[index + 1]
+                cost += distance(new_address, after) - distance(before, after)
+            if best_cost is None or cost < best_cost:
+                best_index, best_cost = index, cost
+        truck.stops.insert(best_index, [new_address, [package_id]])
+
+    def _remove_package(self, truck, package_id):
+        """
+        Take an undelivered package off the stops of its truck, dropping a stop left without packages unless the
+        truck is driving to it.
+
+        Parameters:
+            truck (_TruckState): The truck carrying the package.
+            package_id (int): The ID of the package.
+
+        Returns:
+            None
+        """
+        first = 1 if truck.en_route else 0
+        for index, (_, package_ids) in enumerate(truck.stops):
+            if package_id in package_ids:
+                package_ids.remove(package_id)
+                if not package_ids and index >= first:
+                    del truck.stops[index]
+                break
+
+    # Re-optimize the stops a truck has not reached with 2-opt, warm-started from their current order
+    # The path starts where the truck is, or at the stop it is driving to, and may end at any stop: a dummy last stop
+    # at distance 0 from every stop stays in place as 2-opt's fixed end
+    def _reoptimize_stops(self, truck):
+        """
+        Re-optimize the order of the stops a truck has not reached yet.
+
+        Parameters:
+            truck (_TruckState): The truck.
+
+        Returns:
+            None
+        """
+        first = 1 if truck.en_route else 0
+        start = truck.stops[0][0] if truck.en_route else truck.vertex
+        remaining = truck.stops[first:]
+        if len(remaining) < 2:
+            return
+        shortest_paths = self._get_shortest_paths(truck, start)
+        positions = [shortest_paths.get_position(vertex) for vertex in [start] + [stop[0] for stop in remaining]]
+        weights = np.zeros((len(positions) + 1, len(positions) + 1))
+        weights[:-1, :-1] = shortest_paths.distances[np.ix_(positions, positions)]
+        order = two_opt_delta(weights)
+        truck.stops[first:] = [remaining[position - 1] for position in order[1:-1]]
+
+    # Cheapest feasible insertion of a new package over the trucks that can still take it
+    # Arrival times at a truck's stops are computed forward once and the slack, how much later the stops from each one
+    # on can be reached without a late delivery, backward once, then each position is checked in O(1)
+    def _insert_package(self, package_id, vertex, time, driver_free=False, driver_times=None):
+        """
+        Put a new package on the truck and position that add the fewest miles without making a delivery late.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            vertex (str): The address of the package.
+            time (int): Seconds since midnight the package reaches the hub.
+            driver_free (bool): Whether a driver is free to take a truck back at the hub out again.
+            driver_times (dict, optional): Truck ID -> the earliest time a driver can take the truck, for the trucks
+            not departed yet. Default to their departure time, or the time the package reaches the hub.
+
+        Returns:
+            _TruckState: The truck the package was put on, or None if no truck can take it.
+        """
+        deadline = self.__deadlines.get(package_id, float('inf'))
+        best = None  # (added miles, truck, position, merge)
+        for truck in self.__trucks.values():
+            at_hub = truck.return_time is not None and truck.vertex == self.__hub and driver_free
+            if truck.departed and truck.hub_arrival is None and not at_hub:
+                continue  # Out on its route, or done away from the hub
+            if sum(len(package_ids) for _, package_ids in truck.stops) >= truck.capacity:
+                continue
+            if at_hub:
+                start, start_time = self.__hub, time
+            elif truck.departed:
+                # Driving back, the packages go out on a new trip from the hub
+                start, start_time = self.__hub, truck.hub_arrival
+            else:
+                start = truck.vertex
+                # Earliest the truck can leave, once a driver can take it and the late packages of its load are in
+                if driver_times is not None:
+                    driver_time = driver_times[truck.truck_id]
+                elif truck.departure_time is not None:
+                    driver_time = truck.departure_time
+                else:
+                    driver_time = time
+                if driver_time == float('inf'):
+                    continue  # No driver will take it
+                start_time = max(time, driver_time,
+                                 *(self.__available.get(load_id, 0)
+                                   for _, load_ids in truck.stops for load_id in load_ids))
+            self._get_shortest_paths(truck, self.__hub)
+            distance = self._get_shortest_paths(truck, vertex).get_distance
+            stops = [(stop_vertex, min(self.__deadlines.get(load_id, float('inf')) for load_id in load_ids))
+                     for stop_vertex, load_ids in truck.stops]
+            route = InsertionRoute(start, start_time, distance, truck.speed,
+                                   self.__hub if truck.return_to_hub else None, stops)
+            candidate = route.find_insertion(vertex, deadline)
+            if candidate is not None and (best is None or candidate[0] < best[0]):
+                best = (candidate[0], truck, candidate[1], candidate[2])
+        if best is None:
+            return None
+        _, truck, position, merge = best
+        if merge:
+            truck.stops[position][1].append(package_id)
+        else:
+            truck.stops.insert(position, [vertex, [package_id]])
+        return truck
@@ -0,0 +1,246 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+import numpy as np
+
+from package_delivery.delivery.leg_table import make_timeline_leg_table
+from package_delivery.timeutil.time_util import SECONDS_PER_MINUTE
+
+# Index of package statuses over a simulated day
+# Built once from a SimulationResult, every query is a bisect over sorted times instead of a scan over all packages.
+# Times are whole minutes since midnight, the minute the status output shows, so a package delivered at 9:51:40 is
+# DELIVERED at 9:51 like in TimeTracker.get_filtered_packages_by_time_range
+# A package cancelled before delivery is CANCELLED from the minute of its cancellation. For the counts its departure is
+# moved up to the cancellation if it had not left yet and the cancellation ends it like a delivery
+
+# Statuses of a package, in the order a package goes through them
+STATUS_AT_HUB = 'AT_HUB'
+STATUS_IN_TRANSIT = 'IN_TRANSIT'
+STATUS_DELIVERED = 'DELIVERED'
+STATUS_CANCELLED = 'CANCELLED'
+STATUSES = (STATUS_AT_HUB, STATUS_IN_TRANSIT, STATUS_DELIVERED, STATUS_CANCELLED)
+
+# Time of an event that never happens, later than any query
+NEVER = 48 * 60
+
+# Status of every package at one time: the time in minutes, the package IDs and truck IDs (0 for no truck), the status
+# of each package as an index into STATUSES, status -> count, and truck ID -> status -> count
+StatusSnapshot = namedtuple('StatusSnapshot', ['minutes', 'package_ids', 'truck_ids', 'statuses', 'counts',
+                                               'truck_counts'])
+
+
+class StatusIndex:
+    """
+    Class to answer package status queries over a simulated day.
+
+    Attributes:
+        __package_ids (list): The package IDs, sorted.
+        __times (list): (departure, end) minutes of every package, in the order of __package_ids, the end is its
+            delivery or cancellation.
+        __cancellations (list): The cancellation minutes of every package, in the order of __package_ids.
+        __departures (list): The departure minutes of every package, sorted.
+        __ends (list): The end minutes of every package, sorted.
+        __cancelled (list): The cancellation minutes of every package, sorted.
+        __deliveries (list): The delivery minutes of every package, sorted.
+        __delivery_order (list): The package IDs in the order of __deliveries.
+        __result (SimulationResult): The simulated day the index was built from.
+        __id_array (numpy.ndarray): The package IDs, sorted.
+        __truck_array (numpy.ndarray): The truck ID of every package, in the order of __id_array.
+        __departure_array (numpy.ndarray): The departure minutes of every package, in the order of __id_array.
+        __end_array (numpy.ndarray): The end minutes of every package, in the order of __id_array.
+        __cancel_array (numpy.ndarray): The cancellation minutes of every package, in the order of __id_array.
+        __truck_ids (list): The IDs of the trucks carrying packages, sorted.
+        __truck_positions (numpy.ndarray): The position in __truck_ids of every package's truck.
+        __leg_tables (dict): Truck ID -> LegTable of the truck's legs.
+    """
+
+    def __init__(self, simulation_result):
+        """
+        Build the index from a simulated day.
+
+        Parameters:
+            simulation_result (SimulationResult): The result of DeliverySimulator.run.
+        """
+        self.__result = simulation_result
+        self.__package_ids = sorted(simulation_result.packages)
+        self.__times = []
+        self.__cancellations = []
+        deliveries = []
+        for package_id in self.__package_ids:
+            timeline = simulation_result.packages[package_id]
+            departure = NEVER if timeline.departure_time is None else timeline.departure_time // SECONDS_PER_MINUTE
+            delivery = NEVER if timeline.delivery_time is None else timeline.delivery_time // SECONDS_PER_MINUTE
+            cancellation = _get_cancellation(timeline)
+            deliveries.append(delivery)
+            self.__times.append((min(departure, cancellation), min(delivery, cancellation)))
+            self.__cancellations.append(cancellation)
+        self.__departures = sorted(departure for departure, _ in self.__times)
+        self.__ends = sorted(end for _, end in self.__times)
+        self.__cancelled = sorted(self.__cancellations)
+        by_delivery = sorted(zip(deliveries, self.__package_ids))
+        self.__deliveries = [delivery for delivery, _ in by_delivery]
+        self.__delivery_order = [package_id for _, package_id in by_delivery]
+        # Columns of the same times for snapshots of every package at once
+        self.__id_array = np.array(self.__package_ids, dtype=np.int64)
+        self.__truck_array = np.array([simulation_result.packages[package_id].truck_id or 0
+                                       for package_id in self.__package_ids], dtype=np.int64)
+        times = np.array(self.__times, dtype=np.int64).reshape(-1, 2)
+        self.__departure_array = times[:, 0]
+        self.__end_array = times[:, 1]
+        self.__cancel_array = np.array(self.__cancellations, dtype=np.int64)
+        truck_ids, self.__truck_positions = np.unique(self.__truck_array, return_inverse=True)
+        self.__truck_ids = truck_ids.tolist()
+        self.__leg_tables = {truck_id: make_timeline_leg_table(timeline)
+                             for truck_id, timeline in simulation_result.trucks.items()}
+
+    def __len__(self):
+        """
+        Returns the number of packages in the index.
+        """
+        return len(self.__package_ids)
+
+    def __contains__(self, package_id):
+        """
+        Returns True if the package is in the index.
+        """
+        position = bisect_left(self.__package_ids, package_id)
+        return position < len(self.__package_ids) and self.__package_ids[position] == package_id
+
+    @property
+    def get_simulation_result(self):
+        """
+        Get the simulated day the index was built from.
+
+        Returns:
+            SimulationResult: The simulated day.
+        """
+        return self.__result
+
+    def get_timeline(self, package_id):
+        """
+        Get the timeline of a package.
+
+        Parameters:
+            package_id (int): The ID of the package.
+
+        Returns:
+            PackageTimeline: The timeline, or None if the package is not in the index.
+        """
+        return self.__result.packages.get(package_id)
+
+    def get_truck_timeline(self, truck_id):
+        """
+        Get the timeline of a truck.
+
+        Parameters:
+            truck_id (int): The ID of the truck.
+
+        Returns:
+            TruckTimeline: The timeline, or None if the truck is not in the index.
+        """
+        return self.__result.trucks.get(truck_id)
+
+    def get_leg_table(self, truck_id):
+        """
+        Get the cumulative leg table of a truck, for its position, miles and fuel at any time.
+
+        Parameters:
+            truck_id (int): The ID of the truck.
+
+        Returns:
+            LegTable: The table, or None if the truck is not in the index.
+        """
+        return self.__leg_tables.get(truck_id)
+
+    def get_status(self, package_id, minutes):
+        """
+        Get the status of a package at a time.
+
+        Parameters:
+            package_id (int): The ID of the package.
+            minutes (int): The time in minutes since midnight.
+
+        Returns:
+            str: STATUS_AT_HUB, STATUS_IN_TRANSIT, STATUS_DELIVERED or STATUS_CANCELLED, or None if the package is not
+            in the index.
+        """
+        position = bisect_left(self.__package_ids, package_id)
+        if position == len(self.__package_ids) or self.__package_ids[position] != package_id:
+            return None
+        if self.__cancellations[position] <= minutes:
+            return STATUS_CANCELLED
+        # Number of the package's (departure, delivery) times at or before the query time is its status
+        return STATUSES[bisect_right(self.__times[position], minutes)]
+
+    def get_delivered_between(self, start_minutes, end_minutes):
+        """
+        Get the packages delivered in a time range.
+
+        Parameters:
+            start_minutes (int): The start of the range in minutes since midnight, inclusive.
+            end_minutes (int): The end of the range in minutes since midnight, inclusive.
+
+        Returns:
+            list: The IDs of the packages delivered in the range, in delivery order.
+        """
+        start = bisect_left(self.__deliveries, start_minutes)
+        end = bisect_right(self.__deliveries, end_minutes)
+        return self.__delivery_order[start:end]
+
+    def get_status_counts(self, minutes):
+        """
+        Get the number of packages in each status at a time.
+
+        Parameters:
+            minutes (int): The time in minutes since midnight.
+
+        Returns:
+            dict: Status -> number of packages, for every status.
+        """
+        departed = bisect_right(self.__departures, minutes)
+        ended = bisect_right(self.__ends, minutes)
+        cancelled = bisect_right(self.__cancelled, minutes)
+        return {
+            STATUS_AT_HUB: len(self.__package_ids) - departed,
+            STATUS_IN_TRANSIT: departed - ended,
+            STATUS_DELIVERED: ended - cancelled,
+            STATUS_CANCELLED: cancelled
+        }
+
+    # Status of every package at once: the number of a package's (departure, end, cancellation) times at or before the
+    # query time is its status, counted per truck with one bincount
+    def get_snapshot(self, minutes):
+        """
+        Get the status of every package at a time.
+
+        Parameters:
+            minutes (int): The time in minutes since midnight.
+
+        Returns:
+            StatusSnapshot: The statuses and the counts per status and per truck.
+        """
+        statuses = ((self.__departure_array <= minutes).astype(np.int8) + (self.__end_array <= minutes)
+                    + (self.__cancel_array <= minutes))
+        status_count = len(STATUSES)
+        counts = np.bincount(self.__truck_positions * status_count + statuses,
+                             minlength=len(self.__truck_ids) * status_count).reshape(-1, status_count)
+        truck_counts = {truck_id: dict(zip(STATUSES, row)) for truck_id, row in zip(self.__truck_ids, counts.tolist())}
+        return StatusSnapshot(minutes, self.__id_array, self.__truck_array, statuses,
+                              dict(zip(STATUSES, counts.sum(axis=0).tolist())), truck_counts)
+
+
+# Minute a package was cancelled, from the cancelling change of its timeline
+def _get_cancellation(timeline):
+    """
+    Get the time a package was cancelled.
+
+    Parameters:
+        timeline (PackageTimeline): The timeline of the package.
+
+    Returns:
+        int: The minutes since midnight, NEVER if the package was not cancelled before delivery.
+    """
+    if not timeline.cancelled:
+        return NEVER
+    return min(event.time for event in timeline.events if event.change is not None and event.change.cancelled) \
+        // SECONDS_PER_MINUTE
@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+import sys
+from collections import namedtuple
+
+from package_delivery.timeutil.time_util import seconds_24hr_str
+
+# Status of one package at a time, the record every status API returns
+# delivery_deadline and time_delivered are seconds since midnight (time_delivered is None until delivered), they are
+# only formatted by the report functions below
+PackageStatus = namedtuple('PackageStatus', ['package_id', 'address', 'city', 'state', 'zipcode', 'mass',
+                                             'special_notes', 'status', 'delivery_deadline', 'time_delivered',
+                                             'truck'])
+
+# Formats of a status report
+# FORMAT_TEXT is one 'Package ID: 1 | Address: ... | ' line per package, FORMAT_COMPACT the same fields separated by
+# commas, FORMAT_CSV a header row and one row per package, FORMAT_JSON a list of objects
+FORMAT_TEXT = 'text'
+FORMAT_COMPACT = 'compact'
+FORMAT_CSV = 'csv'
+FORMAT_JSON = 'json'
+
+# Labels of the fields in FORMAT_TEXT and FORMAT_COMPACT
+_LABELS = ('Package ID', 'Address', 'City', 'State', 'Zipcode', 'Mass', 'Special Notes', 'Status',
+           'Delivery Deadline', 'Time Delivered', 'Truck')
+
+
+# Fields of a record as they are shown, times as 'HH:MM'
+def _get_fields(record):
+    """
+    Get the fields of a status record with its times formatted.
+
+    Parameters:
+        record (PackageStatus): The status record.
+
+    Returns:
+        tuple: The fields in PackageStatus order.
+    """
+    return record._replace(delivery_deadline=seconds_24hr_str(record.delivery_deadline),
+                           time_delivered=seconds_24hr_str(record.time_delivered))
+
+
+def format_text(records, separator=' | ', trailing=' | '):
+    """
+    Format status records as labeled lines.
+
+    Parameters:
+        records (iterable): The PackageStatus records.
+        separator (str): The text between fields.
+        trailing (str): The text after the last field.
+
+    Returns:
+        str: One line per record.
+    """
+    lines = []
+    for record in records:
+        lines.append(separator.join(f"{label}: {field}" for label, field in zip(_LABELS, _get_fields(record))) +
+                     trailing + '\n')
+    return ''.join(lines)
+
+
+def format_csv(records):
+    """
+    Format status records as CSV with a header row.
+
+    Parameters:
+        records (iterable): The PackageStatus records.
+
+    Returns:
+        str: The CSV text.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(PackageStatus._fields)
+    writer.writerows(_get_fields(record) for record in records)
+    return buffer.getvalue()
+
+
+def format_json(records):
+    """
+    Format status records as a JSON list of objects.
+
+    Parameters:
+        records (iterable): The PackageStatus records.
+
+    Returns:
+        str: The JSON text.
+    """
+    return json.dumps([_get_fields(record)._asdict() for record in records], indent=2) + '\n'
+
+
+def format_report(records, report_format=FORMAT_TEXT):
+    """
+    Format status records.
+
+    Parameters:
+        records (iterable): The PackageStatus records.
+        report_format (str): FORMAT_TEXT, FORMAT_COMPACT, FORMAT_CSV or FORMAT_JSON.
+
+    Returns:
+        str: The formatted report.
+
+    Raises:
+        ValueError: If the report format is unknown.
+    """
+    if report_format == FORMAT_TEXT:
+        return format_text(records)
+    if report_format == FORMAT_COMPACT:
+        return format_text(records, ', ', '')
+    if report_format == FORMAT_CSV:
+        return format_csv(records)
+    if report_format == FORMAT_JSON:
+        return format_json(records)
+    raise ValueError(f"Unknown report format: {report_format}")
+
+
+# Write a whole report with one write call instead of one print per package
+def write_report(records, report_format=FORMAT_TEXT, stream=None):
+    """
+    Format status records and write them with a single write.
+
+    Parameters:
+        records (iterable): The PackageStatus records.
+        report_format (str): FORMAT_TEXT, FORMAT_COMPACT, FORMAT_CSV or FORMAT_JSON.
+        stream (file, optional): Where to write the report. Default to standard output.
+
+    Returns:
+        None
+    """
+    (stream or sys.stdout).write(format_report(records, report_format))
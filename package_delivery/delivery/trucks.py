@@ -1,13 +1,29 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from package_delivery import algorithms as algo
 from package_delivery import datastructures as ds
+from package_delivery.datastructures.package_constraints import make_truck_rules
+from package_delivery.delivery.logistics.fleet import load_fleet
 from package_delivery.delivery.logistics.fuel_tracker import FuelTracker
+from package_delivery.delivery.logistics.route_plan_cache import RoutePlan, RoutePlanCache
+from package_delivery.delivery.logistics.route_walk import walk_route
+from package_delivery.delivery.logistics.package_changes import PackageChange, PackageChangeLog
 from package_delivery.delivery.logistics.time_tracker import TimeTracker
+from package_delivery.delivery.leg_table import make_walk_leg_table
+from package_delivery.delivery.monte_carlo import make_plan, run_monte_carlo
+from package_delivery.delivery.simulation import TRUCK_CAPACITY, TRUCK_SPEED, DeliverySimulator
+from package_delivery.delivery.status_index import StatusIndex
+from package_delivery.delivery.status_report import FORMAT_COMPACT, FORMAT_TEXT, PackageStatus, write_report
 from package_delivery.loadutil import load_util as util
+from package_delivery.timeutil.time_util import SECONDS_PER_HOUR, SECONDS_PER_MINUTE, convert_12h_to_minutes, \
+    convert_12h_to_seconds
 from package_delivery.visualization.visualize import Visualize
 
 # Each truck can carry a maximum of 16 packages
 #
-# Three trucks(Truck 1, 2, 3), two drivers available for delivery,
+# Three trucks(Truck 1, 2, 3), two drivers available for delivery, as defined in logistics/fleet.json,
 # each driver stays with the same truck until all packages delivered
 #
 # Drivers leave hub no later than 8:00am with truck loaded, can return to hub to get packages
@@ -21,10 +37,39 @@ from package_delivery.visualization.visualize import Visualize
 # Packages will be loaded manually, for some not in required constraints to decrease total distance traveled
 
 
+# Route solvers deliver_packages can use, 2-opt heuristic or exact Held-Karp for routes of up to
+# algo.MAX_EXACT_STOPS unique stops (larger routes fall back to 2-opt), or deadline-aware cheapest insertion
+ROUTE_SOLVER_TWO_OPT = 'two_opt'
+ROUTE_SOLVER_EXACT = 'exact'
+ROUTE_SOLVER_INSERTION = 'insertion'
+
+# Loaders load_trucks can use, nearest neighbor filling one truck at a time, Clarke-Wright savings routes or
+# clusters swept around the hub and routed one by one
+LOADER_NEAREST_NEIGHBOR = 'nearest_neighbor'
+LOADER_SAVINGS = 'savings'
+LOADER_CLUSTER = 'cluster'
+
+# Last second of the day, the package store is left with every change of the day applied
+END_OF_DAY = 24 * SECONDS_PER_HOUR - 1
+
+# Changes to packages received during the day, applied to the package store in place
+# Package #9's address is corrected at 10:20 AM, more changes are posted with post_package_change
+package_changes = PackageChangeLog(ds.package_hashmap)
+package_changes.add(PackageChange(9, convert_12h_to_seconds('10:20 AM'), address='410 S State St',
+                                  city='Salt Lake City', state='UT', zipcode='84111',
+                                  special_notes='Address updated from 300 State St to 410 S State St at 10:20 AM'))
+
+# New packages received during the day, package ID -> seconds since midnight the package reaches the hub
+# The simulator puts each one on a truck when it arrives, see receive_package
+received_packages = {}
+
 # Initialize an empty list to track left_over packages across trucks not loaded after
 # initially loading packages with specific constraints and delivery_deadline functions
 left_over1 = []
 
+# Status index of the simulated day, built by the first status query and reused by the next ones
+day_status = None
+
 
 class Trucks:
     """
@@ -32,21 +77,32 @@ class Trucks:
 
     Attributes:
         packages (list): A list of packages.
-        filtered_packages (list): A list of packages that have been filtered by time.
+        filtered_packages (list): PackageStatus records of the packages at the last time asked for.
         route (list): A list of vertices representing the route from finding the shortest path.
         distances (list): A list of distances calculated from finding the shortest path.
         pred_vertex (list): A list of predecessor vertices from finding the shortest path.
         time_tracker (TimeTracker): A TimeTracker object to track status of packages.
         visualize (Visualize): A Visualize object to visualize delivery.
         fuel_tracker (FuelTracker): A FuelTracker object to track fuel consumption during delivery.
+        route_plans (RoutePlanCache): A RoutePlanCache object holding the optimized routes of earlier deliveries.
+        route_walk (RouteWalk): The stops, leg distances and arrival times of the last delivery, None before one.
+        capacity (int): The number of packages the truck can carry.
         __truck_id (int): The ID of the truck.
         __truck_name (str): The name of the truck.
     """
 
     # All the necessary attributes to represent a truck
-    def __init__(self, truck_id, truck_name):
+    def __init__(self, truck_id, truck_name, capacity=TRUCK_CAPACITY, start_time=None, speed=TRUCK_SPEED):
         """
         Initialize the truck object
+
+        Parameters:
+            truck_id (int): The ID of the truck.
+            truck_name (str): The name of the truck.
+            capacity (int): The number of packages the truck can carry.
+            start_time (int): The time the truck starts in seconds since midnight, None to start when another truck
+            is back.
+            speed (float): The speed of the truck in miles per minute.
         """
         self.packages = []
         self.filtered_packages = []
@@ -58,13 +114,19 @@ class Trucks:
         self.__truck_name = truck_name
         # Composite class relationship, Trucks object 'has a' TimeTracker object relationship to track the status of
         # packages
-        self.time_tracker = TimeTracker(self.__truck_id)
+        self.time_tracker = TimeTracker(self.__truck_id, start_time, speed)
         # Composite class relationship, Trucks object 'has a' Visualize object relationship to visualize a delivery
         # Modified singleton design pattern to manage the visual state of each truck
         self.visualize = Visualize(self.__truck_id)
         # Composite class relationship, Trucks object 'has a' FuelTracker object relationship to track a fuel
         # Singleton design pattern to manage the data state of each truck
         self.fuel_tracker = FuelTracker(self.__truck_id)
+        # Composite class relationship, Trucks object 'has a' RoutePlanCache object so repeated deliveries of the same
+        # load reuse the optimized route
+        self.route_plans = RoutePlanCache()
+        self.capacity = capacity
+        # Stops, leg distances and arrival times of the last delivery walk
+        self.route_walk = None
 
     @property
     def truck_id(self):
@@ -100,6 +162,7 @@ class Trucks:
         """
         self.packages.append(package)
         self.route.append(package.address)
+        self.route_plans.invalidate()
 
     def insert_filtered_packages(self, packages):
         """
@@ -131,6 +194,7 @@ class Trucks:
         """
         self.packages.remove(package)
         self.route.remove(package.address)
+        self.route_plans.invalidate()
 
     def insert_distances_pred_vertex(self, distance, pred_vertex):
         """
@@ -178,12 +242,14 @@ class Trucks:
         for package in self.packages:
             print(package)
 
-    def print_filtered_packages(self):
+    def print_filtered_packages(self, report_format=FORMAT_TEXT):
         """
         Print the filtered packages in the `self.filtered_packages` list during delivery.
+
+        Parameters:
+            report_format (str): The format of the report, see status_report.
         """
-        for package in self.filtered_packages:
-            print(package)
+        write_report(self.filtered_packages, report_format)
 
     def get_filtered_packages(self):
         """
@@ -217,42 +283,75 @@ class Trucks:
         return len(self.packages)
 
 
+# One Trucks object per truck of the fleet, in truck ID order
+def make_trucks(fleet):
+    """
+    Create the trucks of a fleet.
+
+    Parameters:
+        fleet (Fleet): The fleet, see logistics.fleet.load_fleet.
+
+    Returns:
+        list: The Trucks objects.
+    """
+    return [Trucks(spec.truck_id, spec.truck_name, spec.capacity, spec.start_time, spec.speed)
+            for spec in fleet.trucks]
+
+
 # Forty packages, 9 + 16 + 15 respectively? for trucks, maximum number of packages to load
 # Start hub = '4001 South 700 East', load all trucks at hub
 # priority_queue to pop off packages on trucks until empty?
 # Once the first truck is empty driver returns to the hub to get the next truck for deliveries
-def load_trucks(truck_high_priority, truck_medium_priority, truck_low_priority, graph, track_package_id):
+def load_trucks(trucks, graph, track_package_id, loader=LOADER_NEAREST_NEIGHBOR):
     """
     Load trucks with packages using the nearest neighbor algorithm.
 
     Parameters:
-        truck_high_priority (Truck): The high-priority truck to load packages onto.
-        truck_medium_priority (Truck): The medium-priority truck to load packages onto.
-        truck_low_priority (Truck): The low-priority truck to load packages onto.
+        trucks (list): The trucks to load packages onto, in the order of logistics/fleet.json.
         graph (Graph): The graph representing the delivery network.
         track_package_id (int): The ID of the package to track.
+        loader (str): LOADER_NEAREST_NEIGHBOR, LOADER_SAVINGS or LOADER_CLUSTER, how the packages are put on the
+            trucks.
+
+    Raises:
+        ValueError: If the loader is unknown.
 
     Returns:
         None
     """
+    # Packages are loaded as they are at the start of the day, a simulated day leaves its changes in the store
+    package_changes.set_time(0)
+    # The trucks' constrained loading passes follow the times they leave, see make_truck_rules
+    constraints = graph.get_package_store.index.constraints
+    constraints.set_truck_rules(make_truck_rules({truck.truck_id: truck.time_tracker.get_start_time()
+                                                  for truck in trucks}))
 
     # Load packages onto trucks using the nearest neighbor algorithm
-    trucks = [truck_high_priority, truck_medium_priority, truck_low_priority]
-    algo.load_packages_nearest_neighbor(trucks, graph, track_package_id)
+    if loader == LOADER_NEAREST_NEIGHBOR:
+        algo.load_packages_nearest_neighbor(trucks, graph, track_package_id)
+    elif loader == LOADER_SAVINGS:
+        # Capacitated routes from the savings of joining stops, up to each truck's capacity
+        algo.load_packages_savings(trucks, graph, track_package_id)
+    elif loader == LOADER_CLUSTER:
+        # Stops swept around the hub on the map into truck loads, each load routed on its own
+        algo.load_packages_cluster(trucks, graph, track_package_id, trucks[0].visualize.get_all_coordinates)
+    else:
+        raise ValueError(f"Unknown loader: {loader}")
 
     # After loading packages to satisfy constraints,
-    # Combine the left-over packages from all three priority levels
-    left_over1.append(util.get_left_over_packages(ds.graph_access, util.track_package_id1))
+    # Combine the left-over packages of every truck
+    left_over1.append(util.get_left_over_packages(graph, track_package_id))
     # Load left-over packages onto non-full trucks
-    util.load_left_over_packages(high_priority, left_over1, util.track_package_id1)
-    util.load_left_over_packages(medium_priority, left_over1, util.track_package_id1)
-    util.load_left_over_packages(low_priority, left_over1, util.track_package_id1)
+    for truck in trucks:
+        util.load_left_over_packages(truck, left_over1, track_package_id, constraints)
     for truck in trucks:
         truck.visualize.populate_address(truck.truck_id, truck.route)
 
 
 # Calculate the shortest route to deliver packages to destination
 # and back to hub after applying Dijkstra's algorithm
+# The route is walked once stop by stop: packages sharing a stop are delivered in one step and every package is
+# stamped with the last arrival at its address, the same as updating the other packages at the address on each visit
 def _find_shortest_route_to_deliver(truck, graph):
     """
     Find the shortest route for a truck to deliver packages.
@@ -264,46 +363,170 @@ def _find_shortest_route_to_deliver(truck, graph):
     Returns:
         int: The total distance traveled by the truck to deliver all the packages.
     """
-    # Make a copy of the packages on the truck
-    packages_copy = truck.get_packages().copy()
+    time_tracker = truck.time_tracker
+    # Shortest paths between the stops of the truck's route, the same paths dijkstra finds restricted to the route,
+    # computed once for the route instead of once per package
+    shortest_paths = graph.get_shortest_paths(truck.route)
     # Starting location for all trucks, i.e., the hub
-    start_vertex1 = truck.route[0]
-    # Initialize total_distance traveled by truck to 0
-    total_distance = 0
-
-    # Use a for loop to iterate over the packages
-    for package in packages_copy:
-        # Vertex to travel to
-        dest_vertex = package.address
-
-        # Calculate the shortest distances and pred_vertex using Dijkstra's algorithm of the truck's route
-        distances1, pred_vertex1 = algo.dijkstra(graph, start_vertex1, truck.route)
-
-        # Insert the calculated distances and pred_vertex into the Trucks object
-        truck.insert_distances_pred_vertex(distances1[dest_vertex], pred_vertex1[dest_vertex])
-        # Update time during delivery
-        time_delivered = truck.time_tracker.update_current_truck_time(distances1[dest_vertex])
-        # Insert the time_delivered into package
-        truck.time_tracker.insert_current_truck_time_to_package(package, time_delivered)
-        # Update the time for other packages with the same address
-        for other_package, status_info in truck.time_tracker.get_package_status.items():
-            if (other_package != package and other_package.address == package.address and status_info['status'] !=
-                    'DELIVERED'):
-                truck.time_tracker.insert_current_truck_time_to_package(other_package, time_delivered)
-        # Skip adding the distance if the next package is already at the dest_vertex, share addresses
-        if distances1[dest_vertex] != 0:
-            total = distances1[dest_vertex]
-            total_distance += total
-
-        # Set the current location to the destination of the current package
-        start_vertex1 = dest_vertex
-
-    return total_distance
+    walk = walk_route(truck.get_packages(), truck.route[0], time_tracker.get_current_truck_time(), shortest_paths,
+                      time_tracker.get_truck_speed)
+    truck.route_walk = walk
+
+    # One distance and pred_vertex per package, packages after the first at a stop travel 0 miles
+    previous_vertex = walk.start_vertex
+    for vertex, packages, distance in zip(walk.stops, walk.stop_packages, walk.leg_distances.tolist()):
+        truck.insert_distances_pred_vertex(distance, shortest_paths.get_predecessor(previous_vertex, vertex))
+        for _ in packages[1:]:
+            truck.insert_distances_pred_vertex(0.0, None)
+        previous_vertex = vertex
+    if walk.stops:
+        time_tracker.track_truck_current_time[truck.truck_id] = int(walk.arrival_times[-1])
+
+    # Deliver every package at the last arrival at its address
+    last_arrival = dict(zip(walk.stops, walk.arrival_times.tolist()))
+    for package in time_tracker.get_package_status:
+        if package.address in last_arrival:
+            time_tracker.insert_current_truck_time_to_package(package, last_arrival[package.address])
+    return sum(walk.leg_distances.tolist())
+
+
+# Optimize the order of a truck's stops with the selected route solver
+def _optimize_route(truck, graph, route_solver):
+    """
+    Optimize the route of a truck.
+
+    Parameters:
+        truck (Truck): The truck to optimize.
+        graph (Graph): The graph object representing the delivery network.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION.
+
+    Raises:
+        ValueError: If the route solver is unknown.
+
+    Returns:
+        None
+    """
+    if route_solver == ROUTE_SOLVER_TWO_OPT:
+        algo.two_opt_route(truck, graph)
+    elif route_solver == ROUTE_SOLVER_EXACT:
+        # Exact for small routes, 2-opt above algo.MAX_EXACT_STOPS unique stops
+        algo.held_karp_route(truck, graph)
+    elif route_solver == ROUTE_SOLVER_INSERTION:
+        # Stops inserted earliest deadline first where they keep every delivery on time
+        algo.insertion_route(truck, graph)
+    else:
+        raise ValueError(f"Unknown route solver: {route_solver}")
+
+
+# Optimize the routes of many trucks, the 2-opt and exact orders only depend on each truck's distance matrix and are
+# solved in a process pool, insertion reads the package store and runs in this process
+def optimize_routes(trucks, graph, route_solver, workers=1):
+    """
+    Optimize the routes of trucks.
+
+    Parameters:
+        trucks (list): The trucks to optimize.
+        graph (Graph): The graph object representing the delivery network.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION.
+        workers (int, optional): The number of worker processes, 1 to optimize in this process, None for the number
+            of CPUs.
+
+    Raises:
+        ValueError: If the route solver is unknown.
+
+    Returns:
+        None
+    """
+    workers = min(workers or os.cpu_count() or 1, len(trucks)) if trucks else 1
+    if workers == 1 or route_solver not in (ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT):
+        for truck in trucks:
+            _optimize_route(truck, graph, route_solver)
+        return
+    route_stops = [algo.get_route_stops(truck, graph) for truck in trucks]
+    exact = [route_solver == ROUTE_SOLVER_EXACT] * len(trucks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        orders = list(executor.map(algo.get_route_order, [weights for _, weights in route_stops], exact))
+    for truck, (unique_route, _), order in zip(trucks, route_stops, orders):
+        algo.apply_route(truck, [unique_route[position] for position in order])
+
+
+# Optimize the route and deliver the packages of a truck, or replay the cached plan of the same load and start time
+def _plan_route(truck, graph, route_solver):
+    """
+    Optimize the route of a truck and deliver its packages, reusing a cached plan when the load has not changed.
+
+    Parameters:
+        truck (Truck): The truck to deliver with, its time and distances already reset.
+        graph (Graph): The graph object representing the delivery network.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION.
+
+    Returns:
+        float: The total distance traveled by the truck to deliver all the packages.
+    """
+    time_tracker = truck.time_tracker
+    key = truck.route_plans.get_key(truck, route_solver)
+    plan = truck.route_plans.get(key)
+    if plan is None:
+        # Legs are appended to distances and pred_vertex, keep only the ones of this delivery
+        distance_count, pred_vertex_count = len(truck.distances), len(truck.pred_vertex)
+        start_time = time_tracker.get_current_truck_time()
+        _optimize_route(truck, graph, route_solver)
+        total_distance = _find_shortest_route_to_deliver(truck, graph)
+        late_count = _get_late_count(truck)
+        # 2-opt and the exact solver only shorten the route, a route delivering late drives the deadline-aware
+        # insertion order instead if fewer packages are late
+        if late_count and route_solver != ROUTE_SOLVER_INSERTION:
+            route, packages = truck.route, truck.packages
+            for solver in (ROUTE_SOLVER_INSERTION, None):
+                del truck.distances[distance_count:]
+                del truck.pred_vertex[pred_vertex_count:]
+                time_tracker.track_truck_current_time[truck.truck_id] = start_time
+                if solver is None:
+                    truck.route, truck.packages = route, packages
+                else:
+                    _optimize_route(truck, graph, solver)
+                total_distance = _find_shortest_route_to_deliver(truck, graph)
+                if _get_late_count(truck) < late_count:
+                    break
+        time_delivered = {package: status_info['time_delivered']
+                          for package, status_info in time_tracker.get_package_status.items()}
+        truck.route_plans.put(key, RoutePlan(list(truck.route), list(truck.packages), truck.distances[distance_count:],
+                                             truck.pred_vertex[pred_vertex_count:],
+                                             time_tracker.get_current_truck_time(), total_distance, time_delivered,
+                                             truck.route_walk))
+        return total_distance
+    # Same packages and start time as a previous delivery, only re-read its results
+    truck.route = list(plan.route)
+    truck.packages = list(plan.packages)
+    truck.distances.extend(plan.distances)
+    truck.pred_vertex.extend(plan.pred_vertex)
+    truck.route_walk = plan.walk
+    time_tracker.track_truck_current_time[truck.truck_id] = plan.end_time
+    for package, time_delivered in plan.time_delivered.items():
+        time_tracker.insert_current_truck_time_to_package(package, time_delivered)
+    return plan.total_distance
+
+
+# Packages of a truck's last delivery delivered after their deadline
+def _get_late_count(truck):
+    """
+    Count the packages of a truck delivered after their deadline.
+
+    Parameters:
+        truck (Truck): The truck, its packages delivered.
+
+    Returns:
+        int: The number of late packages.
+    """
+    package_status = truck.time_tracker.get_package_status
+    return sum(1 for package in truck.get_packages() if package in package_status
+               and package_status[package]['time_delivered'] is not None
+               and package_status[package]['time_delivered'] > package_status[package]['delivery_deadline'])
 
 
 # Simulate delivering of packages
 # Function to deliver packages using the TimeTracker instances inside each truck
-def deliver_packages(trucks, graph, start_interval, end_interval):
+def deliver_packages(trucks, graph, start_interval, end_interval, route_solver=ROUTE_SOLVER_TWO_OPT):
     """
     Delivers packages using a list of trucks, a graph, and time intervals.
 
@@ -312,16 +535,20 @@ def deliver_packages(trucks, graph, start_interval, end_interval):
     - graph (Graph): A graph object representing the delivery locations and distances.
     - start_interval (str): The start time interval for package delivery.
     - end_interval (str): The end time interval for package delivery.
+    - route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION,
+        how each truck's route is optimized.
 
     Returns:
     None
     """
-    # Flag to track if truck 1's delivery is completed
-    is_delivery_completed = False
-    distances = {}
+    # Routes are planned with the packages as loaded, changes are applied when they are known
+    package_changes.set_time(0)
+    # Times the drivers are back at the hub to take a truck waiting for one, earliest first
+    driver_times = []
+    waiting_trucks = []
+    scheduled_count = 0
     for current_truck in trucks:
-        distances[current_truck.truck_id] = 0
-        # Current truck time tracker high_priority, medium_priority, low_priority
+        # Current truck time tracker
         time_tracker = current_truck.time_tracker
         # Reset filtered packages for the current truck for each run of the function
         current_truck.filtered_packages = []
@@ -331,120 +558,608 @@ def deliver_packages(trucks, graph, start_interval, end_interval):
         current_truck.reset_distance()
         # Reset miles traveled for the current truck for each run of the function
         time_tracker.track_miles_traveled[current_truck.truck_id] = 0
-        # Get the name of the current truck
-        truck_name = current_truck.truck_name
-        # print("NEW LINE---\n")
+        if time_tracker.get_start_time() is not None:
+            scheduled_count += 1
         # Check if the current truck is ready for delivery
-        if current_truck.time_tracker.is_ready_to_deliver(current_truck):
-            # # Only print the route if the current truck is truck1 or truck2
-            # if current_truck == high_priority or current_truck == medium_priority:
-            #     print(f"{truck.get_truck_name}, OPTIMIZED_DELIVERY_ROUTE: ", current_truck.route())
-            # Only deliver packages if the current truck is truck1 or truck2
-            if current_truck == high_priority or current_truck == medium_priority:
-                # Call the function two_opt_route to find the optimized route for the current truck
-                algo.two_opt_route(current_truck, graph)
-                # Call the function to find the shortest route to deliver packages
-                total_distance = _find_shortest_route_to_deliver(current_truck, graph)
-                # Update miles traveled for the current truck
-                time_tracker.update_miles_traveled(total_distance)
-                # Update fuel level for the current truck
-                current_truck.fuel_tracker.update_fuel_level(current_truck.truck_id, current_truck.time_tracker)
-                # Update address for the current truck in visualize
-                current_truck.visualize.update_address(current_truck.truck_id, current_truck.address)
-
-            # Check if truck 1 has completed its delivery
-            if current_truck == high_priority and current_truck.time_tracker.is_delivery_completed():
-                is_delivery_completed = True
-
-            if current_truck == low_priority:
-                if is_delivery_completed and current_truck.time_tracker.is_ready_to_deliver(current_truck):
-                    deliver_truck3_packages(current_truck, graph, start_interval, end_interval)
-            # Only filter packages if the current truck is truck1 or truck2
-            if current_truck == high_priority or current_truck == medium_priority:
-                filtered_packages = current_truck.time_tracker.get_filtered_packages_by_time_range(start_interval,
-                                                                                                   end_interval)
-                current_truck.insert_filtered_packages(filtered_packages)
-
-
-# After truck 1's delivery is completed, deliver truck 3's packages
-def deliver_truck3_packages(truck3, graph, start_interval, end_interval):
-    """
-    Deliver packages using truck 3 based on the provided parameters.
+        if not time_tracker.is_ready_to_deliver(current_truck):
+            continue
+        # Trucks without a start time leave once a driver is back, after the trucks with one
+        if time_tracker.get_start_time() is None:
+            waiting_trucks.append(current_truck)
+            continue
+        # Find the optimized route for the current truck and deliver its packages
+        total_distance = _plan_route(current_truck, graph, route_solver)
+        # Update miles traveled for the current truck
+        time_tracker.update_miles_traveled(total_distance)
+        # Update fuel level for the current truck
+        current_truck.fuel_tracker.update_fuel_level(current_truck.truck_id, current_truck.time_tracker)
+        # Update address for the current truck in visualize
+        current_truck.visualize.update_address(current_truck.route, current_truck.truck_id)
+        # The driver is back at the hub once the truck's delivery is completed
+        if time_tracker.is_delivery_completed():
+            heapq.heappush(driver_times, time_tracker.get_current_truck_time())
+        filtered_packages = time_tracker.get_filtered_packages_by_time_range(start_interval, end_interval)
+        current_truck.insert_filtered_packages(filtered_packages)
+
+    # Drivers without a truck of their own take waiting trucks when the first truck leaves
+    first_departure = min((truck.time_tracker.get_start_time() for truck in trucks
+                           if truck.time_tracker.get_start_time() is not None), default=0)
+    for _ in range(fleet.driver_count - scheduled_count):
+        heapq.heappush(driver_times, first_departure)
+    for current_truck in waiting_trucks:
+        if not driver_times:
+            break
+        deliver_waiting_truck_packages(current_truck, graph, heapq.heappop(driver_times), start_interval,
+                                       end_interval, route_solver)
+        heapq.heappush(driver_times, current_truck.time_tracker.get_current_truck_time())
+
+
+# Once a driver is back at the hub, deliver the packages of a truck waiting for one
+def deliver_waiting_truck_packages(truck, graph, start_time, start_interval, end_interval,
+                                   route_solver=ROUTE_SOLVER_TWO_OPT):
+    """
+    Deliver the packages of a truck without a start time, e.g. truck 3, once a driver is back.
 
     Parameters:
-        truck3 (Truck): The truck object representing truck 3.
+        truck (Truck): The truck waiting for a driver.
         graph (Graph): The graph object representing the delivery locations.
+        start_time (int): The time the driver is back at the hub in seconds since midnight.
         start_interval (str): The start time interval for package delivery.
         end_interval (str): The end time interval for package delivery.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION,
+            how the route is optimized.
 
     Returns:
         None
     """
-    truck_name = truck3.truck_name
-    time_tracker = truck3.time_tracker
-    # Calculate start time for truck 3 based on truck 1's return time
-    current_time_truck1 = high_priority.time_tracker.get_current_truck_time()
-    truck3_start_time = current_time_truck1
-
-    # Update truck 3's time to account for delivering packages after truck1
+    time_tracker = truck.time_tracker
+    # Update the truck's time to account for delivering packages after the driver is back
     # and update time_to_start_delivery
-    time_tracker.set_track_truck_current_time(truck3_start_time)
-    time_tracker.update_time_to_start_delivery(truck3_start_time)
-
-    # print(f"{truck.get_truck_name}, OPTIMIZED_DELIVERY_ROUTE: ", truck3.route)
-    # Call the function two_opt_route to find the optimized route for truck 3
-    algo.two_opt_route(truck3, graph)
-    # Call the function to find the shortest route to deliver packages
-    total_distance = _find_shortest_route_to_deliver(truck3, graph)
+    time_tracker.set_track_truck_current_time(start_time)
+    time_tracker.update_time_to_start_delivery(start_time)
+
+    # Find the optimized route for the truck and deliver its packages
+    total_distance = _plan_route(truck, graph, route_solver)
     # Update miles traveled for the current truck
     time_tracker.update_miles_traveled(total_distance)
     # Update fuel level for the current truck
-    truck3.fuel_tracker.update_fuel_level(truck3.truck_id, truck3.time_tracker)
+    truck.fuel_tracker.update_fuel_level(truck.truck_id, truck.time_tracker)
     # Update address for the current truck in visualize
-    truck3.visualize.update_address(truck3.truck_id, truck3.address)
-
-    # Check if the time is over 10: 20 AM
-    # If so, update the package with ID 9 to the new address
-    package_to_update = ds.package_hashmap.get_value_from_key(9)  # Get the package object
-    new_address = '410 S State St'
-    new_city = 'Salt Lake City'
-    new_state = 'UT'
-    new_zipcode = '84111'
-    new_special_notes = 'Address updated from 300 State St to 410 S State St at 10:20 AM'
-    time_tracker.update_package_status(package_to_update, new_address, new_city, new_state, new_zipcode,
-                                       new_special_notes, end_interval)
-    filtered_packages = truck3.time_tracker.get_filtered_packages_by_time_range(start_interval, end_interval)
-    truck3.insert_filtered_packages(filtered_packages)
-
-
-def print_all_package_status_delivery(truck_list):
+    truck.visualize.update_address(truck.route, truck.truck_id)
+
+    # Apply the package changes known by the end of the interval, e.g. package #9's address after 10:20 AM
+    # The store is updated in place so the packages tracked by the time tracker show the new values
+    package_changes.set_time(convert_12h_to_seconds(end_interval))
+    filtered_packages = truck.time_tracker.get_filtered_packages_by_time_range(start_interval, end_interval)
+    truck.insert_filtered_packages(filtered_packages)
+
+
+# Run the whole day once with the discrete-event simulator
+# Trucks without a start time leave when a driver is handed over from the first truck to finish, late packages
+# and package changes are events instead of special cases
+def simulate_day(trucks, graph, route_solver=ROUTE_SOLVER_TWO_OPT, workers=1):
+    """
+    Simulate the delivery day of the trucks.
+
+    2-opt and the exact solver only shorten the routes. When their routes deliver a package late, the trucks carrying
+    late packages drive the deadline-aware insertion order from the time they left instead, and the day is simulated
+    again. The insertion routes are kept if fewer packages are late.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        graph (Graph): A graph object representing the delivery locations and distances.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION,
+            how each truck's route is optimized.
+        workers (int, optional): The number of worker processes optimizing the routes, see optimize_routes.
+
+    Returns:
+        SimulationResult: The immutable timelines of every package and truck.
+    """
+    # Routes are planned with the packages as loaded, the changes are events of the day
+    package_changes.set_time(0)
+    optimize_routes(trucks, graph, route_solver, workers)
+    result = _simulate_routes(trucks, graph)
+    late_packages = get_late_packages(result)
+    if not late_packages or route_solver == ROUTE_SOLVER_INSERTION:
+        return result
+    routes = {truck.truck_id: (truck.route, truck.packages) for truck in trucks}
+    for truck in trucks:
+        if truck.truck_id in late_packages.values():
+            algo.insertion_route(truck, graph, result.trucks[truck.truck_id].departure_time)
+    insertion_result = _simulate_routes(trucks, graph)
+    if len(get_late_packages(insertion_result)) < len(late_packages):
+        return insertion_result
+    for truck in trucks:
+        truck.route, truck.packages = routes[truck.truck_id]
+    # Simulated again so the package store holds the changes of the day that is returned
+    return _simulate_routes(trucks, graph)
+
+
+# Simulate the day with the trucks' routes as they are
+def _simulate_routes(trucks, graph):
+    """
+    Simulate the delivery day of trucks with routes.
+
+    Parameters:
+        trucks (list): The trucks, their routes already optimized.
+        graph (Graph): A graph object representing the delivery locations and distances.
+
+    Returns:
+        SimulationResult: The immutable timelines of every package and truck.
+    """
+    package_changes.set_time(0)
+    simulator = DeliverySimulator(graph, driver_count=fleet.driver_count)
+    for truck in trucks:
+        # Trucks start at their first stop, the same as deliver_packages
+        start_vertex = truck.route[0] if truck.route else None
+        # A truck with room drives back to the hub for the packages received during the day
+        return_to_hub = bool(received_packages) and len(truck.get_packages()) < truck.capacity
+        simulator.add_truck(truck.truck_id, truck.get_packages(), truck.time_tracker.get_start_time(),
+                            start_vertex, return_to_hub, truck.time_tracker.get_truck_speed, truck.capacity)
+        for package in truck.get_packages():
+            available_time = ds.package_hashmap.index.constraints.get_available_time(package.package_id)
+            if available_time is not None:
+                simulator.add_package_arrival(package.package_id, available_time)
+            # Not delivered before its address is corrected, by the posted address change when no time is given
+            wrong_address = ds.package_hashmap.index.constraints.get_wrong_address(package.package_id)
+            if wrong_address is not None:
+                simulator.add_package_hold(package.package_id, wrong_address.time)
+    for package_id, time in received_packages.items():
+        simulator.add_package_intake(ds.package_hashmap.get_value_from_key(package_id), time)
+    for change in package_changes.get_changes:
+        simulator.add_package_change(change)
+    result = simulator.run()
+    # The simulator ignores a change that comes after its package's delivery, so does the store
+    package_changes.set_delivery_times({package_id: timeline.delivery_time
+                                        for package_id, timeline in result.packages.items()
+                                        if timeline.delivery_time is not None})
+    package_changes.set_time(END_OF_DAY)
+    return result
+
+
+# Packages of a simulated day delivered after their deadline
+def get_late_packages(simulation_result):
+    """
+    Get the packages delivered after their deadline, read from the package store.
+
+    Parameters:
+        simulation_result (SimulationResult): The simulated day.
+
+    Returns:
+        dict: Package ID -> the ID of the truck that delivered it late.
+    """
+    late_packages = {}
+    for package_id, timeline in simulation_result.packages.items():
+        package = ds.package_hashmap.get_value_from_key(package_id)
+        if timeline.delivery_time is not None and package is not None and \
+                timeline.delivery_time > package.deadline_minutes * SECONDS_PER_MINUTE:
+            late_packages[package_id] = timeline.truck_id
+    return late_packages
+
+
+# Get the status index of the simulated day, the day is only simulated again when refresh is True
+# Status queries read the index instead of re-running deliver_packages for every time asked
+def get_day_status(trucks, graph, route_solver=ROUTE_SOLVER_TWO_OPT, refresh=False):
+    """
+    Get the status index of the delivery day, simulating the day on first use.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        graph (Graph): A graph object representing the delivery locations and distances.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION,
+            how each truck's route is optimized.
+        refresh (bool): True to simulate the day again, e.g. after packages were loaded or changed.
+
+    Returns:
+        StatusIndex: The status index of the simulated day.
+    """
+    global day_status
+    if day_status is None or refresh:
+        day_status = StatusIndex(simulate_day(trucks, graph, route_solver))
+        for truck in trucks:
+            # Update address for the truck in visualize
+            truck.visualize.update_address(truck.route, truck.truck_id)
+    return day_status
+
+
+# Re-drive the simulated day's plan under sampled speeds and delays, see monte_carlo
+def simulate_robustness(trucks, graph, scenarios=10000, workers=None, seed=0, route_solver=ROUTE_SOLVER_TWO_OPT,
+                        **scenario_options):
+    """
+    Estimate the on-time probability of every package and truck of the day's plan.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        graph (Graph): A graph object representing the delivery locations and distances.
+        scenarios (int): The number of sampled scenarios.
+        workers (int, optional): The number of worker processes, 1 to run in this process.
+        seed (int): The seed of the scenarios.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION,
+            how each truck's route is optimized.
+        **scenario_options: speed_spread, stop_delay and arrival_delay, see monte_carlo.run_monte_carlo.
+
+    Returns:
+        RobustnessResult: The on-time probability per package ID and per truck ID and the cancelled package IDs.
+    """
+    day = get_day_status(trucks, graph, route_solver).get_simulation_result
+    departure_times = {truck.truck_id: truck.time_tracker.get_start_time() for truck in trucks}
+    deadlines = {package.package_id: package.deadline_minutes * SECONDS_PER_MINUTE
+                 for truck in trucks for package in truck.get_packages()}
+    for package_id in received_packages:
+        deadlines[package_id] = ds.package_hashmap.get_value_from_key(package_id).deadline_minutes * SECONDS_PER_MINUTE
+    speeds = {truck.truck_id: truck.time_tracker.get_truck_speed for truck in trucks}
+    plan = make_plan(day, departure_times, deadlines, driver_count=fleet.driver_count, speeds=speeds)
+    return run_monte_carlo(plan, scenarios, workers=workers, seed=seed, **scenario_options)
+
+
+# Print the on-time probabilities of a robustness run, least likely packages first, then the cancelled packages
+def print_robustness(trucks, robustness):
+    """
+    Print the on-time probability of every truck and of the packages that can be late, and the cancelled packages.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        robustness (RobustnessResult): The result of simulate_robustness.
+
+    Returns:
+        None
+    """
+    lines = [f"Scenarios: {robustness.scenarios}"]
+    for truck in trucks:
+        lines.append(f"{truck.truck_name}: {robustness.truck_on_time.get(truck.truck_id, 0):.1%} all packages on time")
+    for package_id, probability in sorted(robustness.package_on_time.items(), key=lambda item: item[1]):
+        if probability < 1:
+            lines.append(f"Package ID: {package_id}, On Time: {probability:.1%}")
+    for package_id in robustness.cancelled:
+        lines.append(f"Package ID: {package_id}, Cancelled")
+    print("\n".join(lines))
+
+
+# Post a change to a package received during the day, new address, new deadline or cancellation
+# The store is updated in place and the day is simulated again, the simulator re-optimizes only the remaining stops of
+# the truck carrying the package from the time of the change
+def post_package_change(trucks, graph, change, route_solver=ROUTE_SOLVER_TWO_OPT):
+    """
+    Apply a change to a package and update the status of the day.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        graph (Graph): A graph object representing the delivery locations and distances.
+        change (PackageChange): The change, a new address must be a location of the graph.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION,
+            how each truck's route is optimized.
+
+    Returns:
+        StatusIndex: The status index of the day with the change, or None if the package or address is unknown.
+    """
+    if ds.package_hashmap.get_value_from_key(change.package_id) is None:
+        print(f"Package {change.package_id} not found")
+        return None
+    if change.address is not None and change.address not in graph.get_vertex_ids:
+        print(f"Unknown address: {change.address}")
+        return None
+    package_changes.add(change)
+    for truck in trucks:
+        truck.route_plans.invalidate_package(change.package_id)
+    return get_day_status(trucks, graph, route_solver, refresh=True)
+
+
+# Receive a new package during the day instead of loading every package at import
+# The package is added to the store and the day is simulated again, when the package reaches the hub the simulator puts
+# it at the cheapest position, without making a delivery late, on a truck not departed yet, driving back to the hub or
+# back at the hub. A package no truck can take is taken out of the store again
+def receive_package(trucks, graph, time, package_id, address, city, state, zipcode, delivery_deadline, mass,
+                    special_notes='', route_solver=ROUTE_SOLVER_TWO_OPT):
+    """
+    Receive a new package during the day.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        graph (Graph): A graph object representing the delivery locations and distances.
+        time (str): The time the package reaches the hub in the format 'HH:MM AM/PM'.
+        package_id (int): The ID of the package, not used by another package.
+        address (str): The delivery address, a location of the graph.
+        city (str): The delivery city.
+        state (str): The delivery state.
+        zipcode (str): The delivery zipcode.
+        delivery_deadline (str): The delivery deadline, 'HH:MM AM/PM' or 'EOD'.
+        mass (str): The mass of the package.
+        special_notes (str): The special notes of the package.
+        route_solver (str): ROUTE_SOLVER_TWO_OPT, ROUTE_SOLVER_EXACT or ROUTE_SOLVER_INSERTION,
+            how each truck's route is optimized.
+
+    Returns:
+        int: The ID of the truck the package is put on, or None if the package is invalid or no truck can take it.
+    """
+    if address not in graph.get_vertex_ids:
+        print(f"Unknown address: {address}")
+        return None
+    package = ds.package_hashmap.add_package(package_id, address, city, state, zipcode, delivery_deadline, mass,
+                                             special_notes)
+    if package is None:
+        return None
+    received_packages[package_id] = convert_12h_to_seconds(time)
+    truck_id = get_day_status(trucks, graph, route_solver, refresh=True).get_timeline(package_id).truck_id
+    if truck_id is None:
+        print(f"No truck can take package {package_id}")
+        # Roll the package back so it can be received again
+        del received_packages[package_id]
+        ds.package_hashmap.delete_key_value_pair(package_id)
+        get_day_status(trucks, graph, route_solver, refresh=True)
+    return truck_id
+
+
+# Packages of a truck: its load and the received packages the simulated day put on it
+def _get_truck_packages(truck, status_index):
+    """
+    Get the packages a truck delivers over the day.
+
+    Parameters:
+        truck (Truck): The truck.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+
+    Returns:
+        list: The packages, the load first.
+    """
+    packages = list(truck.time_tracker.get_package_status)
+    for package_id in received_packages:
+        timeline = status_index.get_timeline(package_id)
+        if timeline is not None and timeline.truck_id == truck.truck_id:
+            packages.append(ds.package_hashmap.get_value_from_key(package_id))
+    return packages
+
+
+# Package as known at a time, with the changes received by then
+def _get_package_at(package, minutes):
+    """
+    Get a package with the changes received by a time applied.
+
+    Parameters:
+        package (HashMapEntry): The package in the store.
+        minutes (int): The time in minutes since midnight.
+
+    Returns:
+        HashMapEntry: The package, or a copy of it as of the time.
+    """
+    return package_changes.get_package_at(package, minutes * SECONDS_PER_MINUTE)
+
+
+# Status record of a package at a time from the status index
+def _get_package_status(package, truck_id, status_index, minutes):
+    """
+    Get the status of a package at a time.
+
+    Parameters:
+        package (HashMapEntry): The package as loaded.
+        truck_id (int): The ID of the truck the package is loaded on.
+        status_index (StatusIndex): The status index of the day.
+        minutes (int): The time in minutes since midnight.
+
+    Returns:
+        PackageStatus: The status record of the package.
+    """
+    timeline = status_index.get_timeline(package.package_id)
+    time_delivered = None if timeline is None else timeline.delivery_time
+    package = _get_package_at(package, minutes)
+    return PackageStatus(package.package_id, package.address, package.city, package.state, package.zipcode,
+                         package.mass, package.special_notes, status_index.get_status(package.package_id, minutes),
+                         package.deadline_minutes * SECONDS_PER_MINUTE, time_delivered, truck_id)
+
+
+# Fill the filtered packages of every truck with the status of its packages at a time, without delivering again
+def filter_packages_by_status(trucks, status_index, current_time):
+    """
+    Set the filtered packages of the trucks to the status of their packages at a time.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+        current_time (str): The time in the format 'HH:MM AM/PM'.
+
+    Returns:
+        None
+    """
+    minutes = convert_12h_to_minutes(current_time)
+    for truck in trucks:
+        truck.filtered_packages = [_get_package_status(package, truck.truck_id, status_index, minutes)
+                                   for package in _get_truck_packages(truck, status_index)]
+
+
+# Status of a single package at a time from the status index
+# The package's timeline gives its truck and the store gives the package, no truck's load is scanned
+def get_package_status(trucks, status_index, package_id, current_time):
+    """
+    Get the status of a package at a time.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+        package_id (int): The ID of the package.
+        current_time (str): The time in the format 'HH:MM AM/PM'.
+
+    Returns:
+        PackageStatus: The status record of the package, or None if none of the trucks carries it.
+    """
+    timeline = status_index.get_timeline(package_id)
+    if timeline is None or all(truck.truck_id != timeline.truck_id for truck in trucks):
+        return None
+    package = ds.package_hashmap.get_value_from_key(package_id)
+    if package is None:
+        return None
+    return _get_package_status(package, timeline.truck_id, status_index, convert_12h_to_minutes(current_time))
+
+
+# Print the status of a single package at a time from the status index
+def print_package_status(trucks, status_index, package_id, current_time, report_format=FORMAT_TEXT):
+    """
+    Print the status of a package at a time.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+        package_id (int): The ID of the package.
+        current_time (str): The time in the format 'HH:MM AM/PM'.
+        report_format (str): The format of the report, see status_report.
+
+    Returns:
+        bool: True if the package was found, False otherwise.
+    """
+    record = get_package_status(trucks, status_index, package_id, current_time)
+    if record is None:
+        print(f"Package {package_id} not found")
+        return False
+    write_report([record], report_format)
+    return True
+
+
+# Print how many packages of each truck are in each status at a time, from one status snapshot
+def print_status_summary(trucks, status_index, current_time):
+    """
+    Print the number of packages in each status per truck at a time.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+        current_time (str): The time in the format 'HH:MM AM/PM'.
+
+    Returns:
+        StatusSnapshot: The snapshot the summary was printed from.
+    """
+    snapshot = status_index.get_snapshot(convert_12h_to_minutes(current_time))
+    lines = []
+    for truck in trucks:
+        counts = snapshot.truck_counts.get(truck.truck_id, {})
+        lines.append(f"{truck.truck_name}: " + ", ".join(f"{status}: {count}" for status, count in counts.items()))
+    lines.append("ALL TRUCKS: " + ", ".join(f"{status}: {count}" for status, count in snapshot.counts.items()))
+    print("\n".join(lines))
+    return snapshot
+
+
+# Miles driven by a truck, from the status index of the simulated day or from its last deliver_packages run
+def _get_truck_miles(truck, status_index=None):
+    """
+    Get the miles driven by a truck over the day.
+
+    Parameters:
+        truck (Truck): The truck.
+        status_index (StatusIndex): The status index of the day, None to use the distances of deliver_packages.
+
+    Returns:
+        float: The miles driven.
+    """
+    if status_index is not None and status_index.get_truck_timeline(truck.truck_id) is not None:
+        return status_index.get_truck_timeline(truck.truck_id).miles
+    return sum(truck.get_distances())
+
+
+# Leg table of a truck, from the status index of the simulated day or from its last deliver_packages walk
+def _get_leg_table(truck, status_index=None):
+    """
+    Get the cumulative leg table of a truck.
+
+    Parameters:
+        truck (Truck): The truck.
+        status_index (StatusIndex): The status index of the day, None to use the walk of deliver_packages.
+
+    Returns:
+        LegTable: The table, or None if the truck has not been simulated or delivered yet.
+    """
+    if status_index is not None and status_index.get_leg_table(truck.truck_id) is not None:
+        return status_index.get_leg_table(truck.truck_id)
+    if truck.route_walk is not None:
+        return make_walk_leg_table(truck.route_walk)
+    return None
+
+
+# Where every truck is at a time, a bisect into its leg table instead of delivering again
+def get_truck_positions(trucks, status_index, current_time):
+    """
+    Get the position of every truck at a time.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+        current_time (str): The time in the format 'HH:MM AM/PM'.
+
+    Returns:
+        dict: Truck ID -> TruckPosition, for the trucks with a leg table.
+    """
+    time = convert_12h_to_seconds(current_time)
+    positions = {}
+    for truck in trucks:
+        leg_table = _get_leg_table(truck, status_index)
+        if leg_table is not None:
+            positions[truck.truck_id] = leg_table.get_position(time)
+    return positions
+
+
+# Map coordinates of every truck at a time, interpolated along the leg being driven, for the visualization
+def get_truck_coordinates(trucks, status_index, current_time):
+    """
+    Get the map coordinates of every truck at a time.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+        current_time (str): The time in the format 'HH:MM AM/PM'.
+
+    Returns:
+        dict: Truck ID -> (x, y), for the trucks with a leg table and known coordinates.
+    """
+    time = convert_12h_to_seconds(current_time)
+    coordinates = {}
+    for truck in trucks:
+        leg_table = _get_leg_table(truck, status_index)
+        point = None if leg_table is None else leg_table.get_coordinates(time, truck.visualize.get_all_coordinates)
+        if point is not None:
+            coordinates[truck.truck_id] = point
+    return coordinates
+
+
+# Print where every truck is and the miles and fuel it has used at a time
+def print_truck_progress(trucks, status_index, current_time):
+    """
+    Print the position, miles driven and fuel used of every truck at a time.
+
+    Parameters:
+        trucks (list): A list of truck objects representing the available trucks.
+        status_index (StatusIndex): The status index of the day, see get_day_status.
+        current_time (str): The time in the format 'HH:MM AM/PM'.
+
+    Returns:
+        dict: Truck ID -> TruckPosition the progress was printed from.
+    """
+    time = convert_12h_to_seconds(current_time)
+    positions = {}
+    lines = []
+    for truck in trucks:
+        leg_table = _get_leg_table(truck, status_index)
+        if leg_table is None:
+            continue
+        position = positions[truck.truck_id] = leg_table.get_position(time)
+        if position.next_vertex is None:
+            location = f"at {position.vertex}"
+        else:
+            location = f"{position.fraction:.0%} from {position.vertex} to {position.next_vertex}"
+        gallons = leg_table.get_fuel_used(time, truck.fuel_tracker.get_miles_per_gallon)
+        lines.append(f"{truck.truck_name}: {location}, {position.miles:.1f} miles, {gallons:.2f} gallons")
+    print("\n".join(lines))
+    return positions
+
+
+def print_all_package_status_delivery(truck_list, status_index=None, report_format=FORMAT_COMPACT):
     all_packages = []
     distances = 0
     for truck in truck_list:
         all_packages.extend(truck.get_filtered_packages())
-        distances += sum(truck.get_distances())
+        distances += _get_truck_miles(truck, status_index)
 
     print("Packages:", len(all_packages))
     print("Total Distance:", distances, "miles")
-    for package in all_packages:
-        details = package.split('|')
-        compact_details = [
-            details[0],  # ID
-            details[1],  # Address
-            details[2],  # City
-            details[3],  # State
-            details[4],  # Zip code
-            details[5],  # Deadline
-            details[6],  # Mass
-            details[7],  # Special notes
-            details[8],  # Status
-            details[9],  # Time delivered
-            details[10]  # Truck
-        ]
-        print(", ".join([detail.strip() for detail in compact_details]))
-
-
-def print_truck_delivery_status(trucks, current_time):
+    write_report(all_packages, report_format)
+
+
+def print_truck_delivery_status(trucks, current_time, status_index=None):
     distances = {}
     for truck in trucks:
         distances[truck.truck_id] = 0
@@ -452,35 +1167,29 @@ def print_truck_delivery_status(trucks, current_time):
         print('Truck:', truck.truck_name)
         print(f"Packages on truck {truck.truck_id}:", len(truck.filtered_packages))
         truck.print_filtered_packages()
-        print("TRUCK ROUTE TRAVELED FROM HUB:", truck.route)
-        distances[truck.truck_id] = sum(truck.get_distances())
+        route = truck.route
+        if status_index is not None and status_index.get_truck_timeline(truck.truck_id) is not None:
+            # Stops in the order the simulated truck visited them
+            route = [vertex for vertex, _ in status_index.get_truck_timeline(truck.truck_id).stops]
+        print("TRUCK ROUTE TRAVELED FROM HUB:", route)
+        distances[truck.truck_id] = _get_truck_miles(truck, status_index)
         print(f'Total Distance Travelled: {distances[truck.truck_id]} miles \n')
 
 
-# Delivered by 9:00am, the constraint of having multiple packages on the same truck delivered together, Truck 1
-high_priority = Trucks(truck_id=1, truck_name="HIGH_PRIORITY")
-# Delivered by 10:30am, the constraint of having multiple packages required on, Truck 2
-medium_priority = Trucks(truck_id=2, truck_name="MEDIUM_PRIORITY")
-# Delivered by EOD, no constraints required for packages EOD will be defined as 5:00pm, Truck 3
-low_priority = Trucks(truck_id=3, truck_name="LOW_PRIORITY")
-
+# Trucks and drivers of the day, see logistics/fleet.json
+fleet = load_fleet()
+fleet_trucks = make_trucks(fleet)
 # Load trucks
-load_trucks(high_priority, medium_priority, low_priority, ds.graph_access, util.track_package_id1)
+load_trucks(fleet_trucks, ds.graph_access, util.track_package_id1)
 
 # Initialize packages
-high_priority.time_tracker.initialize_multiple_package_status(high_priority.get_packages(), 'AT_HUB')
-# Converted to '9:05 AM'
-medium_priority.time_tracker.initialize_multiple_package_status(medium_priority.get_packages(), 'AT_HUB')
-
-# Placeholder for packages that will be delivered by truck 3, Truck 3 will have new time_to_start_delivery
-# and current_time attributes to reflect the time it will start delivering packages
-low_priority.time_tracker.initialize_multiple_package_status(low_priority.get_packages(), 'AT_HUB')
+# Placeholder for packages that will be delivered by trucks waiting for a driver, they will have new
+# time_to_start_delivery and current_time attributes to reflect the time they start delivering packages
+for fleet_truck in fleet_trucks:
+    fleet_truck.time_tracker.initialize_multiple_package_status(fleet_truck.get_packages(), 'AT_HUB')
 
-# trucks_list = [high_priority, medium_priority, low_priority]
 # start_interval = '8:15 AM'
 # end_interval = '8:15 AM'
-# deliver_packages(trucks_list, ds.graph_access, start_interval, end_interval)
-# print_truck_delivery_status(trucks_list, end_interval)
-# print_all_package_status_delivery(trucks_list)
-# high_priority.time_tracker.lookup_single_package_status(13, '9:00 AM')
-# high_priority.visualize.visualize_truck_route(high_priority.truck_id, high_priority.truck_name)
+# deliver_packages(fleet_trucks, ds.graph_access, start_interval, end_interval)
+# print_truck_delivery_status(fleet_trucks, end_interval)
+# print_all_package_status_delivery(fleet_trucks)
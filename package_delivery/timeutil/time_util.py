@@ -1,53 +1,100 @@
-from datetime import datetime
+# Times are whole seconds since midnight, parsed once from 'hh:mm AM/PM' input and formatted only for output
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
 
 
-# Function to format float to time in 24-hour format
-def float_time_24hr_str(time_float):
+# Function to convert 12-hour time to minutes since midnight without going through strptime
+def convert_12h_to_minutes(time_str):
     """
-    Format the given time in float as a string in 24-hour format (HH:MM).
+    Convert a time string from 12-hour format to minutes since midnight.
 
     Parameters:
-        time_float (float): The time to be formatted, represented as a decimal number.
+        time_str (str): The time string to be converted, in the format 'hh:mm AM/PM' or 'EOD'.
 
     Returns:
-        str: The formatted time string in 24-hour format (HH:MM).
+        int: The number of minutes since midnight.
+
+    Raises:
+        ValueError: If the time string is not in the expected format.
+    """
+    if time_str == 'EOD':
+        time_str = '5:00 PM'
+    try:
+        clock, period = time_str.split()
+        hours, minutes = clock.split(':')
+        hours = int(hours)
+        minutes = int(minutes)
+    except (AttributeError, ValueError):
+        raise ValueError(f"time data {time_str!r} does not match format '%I:%M %p'")
+    period = period.upper()
+    if not (1 <= hours <= 12 and 0 <= minutes < 60 and period in ('AM', 'PM')):
+        raise ValueError(f"time data {time_str!r} does not match format '%I:%M %p'")
+    hours %= 12
+    if period == 'PM':
+        hours += 12
+    return hours * 60 + minutes
+
+
+# Function to convert 12-hour time to seconds since midnight
+def convert_12h_to_seconds(time_str):
+    """
+    Convert a time string from 12-hour format to seconds since midnight.
+
+    Parameters:
+        time_str (str): The time string to be converted, in the format 'hh:mm AM/PM' or 'EOD'.
+
+    Returns:
+        int: The number of seconds since midnight.
+
+    Raises:
+        ValueError: If the time string is not in the expected format.
     """
-    hours = int(time_float)
-    minutes = int((time_float - hours) * 60)
-    formatted_time = f"{hours:02d}:{minutes:02d}"
-    return formatted_time
+    return convert_12h_to_minutes(time_str) * SECONDS_PER_MINUTE
 
 
-def convert_time_str_to_datetime(time_str):
+# Function to calculate the whole seconds a truck takes to drive a distance
+def travel_seconds(distance, speed):
     """
-    Convert a time string to a datetime object.
+    Calculate the travel time of a distance in whole seconds.
 
-    Args:
-        time_str (str): The time string in the format '%H:%M'.
+    Parameters:
+        distance (float): The distance in miles.
+        speed (float): The speed in miles per minute.
 
     Returns:
-        datetime.time: The converted time as a datetime.time object.
+        int: The travel time in seconds, rounded to the nearest second.
     """
-    if time_str is None:
-        print(f"Warning: Could not convert time_delivered_str from {time_str} to datetime.time object.")
-        return None
-    return datetime.strptime(time_str, '%H:%M').time()
+    return round(distance / speed * SECONDS_PER_MINUTE)
 
 
-# Function to convert 12-hour time to 24-hour time
-def convert_12h_to_24h_datetime(time_str):
+# Function to format minutes since midnight as a 24-hour time string
+def minutes_24hr_str(minutes):
     """
-    Convert a time string from 12-hour format to 24-hour format.
+    Format minutes since midnight as a string in 24-hour format (HH:MM).
 
     Parameters:
-        time_str (str): The time string to be converted. It should be in the format 'hh:mm AM/PM'.
+        minutes (int): The number of minutes since midnight.
 
     Returns:
-        datetime.time: The converted time in 24-hour format.
+        str: The formatted time string in 24-hour format (HH:MM).
     """
-    if time_str == 'EOD':
-        return datetime.strptime('5:00 PM', '%I:%M %p').time()
-    return datetime.strptime(time_str, '%I:%M %p').time()
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# Function to format seconds since midnight as a 24-hour time string, the seconds are dropped
+def seconds_24hr_str(seconds):
+    """
+    Format seconds since midnight as a string in 24-hour format (HH:MM).
+
+    Parameters:
+        seconds (int): The number of seconds since midnight, or None.
+
+    Returns:
+        str: The formatted time string in 24-hour format (HH:MM), or None if seconds is None.
+    """
+    if seconds is None:
+        return None
+    return minutes_24hr_str(seconds // SECONDS_PER_MINUTE)
 
 
 # Function to validate time
@@ -63,27 +110,9 @@ def validate_time_format(time_str):
         bool: True if the time format is valid, False otherwise.
     """
     try:
-        datetime.strptime(time_str, '%H:%M %p')
+        # Parsed the same way every time is parsed later, hours 1-12
+        convert_12h_to_minutes(time_str)
         return True
     except ValueError:
         print("Invalid time format! Please use 'HH:MM AM/PM' format.")
         return False
-
-
-def time_plus_delta(t, delta):
-    """
-    Add a timedelta to a datetime.time object.
-
-    Parameters:
-    - time_obj (datetime.time): The time object to add the timedelta to.
-    - time_delta (datetime.timedelta): The timedelta to add to the time object.
-
-    Returns:
-        datetime.time: The resulting time object after adding the timedelta.
-    """
-    # Convert the time to a datetime object
-    dt = datetime.combine(datetime.today(), t)
-    # Add the timedelta
-    dt += delta
-    # Extract the time part and return
-    return dt.time()
@@ -7,9 +7,10 @@ import matplotlib.pyplot as plt
 class Visualize:
     _instance = None  # Single instance storage
     _initialized = False  # Initialization flag
-    COLORS = ['red', 'blue', 'green']  # High Priority, Medium Priority, Low Priority
-    LINE_STYLES = ['-', '--', ':']  # Solid, Dashed, Dotted line styles
-    MARKERS = ['o', 's', '^']  # Circle, Square, Triangle markers
+    # High Priority, Medium Priority, Low Priority first, further trucks of the fleet cycle through the rest
+    COLORS = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'magenta', 'olive', 'cyan', 'black']
+    LINE_STYLES = ['-', '--', ':', '-.']  # Solid, Dashed, Dotted, Dash-dot line styles
+    MARKERS = ['o', 's', '^', 'D', 'v', 'P', '*']  # Circle, Square, Triangle, Diamond, Down triangle, Plus, Star
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -40,6 +41,30 @@ class Visualize:
         if truck_id not in self.address:
             self.address[truck_id] = {}
 
+    @property
+    def get_all_coordinates(self):
+        """
+        Get the map coordinates of every address.
+
+        Returns:
+            dict: Address -> (x, y) on Picture1.jpg.
+        """
+        return self.__ALL_COORDINATES
+
+    @classmethod
+    def get_style(cls, idx):
+        """
+        Get the plot style of a truck, each list is cycled on its own so styles repeat only after many trucks.
+
+        Parameters:
+            idx (int): The position of the truck, truck ID - 1 or its position in a list of trucks.
+
+        Returns:
+            tuple: (color, line style, marker)
+        """
+        return (cls.COLORS[idx % len(cls.COLORS)], cls.LINE_STYLES[idx % len(cls.LINE_STYLES)],
+                cls.MARKERS[idx % len(cls.MARKERS)])
+
     def _setup_figure(self, truck_id):
         """
         Set up the figure for plotting the truck's data.
@@ -50,7 +75,7 @@ class Visualize:
         Returns:
             None
         """
-        idx = (truck_id - 1) % 3
+        color, line_style, marker = self.get_style(truck_id - 1)
         # Read the image
         image = plt.imread(self.__IMAGE_PATH)
         # Create a figure with the original dimensions
@@ -60,9 +85,9 @@ class Visualize:
         # Turn off axes
         self.ax.axis('off')
         # Set the scatter plot
-        self.scatter = self.ax.scatter([], [], marker=self.MARKERS[idx], color=self.COLORS[idx], s=50)
+        self.scatter = self.ax.scatter([], [], marker=marker, color=color, s=50)
         # Set the line plot
-        self.line, = self.ax.plot([], [], color=self.COLORS[idx], linestyle=self.LINE_STYLES[idx], linewidth=2)
+        self.line, = self.ax.plot([], [], color=color, linestyle=line_style, linewidth=2)
 
     @classmethod
     def _load_coordinates_from_csv(cls):
@@ -241,8 +266,8 @@ class Visualize:
             x, y = self._get_coord_and_close_route(truck_id)
 
             # Update the line plot
-            line, = self.ax.plot(x, y, color=self.COLORS[idx], linestyle=self.LINE_STYLES[idx],
-                                 marker=self.MARKERS[idx], linewidth=2)
+            color, line_style, marker = self.get_style(idx)
+            line, = self.ax.plot(x, y, color=color, linestyle=line_style, marker=marker, linewidth=2)
             line_objects.append(line)
             legend_labels.append(f"Truck {trucks_list[idx].truck_name}")
 
@@ -259,12 +284,39 @@ class Visualize:
         # Reset the route for the next visualization
         self.route[truck_id] = {}
 
+    # Visualize where every truck is at a time, from the interpolated positions of the leg tables
+    def visualize_truck_positions(self, positions, truck_names, title):
+        """
+        Visualizes the position of each truck on the map.
+
+        Parameters:
+            positions (dict): Truck ID -> (x, y) of the truck.
+            truck_names (dict): Truck ID -> name of the truck.
+            title (str): The title of the figure.
+
+        Returns:
+            None
+        """
+        # Set up the figure in a clean state
+        self._setup_figure(next(iter(positions), 1))
+        for truck_id, (x, y) in positions.items():
+            color, _, marker = self.get_style(truck_id - 1)
+            self.ax.scatter([x], [y], marker=marker, color=color, s=120,
+                            label=truck_names.get(truck_id, truck_id))
+        if positions:
+            self.ax.legend(loc='upper right', shadow=True)
+        plt.title(title)
+        plt.show()
+        # Clears the figure to make sure start fresh for the next visualization
+        plt.close(self.fig)
+
     def visualize_pie_chart(self, filtered_packages, truck_name):
         """
         Visualizes a pie chart of the package status distribution for a given truck.
 
         Parameters:
-            filtered_packages (list): A list of tuples containing package information and status.
+            filtered_packages (list or dict): A list of tuples containing package information and status, or the
+            status -> count dict of a truck in StatusSnapshot.truck_counts.
             truck_name (str): The name of the truck.
 
         Returns:
@@ -272,10 +324,16 @@ class Visualize:
         """
         # Status count of packages
         status_count = {'IN_TRANSIT': 0, 'AT_HUB': 0, 'DELIVERED': 0}
-        for package, status_info in filtered_packages:
-            current_status = status_info['status']
-            if current_status in status_count:
-                status_count[current_status] += 1
+        if isinstance(filtered_packages, dict):
+            # Already counted by a status snapshot
+            for current_status, count in filtered_packages.items():
+                if current_status in status_count:
+                    status_count[current_status] += count
+        else:
+            for package, status_info in filtered_packages:
+                current_status = status_info['status']
+                if current_status in status_count:
+                    status_count[current_status] += 1
 
         # Pie chart, where the slices will be ordered and plotted counter-clockwise:
         labels = list(status_count.keys())
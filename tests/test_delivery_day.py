@@ -0,0 +1,47 @@
+# Tests for the simulated delivery day of the bundled packages, see trucks.simulate_day
+# Run from the project directory: python -m pytest tests
+import unittest
+
+from package_delivery import datastructures as ds
+from package_delivery.delivery import trucks
+
+LOADERS = (trucks.LOADER_NEAREST_NEIGHBOR, trucks.LOADER_SAVINGS, trucks.LOADER_CLUSTER)
+ROUTE_SOLVERS = (trucks.ROUTE_SOLVER_TWO_OPT, trucks.ROUTE_SOLVER_EXACT, trucks.ROUTE_SOLVER_INSERTION)
+
+
+def _load_fleet(loader):
+    """
+    Load a fresh set of the fleet's trucks with the bundled packages.
+
+    Parameters:
+        loader (str): LOADER_NEAREST_NEIGHBOR, LOADER_SAVINGS or LOADER_CLUSTER.
+
+    Returns:
+        list: The loaded trucks.
+    """
+    fleet_trucks = trucks.make_trucks(trucks.fleet)
+    trucks.load_trucks(fleet_trucks, ds.graph_access, set(), loader=loader)
+    return fleet_trucks
+
+
+class DeliveryDayTest(unittest.TestCase):
+
+    def tearDown(self):
+        # The package store follows the last simulated day, simulate the module's trucks again
+        trucks.get_day_status(trucks.fleet_trucks, ds.graph_access, refresh=True)
+
+    # 2-opt and the exact solver ignore deadlines, a route of theirs delivering late falls back to insertion
+    def test_every_loader_and_solver_is_on_time(self):
+        for loader in LOADERS:
+            for route_solver in ROUTE_SOLVERS:
+                with self.subTest(loader=loader, route_solver=route_solver):
+                    fleet_trucks = _load_fleet(loader)
+                    self.assertEqual(sum(truck.get_package_count() for truck in fleet_trucks), 40)
+                    day = trucks.simulate_day(fleet_trucks, ds.graph_access, route_solver)
+                    self.assertEqual(len(day.packages), 40)
+                    self.assertTrue(all(timeline.delivery_time is not None for timeline in day.packages.values()))
+                    self.assertEqual(trucks.get_late_packages(day), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
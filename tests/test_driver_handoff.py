@@ -0,0 +1,86 @@
+# Tests for the drivers of fleets with more than two drivers, see trucks.simulate_day
+# Run from the project directory: python -m pytest tests
+import unittest
+from unittest import mock
+
+from package_delivery import datastructures as ds
+from package_delivery.datastructures.package_constraints import make_truck_rules
+from package_delivery.delivery import trucks
+from package_delivery.delivery.logistics.fleet import Fleet, TruckSpec
+from package_delivery.delivery.simulation import EVENT_DRIVER_HANDOFF
+from package_delivery.timeutil.time_util import convert_12h_to_seconds
+
+# Truck speed of the bundled fleet, 18 mph in miles per minute
+SPEED = 0.3
+EARLY_START = convert_12h_to_seconds('8:10 AM')
+LATE_START = convert_12h_to_seconds('9:05 AM')
+
+# Six trucks and three drivers, four trucks scheduled and two waiting for a free driver
+SIX_TRUCK_FLEET = Fleet(3, tuple(TruckSpec(truck_id, f'TRUCK_{truck_id}', 16, start_time, SPEED)
+                                 for truck_id, start_time in enumerate((EARLY_START, LATE_START, None, EARLY_START,
+                                                                        EARLY_START, None), 1)))
+
+
+def _simulate_fleet(fleet, loader=trucks.LOADER_NEAREST_NEIGHBOR):
+    """
+    Load and simulate the bundled packages on a fleet of its own.
+
+    Parameters:
+        fleet (Fleet): The fleet, its drivers and trucks.
+        loader (str): LOADER_NEAREST_NEIGHBOR, LOADER_SAVINGS or LOADER_CLUSTER.
+
+    Returns:
+        SimulationResult: The simulated day.
+    """
+    with mock.patch.object(trucks, 'fleet', fleet):
+        fleet_trucks = trucks.make_trucks(fleet)
+        trucks.load_trucks(fleet_trucks, ds.graph_access, set(), loader=loader)
+        return trucks.simulate_day(fleet_trucks, ds.graph_access)
+
+
+class DriverHandoffTest(unittest.TestCase):
+
+    def tearDown(self):
+        # Loading another fleet changed the truck rules, restore the module's fleet and day
+        ds.package_hashmap.index.constraints.set_truck_rules(make_truck_rules(
+            {truck.truck_id: truck.time_tracker.get_start_time() for truck in trucks.fleet_trucks}))
+        trucks.get_day_status(trucks.fleet_trucks, ds.graph_access, refresh=True)
+
+    # The third driver no scheduled truck needs takes the waiting truck when the first truck leaves
+    def test_spare_driver_takes_the_waiting_truck(self):
+        day = _simulate_fleet(Fleet(3, trucks.fleet.trucks))
+        handoffs = [event for event in day.events if event.kind == EVENT_DRIVER_HANDOFF]
+        self.assertEqual([(event.time, event.truck_id, event.driver_id) for event in handoffs], [(EARLY_START, 3, 3)])
+        # Truck 3 still waits for the late packages of its load
+        self.assertGreaterEqual(day.trucks[3].departure_time, EARLY_START)
+        self.assertLess(day.trucks[3].departure_time, day.trucks[1].return_time)
+        self.assertEqual(trucks.get_late_packages(day), {})
+
+    # Every truck gets one of the three drivers and no driver drives two trucks at once
+    def test_drivers_never_drive_two_trucks_at_once(self):
+        for loader in (trucks.LOADER_NEAREST_NEIGHBOR, trucks.LOADER_SAVINGS, trucks.LOADER_CLUSTER):
+            with self.subTest(loader=loader):
+                day = _simulate_fleet(SIX_TRUCK_FLEET, loader)
+                self.assertEqual(len(day.packages), 40)
+                self.assertEqual(trucks.get_late_packages(day), {})
+                shifts = {}
+                for timeline in day.trucks.values():
+                    if timeline.departure_time is None:
+                        continue
+                    self.assertIn(timeline.driver_id, (1, 2, 3))
+                    shifts.setdefault(timeline.driver_id, []).append((timeline.departure_time,
+                                                                      timeline.return_time))
+                for driver_shifts in shifts.values():
+                    driver_shifts.sort()
+                    for (_, return_time), (departure_time, _) in zip(driver_shifts, driver_shifts[1:]):
+                        self.assertLessEqual(return_time, departure_time)
+                # The waiting trucks take a driver only once a truck is back at the hub
+                first_return = min(timeline.return_time for timeline in day.trucks.values()
+                                   if timeline.return_time is not None)
+                for truck_id in (3, 6):
+                    if day.trucks[truck_id].departure_time is not None:
+                        self.assertGreaterEqual(day.trucks[truck_id].departure_time, first_return)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# Tests for ResizableHashMap, the incremental rehash in particular
+# Run from the project directory: python -m pytest tests
+import unittest
+
+from package_delivery.datastructures.hash_map import HashMapEntry, ResizableHashMap
+
+
+def _make_entry(package_id):
+    """
+    Create a package entry for a package ID.
+
+    Parameters:
+        package_id (int): The ID of the package.
+
+    Returns:
+        HashMapEntry: A package entry.
+    """
+    return HashMapEntry(package_id, '4001 South 700 East', 'Salt Lake City', 'UT', '84107', 'EOD', '1', 'None',
+                        'AT_HUB')
+
+
+class ResizableHashMapTest(unittest.TestCase):
+
+    def _fill(self, hash_map, package_ids):
+        for package_id in package_ids:
+            hash_map._insert_package(package_id, _make_entry(package_id))
+
+    # Every key stays reachable while entries migrate a few slots per operation
+    def test_lookup_during_rehash(self):
+        hash_map = ResizableHashMap(rehash_step=1)
+        seen_rehashing = False
+        for package_id in range(1, 1001):
+            hash_map._insert_package(package_id, _make_entry(package_id))
+            seen_rehashing = seen_rehashing or hash_map.is_rehashing
+            self.assertEqual(hash_map.get_value_from_key(package_id // 2 + 1).package_id, package_id // 2 + 1)
+        self.assertTrue(seen_rehashing)
+        self.assertEqual(len(hash_map), 1000)
+        for package_id in range(1, 1001):
+            self.assertEqual(hash_map.get_value_from_key(package_id).package_id, package_id)
+        self.assertIsNone(hash_map.get_value_from_key(1001))
+
+    # A lookup while iterating moves old entries into the new table, items() must still yield each key once
+    def test_items_with_lookups_while_rehashing(self):
+        hash_map = ResizableHashMap(rehash_step=1)
+        package_ids = range(1, 8)
+        self._fill(hash_map, package_ids)
+        self.assertTrue(hash_map.is_rehashing)
+        keys = []
+        for key, value in hash_map.items():
+            keys.append(key)
+            hash_map.get_value_from_key(key)
+        self.assertEqual(sorted(keys), list(package_ids))
+
+    def test_delete_and_reinsert(self):
+        hash_map = ResizableHashMap(rehash_step=1)
+        self._fill(hash_map, range(1, 201))
+        for package_id in range(1, 201, 2):
+            self.assertTrue(hash_map.delete_key_value_pair(package_id))
+        self.assertEqual(len(hash_map), 100)
+        self.assertIsNone(hash_map.get_value_from_key(1))
+        # Probes continue past deleted slots
+        for package_id in range(2, 201, 2):
+            self.assertEqual(hash_map.get_value_from_key(package_id).package_id, package_id)
+        self._fill(hash_map, range(1, 201, 2))
+        self.assertEqual(len(hash_map), 200)
+        self.assertEqual(sorted(key for key, _ in hash_map.items()), list(range(1, 201)))
+
+    def test_insert_existing_key_replaces_value(self):
+        hash_map = ResizableHashMap()
+        self._fill(hash_map, range(1, 20))
+        replacement = _make_entry(5)
+        hash_map._insert_package(5, replacement)
+        self.assertEqual(len(hash_map), 19)
+        self.assertIs(hash_map.get_value_from_key(5), replacement)
+
+
+if __name__ == '__main__':
+    unittest.main()
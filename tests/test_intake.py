@@ -0,0 +1,44 @@
+# Tests for the packages received during the bundled day, see trucks.receive_package
+# Run from the project directory: python -m pytest tests
+import unittest
+
+from package_delivery import datastructures as ds
+from package_delivery.delivery import trucks
+from package_delivery.timeutil.time_util import SECONDS_PER_MINUTE
+
+# ID of the received package, not used by the bundled packages
+PACKAGE_ID = 41
+
+
+class ReceivePackageTest(unittest.TestCase):
+
+    def tearDown(self):
+        # Roll back an accepted package so every test starts from the bundled day
+        if PACKAGE_ID in trucks.received_packages:
+            del trucks.received_packages[PACKAGE_ID]
+            ds.package_hashmap.delete_key_value_pair(PACKAGE_ID)
+        trucks.get_day_status(trucks.fleet_trucks, ds.graph_access, refresh=True)
+
+    def _receive(self, delivery_deadline):
+        return trucks.receive_package(trucks.fleet_trucks, ds.graph_access, '9:30 AM', PACKAGE_ID,
+                                      '1060 Dalton Ave S', 'Salt Lake City', 'UT', '84104', delivery_deadline, '5')
+
+    # Truck 3 waits for a driver until truck 1 is back at the hub, after 10:00 AM, too late for 10:30 AM
+    def test_late_intake_is_rejected(self):
+        self.assertIsNone(self._receive('10:30 AM'))
+        self.assertNotIn(PACKAGE_ID, trucks.received_packages)
+        self.assertIsNone(ds.package_hashmap.get_value_from_key(PACKAGE_ID))
+
+    def test_intake_is_delivered_by_its_deadline(self):
+        truck_id = self._receive('12:00 PM')
+        self.assertIsNotNone(truck_id)
+        day = trucks.get_day_status(trucks.fleet_trucks, ds.graph_access).get_simulation_result
+        self.assertEqual(day.packages[PACKAGE_ID].truck_id, truck_id)
+        # The new package and every package of the day are on time
+        for package_id, timeline in day.packages.items():
+            deadline = ds.package_hashmap.get_value_from_key(package_id).deadline_minutes * SECONDS_PER_MINUTE
+            self.assertLessEqual(timeline.delivery_time, deadline, package_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# Tests for the changes posted to packages during the bundled day, see trucks.post_package_change
+# Run from the project directory: python -m pytest tests
+import unittest
+from unittest import mock
+
+from package_delivery import datastructures as ds
+from package_delivery.delivery import trucks
+from package_delivery.delivery.logistics.package_changes import PackageChange, PackageChangeLog
+from package_delivery.delivery.simulation import EVENT_DELIVERY
+from package_delivery.delivery.status_index import STATUS_AT_HUB, STATUS_CANCELLED
+from package_delivery.timeutil.time_util import convert_12h_to_seconds
+
+
+class PackageChangeTest(unittest.TestCase):
+
+    def setUp(self):
+        # Changes go to a log of their own holding the bundled changes, tearDown rolls the store back
+        trucks.package_changes.set_time(0)
+        self.changes = PackageChangeLog(ds.package_hashmap)
+        for change in trucks.package_changes.get_changes:
+            self.changes.add(change)
+        self.patcher = mock.patch.object(trucks, 'package_changes', self.changes)
+        self.patcher.start()
+        self.changed_package_ids = set()
+
+    def tearDown(self):
+        self.changes.set_time(0)
+        self.patcher.stop()
+        for truck in trucks.fleet_trucks:
+            for package_id in self.changed_package_ids:
+                truck.route_plans.invalidate_package(package_id)
+        trucks.get_day_status(trucks.fleet_trucks, ds.graph_access, refresh=True)
+
+    def _post(self, package_id, time, **fields):
+        self.changed_package_ids.add(package_id)
+        status_index = trucks.post_package_change(trucks.fleet_trucks, ds.graph_access,
+                                                  PackageChange(package_id, convert_12h_to_seconds(time), **fields))
+        self.assertIsNotNone(status_index)
+        return status_index
+
+    # Package 19 is on truck 1, cancelled before it leaves at 8:10 AM
+    def test_cancelled_package_is_not_delivered(self):
+        status_index = self._post(19, '8:00 AM', cancelled=True)
+        day = status_index.get_simulation_result
+        self.assertTrue(day.packages[19].cancelled)
+        self.assertIsNone(day.packages[19].delivery_time)
+        self.assertEqual(trucks.get_package_status(trucks.fleet_trucks, status_index, 19, '7:00 AM').status,
+                         STATUS_AT_HUB)
+        self.assertEqual(trucks.get_package_status(trucks.fleet_trucks, status_index, 19, '9:00 AM').status,
+                         STATUS_CANCELLED)
+        # The other packages are still delivered on time
+        self.assertTrue(all(timeline.delivery_time is not None for package_id, timeline in day.packages.items()
+                            if package_id != 19))
+        self.assertEqual(trucks.get_late_packages(day), {})
+
+    # Package 14 is delivered before 8:30 AM, a cancellation at noon comes too late
+    def test_cancellation_after_delivery_is_ignored(self):
+        delivery_time = trucks.get_day_status(trucks.fleet_trucks, ds.graph_access).get_simulation_result \
+            .packages[14].delivery_time
+        day = self._post(14, '12:00 PM', cancelled=True).get_simulation_result
+        self.assertFalse(day.packages[14].cancelled)
+        self.assertEqual(day.packages[14].delivery_time, delivery_time)
+
+    # Package 28 waits on truck 3, its new address is known before the truck leaves
+    def test_address_change_moves_the_delivery(self):
+        status_index = self._post(28, '8:30 AM', address='1060 Dalton Ave S', city='Salt Lake City', state='UT',
+                                  zipcode='84104')
+        day = status_index.get_simulation_result
+        self.assertEqual(day.packages[28].address, '1060 Dalton Ave S')
+        deliveries = [event for event in day.packages[28].events if event.kind == EVENT_DELIVERY]
+        self.assertEqual([event.vertex for event in deliveries], ['1060 Dalton Ave S'])
+        # The status follows the address known at each time
+        self.assertEqual(trucks.get_package_status(trucks.fleet_trucks, status_index, 28, '8:00 AM').address,
+                         '2835 Main St')
+        self.assertEqual(trucks.get_package_status(trucks.fleet_trucks, status_index, 28, '9:00 AM').address,
+                         '1060 Dalton Ave S')
+        self.assertEqual(trucks.get_late_packages(day), {})
+
+    # Package 9 has a wrong address until the bundled change at 10:20 AM
+    def test_wrong_address_is_delivered_after_its_correction(self):
+        day = trucks.get_day_status(trucks.fleet_trucks, ds.graph_access).get_simulation_result
+        self.assertEqual(day.packages[9].address, '410 S State St')
+        self.assertGreaterEqual(day.packages[9].delivery_time, convert_12h_to_seconds('10:20 AM'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# Tests for PackageConstraints, the truck rules and the workarounds of the bundled package file in particular
+# Run from the project directory: python -m pytest tests
+import unittest
+
+from package_delivery.datastructures.hash_map import BUNDLED_OVERRIDES_FILE, ResizableHashMap
+from package_delivery.datastructures.package_constraints import (EARLY_TRUCK_RULES, WAITING_TRUCK_RULES,
+                                                                 PackageConstraints, make_truck_rules)
+from package_delivery.datastructures.package_index import PackageIndex
+from package_delivery.datastructures.package_table import PackageTable
+
+# Package file of the bundled day
+PACKAGE_FILE = 'WGUPS Package File Formatted.csv'
+
+
+def _load_store(overrides_file=None, truck_rules=None):
+    """
+    Load the bundled package file into a store of its own.
+
+    Parameters:
+        overrides_file (str): The workarounds file, None to load the packages by their notes alone.
+        truck_rules (dict): Truck ID -> the rules of its constrained pass, None for none.
+
+    Returns:
+        PackageConstraints: The compiled constraints of the store.
+    """
+    constraints = PackageConstraints(truck_rules)
+    ResizableHashMap(index=PackageIndex(constraints), table=PackageTable()).load_hash_map(
+        PACKAGE_FILE, overrides_file=overrides_file)
+    return constraints
+
+
+class PackageConstraintsTest(unittest.TestCase):
+
+    # The first trucks to leave take the early packages, the trucks without a start time the ones that can wait
+    def test_truck_rules_follow_the_start_times(self):
+        truck_rules = make_truck_rules({1: 29400, 2: 32700, 3: None, 4: 29400, 5: None})
+        self.assertEqual(truck_rules, {1: EARLY_TRUCK_RULES, 3: WAITING_TRUCK_RULES, 4: EARLY_TRUCK_RULES,
+                                       5: WAITING_TRUCK_RULES})
+
+    # Package 6 is delayed until 9:05 AM, only the bundled workarounds move it from the waiting truck to truck 2
+    def test_overrides_only_apply_to_the_bundled_file(self):
+        truck_rules = make_truck_rules({1: 29400, 2: 32700, 3: None})
+        plain = _load_store(truck_rules=truck_rules)
+        self.assertTrue(plain.is_assigned(3, 6))
+        self.assertFalse(plain.is_assigned(2, 6))
+        bundled = _load_store(BUNDLED_OVERRIDES_FILE, truck_rules)
+        self.assertFalse(bundled.is_assigned(3, 6))
+        self.assertTrue(bundled.is_assigned(2, 6))
+        self.assertFalse(plain.is_restricted(13))
+        self.assertTrue(bundled.is_restricted(13))
+
+    # Changing the truck rules recompiles the packages already stored
+    def test_set_truck_rules_recompiles(self):
+        constraints = _load_store()
+        self.assertFalse(constraints.is_assigned(7, 15))
+        constraints.set_truck_rules(make_truck_rules({7: 29400}))
+        self.assertTrue(constraints.is_assigned(7, 15))
+        # Truck-only packages still go on their truck alone
+        self.assertFalse(constraints.can_load(7, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()